@@ -0,0 +1,455 @@
+"""
+Benchmarks do pipeline e dos caminhos quentes do dashboard.
+
+Cada caso roda em um subprocesso próprio (para medir o pico de memória sem
+interferência dos outros) e registra tempo, linhas/s e pico de RSS em
+``benchmarks/results/latest.json``. Com ``--compare`` o resultado é comparado
+com um baseline e o comando sai com código 1 se algum caso piorar além do limite.
+
+Uso:
+    python -m benchmarks.run_benchmarks --sizes 50k,1m
+    python -m benchmarks.run_benchmarks --sizes 50k,1m --compare benchmarks/baseline.json
+    python -m benchmarks.run_benchmarks --sizes 50k,1m --save-baseline
+"""
+
+import argparse
+import json
+import platform
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+import pandas as pd
+
+from src.config import DATA_DIR
+from src.storage import PROCESSED_DATASET_DIRNAME
+from src.synthetic_data import DEFAULT_END_DATE, DEFAULT_SEED, DIRTY_ROW_KINDS, iter_synthetic_sales
+
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+BENCHMARKS_DIR = Path(__file__).resolve().parent
+RESULTS_PATH = BENCHMARKS_DIR / "results" / "latest.json"
+BASELINE_PATH = BENCHMARKS_DIR / "baseline.json"
+WORK_DIR = DATA_DIR / ".cache" / "benchmarks"
+
+SIZES = {
+    "50k": 50_000,
+    "1m": 1_000_000,
+    "10m": 10_000_000,
+    "50m": 50_000_000,
+}
+CASES = [
+    "load_raw",
+    "clean",
+    "clean_polars",
+    "clean_parallel",
+    "save",
+    "load_data",
+    "load_data_polars",
+    "load_features",
+    "load_last_month",
+    "dashboard_pandas",
+    "dashboard_planner",
+    "dashboard_cube",
+    "dashboard_duckdb",
+]
+# Piora relativa (tempo ou memória) tolerada antes de acusar regressão
+DEFAULT_THRESHOLD = 0.25
+# Diferenças de tempo menores que isso são ruído, mesmo acima do limite relativo
+MIN_TIME_DELTA = 0.02
+RAW_FILENAME = "amazon_sales_dataset.csv"
+# Fração de linhas sujas de cada tipo nos dados gerados (exercita as regras de rejeição)
+DIRTY_RATE = 0.002
+
+
+# ---------------------------------------------------------------------------
+# Dados de entrada
+# ---------------------------------------------------------------------------
+
+def parse_sizes(text: str) -> list[int]:
+    """"50k,1m" -> [50000, 1000000]; aceita também números de linhas."""
+    sizes = []
+    for item in text.split(","):
+        item = item.strip().lower()
+        sizes.append(SIZES[item] if item in SIZES else int(item.replace("_", "")))
+    return sizes
+
+
+def write_synthetic_raw_file(rows: int, path: Path, seed: int = DEFAULT_SEED, dirty_rate: float = DIRTY_RATE):
+    """
+    Gera um CSV bruto com ``rows`` linhas sintéticas (``src.synthetic_data``),
+    chunk a chunk, sem montar o arquivo inteiro na memória.
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(path.name + ".tmp")
+    dirty_rates = {kind: dirty_rate for kind in DIRTY_ROW_KINDS}
+
+    written = 0
+    for chunk in iter_synthetic_sales(rows, seed=seed, dirty_rates=dirty_rates):
+        chunk.to_csv(tmp_path, index=False, mode="a" if written else "w", header=not written)
+        written += len(chunk)
+    tmp_path.replace(path)
+
+
+def benchmark_workdir(rows: int) -> Path:
+    # Semente e taxa de sujeira no nome: mudar qualquer uma gera dados novos
+    return WORK_DIR / f"{rows}-seed{DEFAULT_SEED}-dirty{DIRTY_RATE}"
+
+
+def prepare_workdir(rows: int) -> Path:
+    """
+    Diretório de trabalho de um tamanho: CSV bruto e dataset processado.
+    Reaproveitado entre execuções; o processado é gerado pela limpeza em chunks.
+    """
+    from src.data_preprocessing import clean_sales_data_chunked
+
+    workdir = benchmark_workdir(rows)
+    raw_path = workdir / RAW_FILENAME
+    if not raw_path.exists():
+        print(f"Gerando {rows:,} linhas sintéticas em {raw_path}")
+        write_synthetic_raw_file(rows, raw_path)
+    if not (workdir / "processed" / PROCESSED_DATASET_DIRNAME).exists():
+        (workdir / "processed").mkdir(exist_ok=True)
+        clean_sales_data_chunked(raw_path, output_dir=workdir / "processed", write_csv=False)
+    return workdir
+
+
+# ---------------------------------------------------------------------------
+# Casos (executados no subprocesso)
+# ---------------------------------------------------------------------------
+
+def _full_period_filters(df: pd.DataFrame):
+    from src.dashboard_metrics import DashboardFilters
+
+    return DashboardFilters(df["order_date"].min().date(), df["order_date"].max().date())
+
+
+def build_case(name: str, workdir: Path):
+    """
+    Retorna ``(setup, run)``: ``setup()`` prepara as entradas fora da medição
+    e ``run(entradas)`` é o trecho medido.
+    """
+    raw_path = workdir / RAW_FILENAME
+    dataset_dir = workdir / "processed" / PROCESSED_DATASET_DIRNAME
+
+    if name == "load_raw":
+        from src.data_preprocessing import load_raw_sales_data
+
+        return (lambda: raw_path), load_raw_sales_data
+
+    if name == "clean":
+        from src.data_preprocessing import clean_sales_data, load_raw_sales_data
+
+        return (lambda: load_raw_sales_data(raw_path)), (lambda df: clean_sales_data(df, {}, consume=True))
+
+    if name == "clean_polars":
+        from src.polars_backend import clean_sales_file_polars
+
+        # Leitura do CSV bruto + limpeza (compare com load_raw + clean)
+        return (lambda: raw_path), (lambda path: clean_sales_file_polars(path, {}))
+
+    if name == "clean_parallel":
+        from src.data_preprocessing import clean_sales_data_parallel
+
+        # Leitura do CSV bruto + limpeza em faixas de bytes (CLEANING_WORKERS processos)
+        return (lambda: raw_path), (lambda path: clean_sales_data_parallel(path, {}))
+
+    if name == "save":
+        from src.data_preprocessing import clean_sales_data, load_raw_sales_data, save_processed_data
+
+        output_dir = workdir / "save_output"
+        output_dir.mkdir(exist_ok=True)
+        return (
+            lambda: clean_sales_data(load_raw_sales_data(raw_path), consume=True),
+            lambda df: save_processed_data(df, output_dir=output_dir),
+        )
+
+    if name == "load_data":
+        import streamlit_app
+
+        def run(_):
+            streamlit_app.load_data.clear()
+            return streamlit_app.load_data(dataset_dir=dataset_dir)
+
+        return (lambda: None), run
+
+    if name == "load_data_polars":
+        import streamlit_app
+
+        return (lambda: None), lambda _: streamlit_app.prepare_data(dataset_dir=dataset_dir, engine="polars")
+
+    if name == "load_features":
+        import streamlit_app
+        from src.feature_engineering import FEATURES_DIRNAME, compute_sales_features, save_feature_table
+        from src.storage import dataset_sources, save_dataset_sources
+
+        # Carga do dashboard com a tabela de features já gravada (só leitura)
+        output_dir = workdir / "features_output"
+        features_dir = output_dir / FEATURES_DIRNAME
+
+        def setup():
+            if not features_dir.exists():
+                save_feature_table(compute_sales_features(dataset_dir=dataset_dir), output_dir)
+                save_dataset_sources(features_dir, dataset_sources(dataset_dir))
+
+        return setup, lambda _: streamlit_app.prepare_data(dataset_dir=dataset_dir, features_dir=features_dir)
+
+    if name == "load_last_month":
+        from src.storage import load_processed_sales_data
+
+        # Período do seletor "Último Mês": com partições mensais só um mês é lido
+        last_month = pd.Timestamp(DEFAULT_END_DATE).to_period("M")
+        return (lambda: None), lambda _: load_processed_sales_data(
+            start_date=last_month.start_time,
+            end_date=last_month.end_time,
+            dataset_dir=dataset_dir,
+        )
+
+    if name == "dashboard_pandas":
+        import streamlit_app
+        from src.dashboard_metrics import compute_dashboard_metrics
+        from src.filter_index import SalesFilterIndex
+
+        def setup():
+            index = SalesFilterIndex(streamlit_app.prepare_data(dataset_dir=dataset_dir))
+            return index, _full_period_filters(index.df)
+
+        return setup, lambda args: compute_dashboard_metrics(args[0].filter(args[1]))
+
+    if name == "dashboard_planner":
+        import streamlit_app
+        from src.aggregation_planner import AggregationPlanner
+        from src.filter_index import SalesFilterIndex
+
+        def setup():
+            index = SalesFilterIndex(streamlit_app.prepare_data(dataset_dir=dataset_dir))
+            return AggregationPlanner(index), _full_period_filters(index.df)
+
+        return setup, lambda args: args[0].compute(args[1])
+
+    if name == "dashboard_cube":
+        import streamlit_app
+        from src.aggregation_planner import AggregationPlanner
+        from src.cube import CUBE_COLUMNS, build_sales_cube, compute_cube_metrics
+        from src.dashboard_metrics import ROW_LEVEL_KEYS
+        from src.filter_index import SalesFilterIndex
+        from src.storage import load_processed_sales_data
+
+        def setup():
+            index = SalesFilterIndex(streamlit_app.prepare_data(dataset_dir=dataset_dir))
+            cube = build_sales_cube(load_processed_sales_data(columns=CUBE_COLUMNS, dataset_dir=dataset_dir))
+            return AggregationPlanner(index), cube, _full_period_filters(index.df)
+
+        def run(args):
+            planner, cube, filters = args
+            metrics = compute_cube_metrics(cube, filters)
+            metrics.update(planner.compute(filters, keys=ROW_LEVEL_KEYS))
+            return metrics
+
+        return setup, run
+
+    if name == "dashboard_duckdb":
+        from src.dashboard_metrics import DashboardFilters
+        from src.sql_backend import SqlSalesBackend
+
+        def setup():
+            backend = SqlSalesBackend(dataset_dir=dataset_dir)
+            filters = DashboardFilters(*backend.date_range())
+            return backend, filters
+
+        def run(args):
+            backend, filters = args
+            metrics = backend.compute_metrics(filters)
+            metrics["total_revenue_full"] = backend.total_revenue()
+            return metrics
+
+        return setup, run
+
+    raise ValueError(f"Caso de benchmark desconhecido: {name}")
+
+
+def _reset_peak_rss():
+    # Linux: zera o pico (VmHWM) para medir só o trecho seguinte
+    clear_refs = Path("/proc/self/clear_refs")
+    if clear_refs.exists():
+        try:
+            clear_refs.write_text("5")
+        except OSError:
+            pass
+
+
+def peak_rss_mb() -> float | None:
+    status = Path("/proc/self/status")
+    if status.exists():
+        for line in status.read_text().splitlines():
+            if line.startswith("VmHWM:"):
+                return int(line.split()[1]) / 1024
+    try:
+        import resource
+    except ImportError:  # Windows
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / 1024 / 1024 if sys.platform == "darwin" else peak / 1024
+
+
+def run_case(name: str, rows: int, repeat: int) -> dict:
+    """Executa um caso ``repeat`` vezes no processo atual; guarda o menor tempo."""
+    setup, run = build_case(name, benchmark_workdir(rows))
+    seconds = []
+    peak = None
+    for _ in range(repeat):
+        inputs = setup()
+        _reset_peak_rss()
+        start = time.perf_counter()
+        run(inputs)
+        seconds.append(time.perf_counter() - start)
+        case_peak = peak_rss_mb()
+        if case_peak is not None:
+            peak = case_peak if peak is None else max(peak, case_peak)
+        del inputs
+
+    best = min(seconds)
+    return {
+        "case": name,
+        "rows": rows,
+        "seconds": round(best, 4),
+        "rows_per_sec": round(rows / best) if best else None,
+        "peak_rss_mb": round(peak, 1) if peak is not None else None,
+    }
+
+
+# ---------------------------------------------------------------------------
+# Execução e comparação
+# ---------------------------------------------------------------------------
+
+def run_in_subprocess(name: str, rows: int, repeat: int) -> dict:
+    completed = subprocess.run(
+        [sys.executable, "-m", "benchmarks.run_benchmarks", "--case", name,
+         "--rows", str(rows), "--repeat", str(repeat)],
+        cwd=ROOT_DIR,
+        capture_output=True,
+        text=True,
+    )
+    if completed.returncode != 0:
+        raise RuntimeError(f"Benchmark '{name}' ({rows:,} linhas) falhou:\n{completed.stderr}")
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+
+def compare_results(results: list[dict], baseline: list[dict], threshold: float = DEFAULT_THRESHOLD) -> list[dict]:
+    """
+    Compara tempo e pico de memória com o baseline (mesmo caso e tamanho).
+    Retorna uma linha por caso com as razões atual/baseline e se houve regressão.
+    """
+    reference = {(r["case"], r["rows"]): r for r in baseline}
+    comparison = []
+    for result in results:
+        base = reference.get((result["case"], result["rows"]))
+        if base is None:
+            continue
+        time_ratio = result["seconds"] / base["seconds"] if base["seconds"] else None
+        memory_ratio = (
+            result["peak_rss_mb"] / base["peak_rss_mb"]
+            if result.get("peak_rss_mb") and base.get("peak_rss_mb")
+            else None
+        )
+        slower = (
+            time_ratio is not None
+            and time_ratio > 1 + threshold
+            and result["seconds"] - base["seconds"] > MIN_TIME_DELTA
+        )
+        regressed = slower or (memory_ratio is not None and memory_ratio > 1 + threshold)
+        comparison.append(
+            {
+                "case": result["case"],
+                "rows": result["rows"],
+                "time_ratio": time_ratio,
+                "memory_ratio": memory_ratio,
+                "regressed": regressed,
+            }
+        )
+    return comparison
+
+
+def format_results(results: list[dict], comparison: list[dict] | None = None) -> str:
+    ratios = {(c["case"], c["rows"]): c for c in comparison or []}
+    lines = [f"{'Caso':<18} {'Linhas':>12} {'Tempo (s)':>10} {'Linhas/s':>12} {'Pico (MB)':>10} {'vs baseline':>14}"]
+    for r in results:
+        c = ratios.get((r["case"], r["rows"]))
+        versus = ""
+        if c:
+            versus = f"{c['time_ratio']:.2f}x" if c["time_ratio"] is not None else "-"
+            if c["regressed"]:
+                versus += " REGRESSÃO"
+        peak = f"{r['peak_rss_mb']:.0f}" if r["peak_rss_mb"] is not None else "-"
+        lines.append(
+            f"{r['case']:<18} {r['rows']:>12,} {r['seconds']:>10.3f} "
+            f"{r['rows_per_sec'] or 0:>12,} {peak:>10} {versus:>14}"
+        )
+    return "\n".join(lines)
+
+
+def environment_info() -> dict:
+    return {
+        "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "pandas": pd.__version__,
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+    }
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmarks do pipeline e do dashboard")
+    parser.add_argument("--sizes", default="50k,1m", help="Tamanhos: 50k, 1m, 10m, 50m ou número de linhas")
+    parser.add_argument("--cases", default=",".join(CASES), help="Casos separados por vírgula")
+    parser.add_argument("--repeat", type=int, default=3, help="Repetições por caso (vale o menor tempo)")
+    parser.add_argument("--output", type=Path, default=RESULTS_PATH, help="Arquivo JSON de resultados")
+    parser.add_argument("--compare", type=Path, default=None, help="Baseline para comparar")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD, help="Piora tolerada (0.25 = 25%%)")
+    parser.add_argument("--save-baseline", action="store_true", help=f"Grava o resultado também em {BASELINE_PATH.name}")
+    # Modo interno: executa um único caso e imprime o resultado em JSON
+    parser.add_argument("--case", help=argparse.SUPPRESS)
+    parser.add_argument("--rows", type=int, help=argparse.SUPPRESS)
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    if args.case:
+        print(json.dumps(run_case(args.case, args.rows, args.repeat)))
+        return
+
+    cases = [c.strip() for c in args.cases.split(",")]
+    unknown = set(cases) - set(CASES)
+    if unknown:
+        raise SystemExit(f"Casos desconhecidos: {', '.join(sorted(unknown))}")
+
+    results = []
+    for rows in parse_sizes(args.sizes):
+        prepare_workdir(rows)
+        for name in cases:
+            print(f"==> {name} ({rows:,} linhas)")
+            results.append(run_in_subprocess(name, rows, args.repeat))
+
+    report = {"environment": environment_info(), "results": results}
+    args.output.parent.mkdir(parents=True, exist_ok=True)
+    args.output.write_text(json.dumps(report, indent=2), encoding="utf-8")
+    if args.save_baseline:
+        BASELINE_PATH.write_text(json.dumps(report, indent=2), encoding="utf-8")
+
+    comparison = None
+    if args.compare:
+        baseline = json.loads(args.compare.read_text(encoding="utf-8"))["results"]
+        comparison = compare_results(results, baseline, args.threshold)
+
+    print()
+    print(format_results(results, comparison))
+    print(f"\nResultados salvos em: {args.output}")
+    if comparison and any(c["regressed"] for c in comparison):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
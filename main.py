@@ -1,26 +1,172 @@
+import argparse
+import sys
+from functools import partial
+from pathlib import Path
+
+from src.config import (
+    CLEANING_MEMORY_BUDGET_MB,
+    DATAFRAME_ENGINE,
+    FIGURES_DIR,
+    ORDER_COUNT_MODE,
+    ORDER_SKETCH_PRECISION,
+    PROCESSED_DATA_DIR,
+    RAW_DATA_DIR,
+    ensure_directories,
+)
+from src.cube import CUBE_DIRNAME, build_cube_from_processed
 from src.data_ingestion import download_amazon_sales_dataset
-from src.data_preprocessing import load_raw_sales_data, clean_sales_data, save_processed_data
-from src.eda import basic_eda
-from src.visualization import sales_trend_over_time, top_categories_by_sales
+from src.data_preprocessing import RAW_FILENAME, RAW_SUBDIR, run_cleaning
+from src.eda import run_eda_report
+from src.feature_engineering import FEATURES_DIRNAME, build_features_from_processed
+from src.pipeline import PipelineRunner, Stage, format_summary
+from src.sketches import ORDER_SKETCHES_DIRNAME, build_order_sketches_from_processed
+from src.storage import PROCESSED_DATASET_DIRNAME
+
+
+RAW_FILE = RAW_DATA_DIR / RAW_SUBDIR / RAW_FILENAME
+PROCESSED_DATASET = PROCESSED_DATA_DIR / PROCESSED_DATASET_DIRNAME
+REPORT_FIGURES = (
+    "dist_price.png",
+    "correlation_matrix.png",
+    "sales_trend_over_time.png",
+    "top_categories_by_sales.png",
+)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Pipeline de dados Amazon Sales")
+    parser.add_argument(
+        "--source-dir",
+        type=Path,
+        default=None,
+        help="Diretório local com os arquivos brutos, no lugar do download via kagglehub",
+    )
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument(
+        "--incremental",
+        action="store_true",
+        help=(
+            "Limpa só as linhas novas desde a última execução e as anexa aos dados processados; "
+            "cubo, sketches, features e relatório incorporam só essas linhas"
+        ),
+    )
+    mode.add_argument(
+        "--streaming",
+        action="store_true",
+        help="Limpa o arquivo bruto em chunks, sem carregá-lo inteiro na memória",
+    )
+    parser.add_argument(
+        "--memory-budget-mb",
+        type=float,
+        default=CLEANING_MEMORY_BUDGET_MB,
+        help="Orçamento de memória da limpeza em streaming (MB)",
+    )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Reexecuta todos os estágios, ignorando o cache",
+    )
+    parser.add_argument(
+        "--only",
+        action="append",
+        metavar="STAGE",
+        help="Executa apenas o estágio indicado (pode ser repetido)",
+    )
+    return parser.parse_args(argv)
 
 
-def main():
-    # 1. Download / ingestão
-    download_amazon_sales_dataset()
+def build_stages(args, order_count_mode: str = ORDER_COUNT_MODE) -> list[Stage]:
+    if args.incremental:
+        cleaning_mode = "incremental"
+    elif args.streaming:
+        cleaning_mode = "streaming"
+    else:
+        cleaning_mode = "full"
+    # Estágios derivados leem só os arquivos que a limpeza incremental acrescentou
+    incremental = cleaning_mode == "incremental"
 
-    # 2. Carregar dados brutos
-    raw_df = load_raw_sales_data()
+    stages = [
+        # 1. Download / ingestão (origem externa: sempre consulta, mas só copia o que mudou)
+        Stage(
+            "download",
+            partial(download_amazon_sales_dataset, source_dir=args.source_dir),
+            always_run=True,
+        ),
+        # 2-3. Carregar dados brutos e limpar
+        Stage(
+            "clean",
+            partial(run_cleaning, mode=cleaning_mode, memory_budget_mb=args.memory_budget_mb),
+            deps=("download",),
+            inputs=(RAW_FILE,),
+            outputs=(PROCESSED_DATASET,),
+            modules=("src.data_preprocessing", "src.polars_backend", "src.storage"),
+            params={"mode": cleaning_mode, "engine": DATAFRAME_ENGINE},
+            always_run=incremental,
+        ),
+        # 4. Cubo agregado para o dashboard
+        Stage(
+            "cube",
+            partial(build_cube_from_processed, incremental=incremental),
+            deps=("clean",),
+            inputs=(PROCESSED_DATASET,),
+            outputs=(PROCESSED_DATA_DIR / CUBE_DIRNAME,),
+            modules=("src.cube", "src.storage"),
+            params={"incremental": incremental},
+            parallel=True,
+        ),
+        # 5. Tabela de features do dashboard (calculada uma vez, não a cada carga)
+        Stage(
+            "features",
+            partial(build_features_from_processed, engine=DATAFRAME_ENGINE, incremental=incremental),
+            deps=("clean",),
+            inputs=(PROCESSED_DATASET,),
+            outputs=(PROCESSED_DATA_DIR / FEATURES_DIRNAME,),
+            modules=("src.feature_engineering", "src.polars_backend", "src.storage"),
+            params={"engine": DATAFRAME_ENGINE, "incremental": incremental},
+            parallel=True,
+        ),
+        # 6-7. EDA e visualizações (agregações uma vez, PNGs renderizados em paralelo)
+        Stage(
+            "report",
+            partial(run_eda_report, incremental=incremental),
+            deps=("clean",),
+            inputs=(PROCESSED_DATASET,),
+            outputs=tuple(FIGURES_DIR / name for name in REPORT_FIGURES),
+            modules=("src.eda", "src.figures", "src.streaming_stats", "src.storage"),
+            params={"incremental": incremental},
+            parallel=True,
+        ),
+    ]
+    # 4b. Sketches HyperLogLog de pedidos por célula do cubo: só o modo "sketch" do
+    # dashboard os lê, então no modo "exact" (padrão) o estágio nem é registrado
+    if order_count_mode == "sketch":
+        stages.append(
+            Stage(
+                "sketches",
+                partial(
+                    build_order_sketches_from_processed, precision=ORDER_SKETCH_PRECISION, incremental=incremental
+                ),
+                deps=("clean",),
+                inputs=(PROCESSED_DATASET,),
+                outputs=(PROCESSED_DATA_DIR / ORDER_SKETCHES_DIRNAME,),
+                modules=("src.sketches", "src.cube", "src.storage"),
+                params={"precision": ORDER_SKETCH_PRECISION, "incremental": incremental},
+                parallel=True,
+            )
+        )
+    return stages
 
-    # 3. Limpeza
-    clean_df = clean_sales_data(raw_df)
-    save_processed_data(clean_df)
 
-    # 4. EDA básica
-    basic_eda(clean_df)
+def main(argv=None):
+    args = parse_args(argv)
+    ensure_directories()
+    runner = PipelineRunner(build_stages(args))
+    results = runner.run(force=args.force, only=args.only)
 
-    # 5. Visualizações específicas
-    sales_trend_over_time(clean_df)
-    top_categories_by_sales(clean_df)
+    print()
+    print(format_summary(results))
+    if any(result.status in ("falhou", "bloqueado") for result in results):
+        sys.exit(1)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,97 @@
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Callable
+
+from .config import AGGREGATION_CACHE_MAX_ENTRIES, PROCESSED_DATA_DIR
+from .cube import CUBE_DIRNAME
+from .dashboard_metrics import DashboardFilters
+from .feature_engineering import FEATURES_DIRNAME
+from .pipeline import path_fingerprint
+from .sketches import ORDER_SKETCHES_DIRNAME
+from .storage import PROCESSED_CSV_FILENAME, PROCESSED_DATASET_DIRNAME
+
+
+def dataset_version(paths: list[Path] | None = None) -> str:
+    """
+    Versão dos dados processados: hash do tamanho e do mtime de cada arquivo
+    do dataset colunar, do CSV, do cubo, da tabela de features e dos sketches
+    de pedidos. Muda sempre que o pipeline regrava qualquer um deles.
+    """
+    if paths is None:
+        paths = [
+            PROCESSED_DATA_DIR / PROCESSED_DATASET_DIRNAME,
+            PROCESSED_DATA_DIR / PROCESSED_CSV_FILENAME,
+            PROCESSED_DATA_DIR / CUBE_DIRNAME,
+            PROCESSED_DATA_DIR / FEATURES_DIRNAME,
+            PROCESSED_DATA_DIR / ORDER_SKETCHES_DIRNAME,
+        ]
+    payload = json.dumps([path_fingerprint(Path(path)) for path in paths], default=str)
+    return hashlib.sha256(payload.encode()).hexdigest()[:16]
+
+
+def aggregation_key(version: str, backend: str, filters: DashboardFilters | None, name: str = "metrics") -> tuple:
+    """Chave de uma agregação: versão dos dados, backend, nome do resultado e filtros."""
+    return (version, backend, name, None if filters is None else tuple(filters))
+
+
+class AggregationCache:
+    """
+    Cache LRU limitado de agregações do dashboard, compartilhado entre sessões.
+
+    As entradas são chaveadas por ``aggregation_key`` (período, região,
+    categoria, pagamento e versão dos dados). ``set_version`` descarta tudo
+    quando os dados processados mudam. Os valores guardados são compartilhados:
+    quem for alterar um DataFrame devolvido deve copiá-lo antes.
+    """
+
+    def __init__(self, max_entries: int = AGGREGATION_CACHE_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self.version = None
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def set_version(self, version: str):
+        with self._lock:
+            if version != self.version:
+                self._entries.clear()
+                self.version = version
+
+    def get_or_compute(self, key: tuple, compute: Callable[[], object]):
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key]
+            self.misses += 1
+
+        # Calculado fora do lock: outras sessões continuam lendo o cache
+        value = compute()
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+            }
@@ -0,0 +1,236 @@
+from typing import NamedTuple
+
+import numpy as np
+import pandas as pd
+
+from .dashboard_metrics import DAY_ORDER, MONTH_ORDER, DashboardFilters, order_heatmap
+from .filter_index import SalesFilterIndex
+
+
+# Dimensões agrupadas pelas abas (além do dia, de onde saem mês, dia da semana e tendência)
+GROUP_COLUMNS = ["customer_region", "payment_method", "product_category", "discount_percent", "product_id"]
+TOP_PRODUCTS = 10
+TOP_CATEGORIES = 3
+
+
+class _Dimension(NamedTuple):
+    codes: np.ndarray  # código por linha; 0 reservado para valores ausentes
+    labels: pd.Index  # código - 1 -> valor, em ordem crescente (mesma ordem do groupby)
+
+
+def _small_int(codes: np.ndarray, size: int) -> np.ndarray:
+    for dtype in (np.int8, np.int16, np.int32):
+        if size < np.iinfo(dtype).max:
+            return codes.astype(dtype)
+    return codes.astype(np.int64)
+
+
+def _dimension(values: pd.Series) -> _Dimension:
+    codes, labels = pd.factorize(values, sort=True)
+    return _Dimension(_small_int(codes + 1, len(labels) + 1), pd.Index(labels, name=values.name))
+
+
+class _Groups:
+    """Somas e contagens de um grupo de códigos, calculadas com ``np.bincount``."""
+
+    def __init__(self, codes: np.ndarray, size: int):
+        self.codes = codes
+        self.size = size
+        self.count = np.bincount(codes, minlength=size)
+        self.present = np.flatnonzero(self.count[1:] > 0)
+
+    def sum(self, weights: np.ndarray) -> np.ndarray:
+        return np.bincount(self.codes, weights=weights, minlength=self.size)[1:][self.present]
+
+    def mean(self, values: np.ndarray, valid: np.ndarray) -> np.ndarray:
+        # Média ignorando NaN, como o mean do pandas
+        total = np.bincount(self.codes, weights=np.where(valid, values, 0), minlength=self.size)
+        count = np.bincount(self.codes, weights=valid, minlength=self.size)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return (total / count)[1:][self.present]
+
+
+class AggregationPlanner:
+    """
+    Todas as agregações das abas em uma única passada sobre as linhas filtradas.
+
+    As dimensões (região, pagamento, categoria, desconto, produto, dia) são
+    codificadas como inteiros uma vez, na criação. Para um filtro, as posições
+    vêm do ``SalesFilterIndex``; cada coluna numérica é lida uma vez nessas
+    posições e os grupos saem de kernels ``np.bincount``. Mês, dia da semana e
+    tendência mensal são derivados das somas por dia (poucas centenas de
+    valores), sem voltar às linhas. O resultado tem o mesmo formato de
+    ``dashboard_metrics.compute_dashboard_metrics``.
+    """
+
+    def __init__(self, index: SalesFilterIndex):
+        self.index = index
+        df = index.df
+        self.revenue = df["total_revenue"].to_numpy(dtype="float64")
+        self.quantity = df["quantity_sold"].to_numpy()
+        self.rating = df["rating"].to_numpy(dtype="float64")
+        self.price = df["price"].to_numpy(dtype="float64")
+        self.dimensions = {col: _dimension(df[col]) for col in GROUP_COLUMNS + ["order_date"]}
+
+        order_codes, order_labels = pd.factorize(df["order_id"])
+        self.order_codes = order_codes
+        self.order_count = len(order_labels)
+        # Caso comum: um order_id por linha, e pedidos distintos = linhas
+        self.orders_unique = self.order_count == len(df) and bool((order_codes >= 0).all())
+
+        days = self.dimensions["order_date"].labels
+        self.day_weekday = np.asarray(days.dayofweek)
+        self.day_month = np.asarray(days.month)
+        self.day_year_month = np.asarray(days.year * 12 + days.month - 1)
+
+    def _distinct_orders(self, sel, row_count: int, groups: _Groups | None = None):
+        """Pedidos distintos no total (``groups=None``) ou por grupo presente."""
+        if self.orders_unique:
+            return row_count if groups is None else groups.count[1:][groups.present]
+        orders = self.order_codes[sel]
+        known = orders >= 0
+        if groups is None:
+            return len(np.unique(orders[known]))
+        pairs = np.unique(groups.codes[known].astype(np.int64) * self.order_count + orders[known])
+        per_group = np.bincount(pairs // self.order_count, minlength=groups.size)
+        return per_group[1:][groups.present]
+
+    def compute(self, filters: DashboardFilters, keys=None) -> dict:
+        def wanted(key):
+            return keys is None or key in keys
+
+        sel = self.index.select_positions(filters)
+        revenue = self.revenue[sel]
+        quantity = self.quantity[sel]
+        rating = self.rating[sel]
+        rating_valid = ~np.isnan(rating)
+        row_count = len(revenue)
+        has_rows = row_count > 0
+
+        groups = {}
+
+        def grouped(col):
+            if col not in groups:
+                dimension = self.dimensions[col]
+                groups[col] = _Groups(dimension.codes[sel], len(dimension.labels) + 1)
+            return groups[col]
+
+        def labels(col):
+            dimension = self.dimensions[col]
+            return dimension.labels[grouped(col).present]
+
+        metrics = {}
+        if wanted("row_count"):
+            metrics["row_count"] = row_count
+        if wanted("total_revenue"):
+            metrics["total_revenue"] = revenue.sum()
+        if wanted("total_orders"):
+            metrics["total_orders"] = self._distinct_orders(sel, row_count)
+        if wanted("revenue_per_unit_mean"):
+            metrics["revenue_per_unit_mean"] = (revenue / quantity).mean() if has_rows else 0
+        if wanted("avg_rating"):
+            metrics["avg_rating"] = rating[rating_valid].mean() if rating_valid.any() else (np.nan if has_rows else 0)
+        if wanted("high_rating_pct"):
+            metrics["high_rating_pct"] = (rating >= 4).mean() * 100 if has_rows else 0
+        if wanted("category_count"):
+            metrics["category_count"] = len(grouped("product_category").present)
+
+        for key, col in (("region_revenue", "customer_region"), ("payment_revenue", "payment_method")):
+            if wanted(key):
+                metrics[key] = pd.DataFrame({col: labels(col), "total_revenue": grouped(col).sum(revenue)})
+
+        calendar_keys = ("daily_revenue", "heatmap", "monthly_revenue", "monthly_trend")
+        if any(wanted(key) for key in calendar_keys):
+            metrics.update(self._calendar_metrics(grouped("order_date"), revenue, wanted))
+
+        if wanted("category_metrics") or wanted("top_categories"):
+            categories = grouped("product_category")
+            category_revenue = categories.sum(revenue)
+            if wanted("category_metrics"):
+                metrics["category_metrics"] = pd.DataFrame({
+                    "product_category": labels("product_category"),
+                    "total_revenue": category_revenue,
+                    "quantity_sold": categories.sum(quantity).astype("int64"),
+                    "order_id": self._distinct_orders(sel, row_count, categories),
+                    "rating": categories.mean(rating, rating_valid),
+                    "price": categories.mean(self.price[sel], ~np.isnan(self.price[sel])),
+                })
+            if wanted("top_categories"):
+                metrics["top_categories"] = pd.Series(
+                    category_revenue, index=labels("product_category"), name="total_revenue"
+                ).nlargest(TOP_CATEGORIES)
+
+        if wanted("discount_analysis") or wanted("discount_efficiency"):
+            discounts = grouped("discount_percent")
+            discount_revenue = discounts.sum(revenue)
+            if wanted("discount_analysis"):
+                metrics["discount_analysis"] = pd.DataFrame({
+                    "discount_percent": labels("discount_percent"),
+                    "sum": discount_revenue,
+                    "count": discounts.sum(~np.isnan(revenue)).astype("int64"),
+                })
+            if wanted("discount_efficiency"):
+                metrics["discount_efficiency"] = pd.DataFrame({
+                    "discount_percent": labels("discount_percent"),
+                    "total_revenue": discount_revenue,
+                    "quantity_sold": discounts.sum(quantity).astype("int64"),
+                })
+
+        if wanted("top_products"):
+            products = grouped("product_id")
+            product_revenue = products.sum(revenue)
+            top = np.argsort(-product_revenue, kind="stable")[:TOP_PRODUCTS]
+            metrics["top_products"] = pd.DataFrame({
+                "product_id": labels("product_id")[top],
+                "total_revenue": product_revenue[top],
+                "quantity_sold": products.sum(quantity)[top].astype("int64"),
+                "rating": products.mean(rating, rating_valid)[top],
+            })
+
+        return metrics
+
+    def _calendar_metrics(self, days: _Groups, revenue: np.ndarray, wanted) -> dict:
+        day_revenue = days.sum(revenue)
+        present = days.present
+        metrics = {}
+        if wanted("daily_revenue"):
+            metrics["daily_revenue"] = pd.DataFrame({
+                "order_date": self.dimensions["order_date"].labels[present],
+                "total_revenue": day_revenue,
+            })
+        if wanted("heatmap"):
+            cells = np.bincount(
+                self.day_weekday[present] * 12 + self.day_month[present] - 1,
+                weights=day_revenue,
+                minlength=7 * 12,
+            ).reshape(7, 12)
+            seen = np.bincount(
+                self.day_weekday[present] * 12 + self.day_month[present] - 1, minlength=7 * 12
+            ).reshape(7, 12) > 0
+            heatmap = pd.DataFrame(
+                cells[seen.any(axis=1)][:, seen.any(axis=0)],
+                index=pd.Index(np.array(DAY_ORDER)[seen.any(axis=1)], name="day_of_week"),
+                columns=pd.Index(np.array(MONTH_ORDER)[seen.any(axis=0)], name="month_name"),
+            )
+            metrics["heatmap"] = order_heatmap(heatmap)
+        if wanted("monthly_revenue"):
+            months = np.bincount(self.day_month[present], weights=day_revenue, minlength=13)
+            month_seen = np.flatnonzero(np.bincount(self.day_month[present], minlength=13))
+            metrics["monthly_revenue"] = pd.Series(
+                months[month_seen], index=pd.Index(month_seen, name="month"), name="total_revenue"
+            )
+        if wanted("monthly_trend"):
+            # Todos os meses entre o primeiro e o último, com zero nos vazios (pd.Grouper "ME")
+            year_month = self.day_year_month[present]
+            first = year_month.min() if len(year_month) else 0
+            totals = np.bincount(year_month - first, weights=day_revenue) if len(year_month) else []
+            month_ends = [
+                pd.Timestamp(year=int((first + i) // 12), month=int((first + i) % 12) + 1, day=1)
+                + pd.offsets.MonthEnd(0)
+                for i in range(len(totals))
+            ]
+            metrics["monthly_trend"] = pd.DataFrame({
+                "order_date": pd.DatetimeIndex(month_ends),
+                "total_revenue": np.asarray(totals, dtype="float64"),
+            })
+        return metrics
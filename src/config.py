@@ -15,9 +15,76 @@ REPORTS_DIR = BASE_DIR / "reports"
 FIGURES_DIR = REPORTS_DIR / "figures"
 TABLES_DIR = REPORTS_DIR / "tables"
 
-# Garantir que diretórios existem
-for d in [RAW_DATA_DIR, PROCESSED_DATA_DIR, EXTERNAL_DATA_DIR, FIGURES_DIR, TABLES_DIR]:
-    d.mkdir(parents=True, exist_ok=True)
+# Diretórios criados por ensure_directories() (a importação deste módulo não grava nada)
+PROJECT_DIRECTORIES = (RAW_DATA_DIR, PROCESSED_DATA_DIR, EXTERNAL_DATA_DIR, FIGURES_DIR, TABLES_DIR)
 
 # Nome do dataset Kaggle
 KAGGLE_DATASET = "aliiihussain/amazon-sales-dataset"
+
+# Montagem de data/raw a partir da origem: "auto" (hardlink no mesmo sistema de arquivos,
+# senão reflink, senão cópia), "reflink" (reflink ou cópia) ou "copy"; e cópias simultâneas
+RAW_STAGING_MODE = "auto"
+RAW_STAGING_WORKERS = 4
+
+# Armazenamento colunar dos dados processados
+# Formato: "parquet" ou "feather"; compressão: "zstd", "snappy", "lz4", "gzip" ou "none"
+PROCESSED_FORMAT = "parquet"
+PROCESSED_COMPRESSION = "zstd"
+PROCESSED_ROW_GROUP_SIZE = 100_000
+# Particionar o dataset processado em diretórios order_year=AAAA/order_month=MM
+PROCESSED_PARTITION_BY_MONTH = True
+# Manter também o CSV para compatibilidade com ferramentas externas
+PROCESSED_WRITE_CSV = True
+
+# Limpeza em streaming (arquivos brutos maiores que a memória)
+CLEANING_MEMORY_BUDGET_MB = 512
+# Cópias simultâneas de um chunk durante a limpeza (entrada e saída filtrada)
+CLEANING_MEMORY_FACTOR = 2
+# Limpeza em paralelo (motor pandas): processos e tamanho alvo de cada faixa de bytes do
+# CSV bruto. Com 1 processo (ou 1 núcleo) a limpeza roda no processo principal
+CLEANING_WORKERS = 4
+CLEANING_PARTITION_MB = 64
+
+# Motor da limpeza em memória e das features do dashboard: "pandas" ou "polars"
+# (planos lazy do Polars, em todos os núcleos)
+DATAFRAME_ENGINE = "pandas"
+
+# Backend das agregações do dashboard: "cube" (cubo pré-agregado), "pandas" (linha a linha)
+# ou "duckdb" (SQL embutido sobre os arquivos processados, sem carregar as linhas)
+DASHBOARD_BACKEND = "cube"
+# Schema compacto (categorias, inteiros reduzidos, float32) no DataFrame do dashboard
+DASHBOARD_COMPACT_SCHEMA = True
+# Combinações de filtros cujas agregações ficam no cache compartilhado (LRU)
+AGGREGATION_CACHE_MAX_ENTRIES = 256
+# Pedidos distintos no backend "cube": "exact" (somas do cubo, exatas enquanto um pedido não se
+# repete entre células) ou "sketch" (HyperLogLog por célula, erro padrão 1,04 / sqrt(2 ** precisão))
+ORDER_COUNT_MODE = "exact"
+ORDER_SKETCH_PRECISION = 12
+
+# Séries longas dos gráficos: pontos enviados ao navegador por pixel de largura do gráfico,
+# algoritmo ("lttb", "minmax" ou "none") e a partir de quantos pontos usar traços WebGL
+CHART_WIDTH_PX = 1200
+CHART_POINTS_PER_PIXEL = 1
+CHART_DOWNSAMPLE_METHOD = "lttb"
+CHART_WEBGL_THRESHOLD = 1000
+
+# Cache dos estágios do pipeline (main.py)
+PIPELINE_CACHE_DIR = DATA_DIR / ".cache" / "pipeline"
+PIPELINE_MAX_WORKERS = 4
+
+# Renderização das figuras: processos paralelos e se pula figuras cujos dados não mudaram
+FIGURE_WORKERS = 4
+FIGURE_SKIP_UNCHANGED = True
+
+# EDA em streaming (src.streaming_stats): linhas por lote, processos sobre os arquivos do dataset,
+# tamanho do sketch KLL de quantis e largura dos histogramas de bins fixos por coluna
+EDA_BATCH_ROWS = 250_000
+EDA_WORKERS = 4
+EDA_QUANTILE_K = 200
+EDA_HISTOGRAM_WIDTHS = {"price": 0.25}
+
+
+def ensure_directories(directories=PROJECT_DIRECTORIES):
+    """Cria os diretórios de dados e de relatórios que ainda não existem."""
+    for d in directories:
+        Path(d).mkdir(parents=True, exist_ok=True)
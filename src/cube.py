@@ -0,0 +1,270 @@
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from .config import PROCESSED_DATA_DIR
+from .dashboard_metrics import DashboardFilters, order_heatmap
+from .storage import (
+    PROCESSED_CSV_FILENAME,
+    PROCESSED_DATASET_DIRNAME,
+    appended_since,
+    load_processed_files,
+    load_processed_sales_data,
+    save_dataset_sources,
+    write_processed_dataset,
+)
+
+
+CUBE_DIRNAME = "amazon_sales_cube"
+CUBE_DIMENSIONS = ["order_date", "customer_region", "product_category", "payment_method"]
+CUBE_COLUMNS = [
+    "order_id",
+    "order_date",
+    "product_category",
+    "price",
+    "quantity_sold",
+    "customer_region",
+    "payment_method",
+    "rating",
+    "total_revenue",
+]
+# Chaves de compute_dashboard_metrics respondidas pelo cubo (as demais são ROW_LEVEL_KEYS)
+CUBE_KEYS = (
+    "row_count",
+    "total_revenue",
+    "total_orders",
+    "revenue_per_unit_mean",
+    "avg_rating",
+    "high_rating_pct",
+    "category_count",
+    "region_revenue",
+    "payment_revenue",
+    "daily_revenue",
+    "heatmap",
+    "category_metrics",
+    "top_categories",
+    "monthly_revenue",
+    "monthly_trend",
+)
+
+
+def build_sales_cube(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Agrega as vendas no grão dia x região x categoria x pagamento.
+
+    Medidas por célula:
+    - revenue / quantity: somas de total_revenue e quantity_sold
+    - rows: número de linhas
+    - orders: pedidos distintos (somar células é exato enquanto um pedido
+      não se repete em células diferentes, como no dataset atual)
+    - rating_sum / rating_count / rating_high: base para média e % de rating >= 4
+    - price_sum / revenue_per_unit_sum: base para preço médio e receita média por unidade
+    """
+    rating = df["rating"]
+    cells = pd.DataFrame({
+        "order_date": df["order_date"].dt.normalize(),
+        "customer_region": df["customer_region"],
+        "product_category": df["product_category"],
+        "payment_method": df["payment_method"],
+        "order_id": df["order_id"],
+        "revenue": df["total_revenue"],
+        "quantity": df["quantity_sold"],
+        "rating_sum": rating.fillna(0),
+        "rating_count": rating.notna().astype("int64"),
+        "rating_high": (rating >= 4).astype("int64"),
+        "price_sum": df["price"],
+        "revenue_per_unit_sum": df["total_revenue"] / df["quantity_sold"],
+    })
+
+    grouped = cells.groupby(CUBE_DIMENSIONS, observed=True, sort=True)
+    cube = grouped.agg(
+        revenue=("revenue", "sum"),
+        quantity=("quantity", "sum"),
+        rows=("order_id", "size"),
+        orders=("order_id", "nunique"),
+        rating_sum=("rating_sum", "sum"),
+        rating_count=("rating_count", "sum"),
+        rating_high=("rating_high", "sum"),
+        price_sum=("price_sum", "sum"),
+        revenue_per_unit_sum=("revenue_per_unit_sum", "sum"),
+    ).reset_index()
+    return cube
+
+
+def merge_cube_cells(cube: pd.DataFrame, delta: pd.DataFrame) -> pd.DataFrame:
+    """
+    Junta ao cubo as células calculadas sobre linhas novas.
+
+    Só as células dos dias presentes em ``delta`` são reagrupadas (soma de
+    cada medida); as demais são mantidas como estão. Como em
+    ``build_sales_cube``, somar ``orders`` supõe que as linhas novas não
+    repetem pedidos já contados na mesma célula (a limpeza incremental só
+    aceita ``order_id`` acima da marca d'água).
+    """
+    if cube.empty:
+        return delta.reset_index(drop=True)
+    affected = cube["order_date"].isin(delta["order_date"].unique())
+    merged = (
+        pd.concat([cube[affected], delta], ignore_index=True)
+        .groupby(CUBE_DIMENSIONS, observed=True, sort=False)
+        .sum()
+        .reset_index()
+    )
+    return (
+        pd.concat([cube[~affected], merged], ignore_index=True)
+        .sort_values(CUBE_DIMENSIONS, kind="stable")
+        .reset_index(drop=True)
+    )
+
+
+def save_sales_cube(cube: pd.DataFrame, output_dir: Path = PROCESSED_DATA_DIR) -> Path:
+    output_path = write_processed_dataset(cube, output_dir / CUBE_DIRNAME)
+    print(f"Cubo agregado ({len(cube):,} células) salvo em: {output_path}")
+    return output_path
+
+
+def build_cube_from_processed(output_dir: Path = PROCESSED_DATA_DIR, incremental: bool = False) -> Path:
+    """
+    Estágio do pipeline: agrega os dados processados e grava o cubo.
+
+    Com ``incremental``, agrega só os arquivos acrescentados pela limpeza
+    incremental desde o último cubo e os junta às células gravadas
+    (``merge_cube_cells``); sem esse histórico, refaz o cubo inteiro.
+    """
+    dataset_dir = output_dir / PROCESSED_DATASET_DIRNAME
+    cube_dir = output_dir / CUBE_DIRNAME
+    sources, new_files = appended_since(cube_dir, dataset_dir)
+    if incremental and new_files is not None:
+        if not new_files:
+            print(f"Cubo agregado já inclui todos os dados processados: {cube_dir}")
+            return cube_dir
+        delta = build_sales_cube(load_processed_files(new_files, CUBE_COLUMNS))
+        cube = merge_cube_cells(load_sales_cube(output_dir), delta)
+    else:
+        df = load_processed_sales_data(
+            columns=CUBE_COLUMNS,
+            dataset_dir=dataset_dir,
+            csv_path=output_dir / PROCESSED_CSV_FILENAME,
+        )
+        cube = build_sales_cube(df)
+    output_path = save_sales_cube(cube, output_dir)
+    save_dataset_sources(cube_dir, sources)
+    return output_path
+
+
+def load_sales_cube(output_dir: Path = PROCESSED_DATA_DIR) -> pd.DataFrame:
+    return load_processed_sales_data(
+        dataset_dir=output_dir / CUBE_DIRNAME,
+        csv_path=output_dir / f"{CUBE_DIRNAME}.csv",
+    )
+
+
+def filter_cube(cube: pd.DataFrame, filters: DashboardFilters) -> pd.DataFrame:
+    """Seleciona as células do período (datas inclusivas) e das dimensões escolhidas."""
+    mask = (cube["order_date"] >= pd.Timestamp(filters.start_date)) & (
+        cube["order_date"] <= pd.Timestamp(filters.end_date)
+    )
+    if filters.region is not None:
+        mask &= cube["customer_region"] == filters.region
+    if filters.category is not None:
+        mask &= cube["product_category"] == filters.category
+    if filters.payment is not None:
+        mask &= cube["payment_method"] == filters.payment
+    return cube[mask]
+
+
+def cube_count_orders(cube: pd.DataFrame, start: pd.Timestamp, end: pd.Timestamp) -> int:
+    """Equivalente de ``count_orders`` sobre o cubo (apenas filtro de período)."""
+    mask = (cube["order_date"] >= start) & (cube["order_date"] <= end)
+    return int(cube.loc[mask, "orders"].sum())
+
+
+def compute_cube_metrics(cube: pd.DataFrame, filters: DashboardFilters, keys=None) -> dict:
+    """
+    Responde as agregações das abas a partir do cubo, no mesmo formato de
+    ``dashboard_metrics.compute_dashboard_metrics`` (exceto ``ROW_LEVEL_KEYS``).
+    ``keys`` restringe o cálculo a um subconjunto de métricas.
+    """
+    def wanted(key):
+        return keys is None or key in keys
+
+    cells = filter_cube(cube, filters)
+    rows = int(cells["rows"].sum())
+    has_rows = rows > 0
+
+    def revenue_by(column):
+        return (
+            cells.groupby(column, observed=True)["revenue"].sum()
+            .rename("total_revenue").reset_index()
+        )
+
+    metrics = {}
+    if wanted("row_count"):
+        metrics["row_count"] = rows
+    if wanted("total_revenue"):
+        metrics["total_revenue"] = cells["revenue"].sum()
+    if wanted("total_orders"):
+        metrics["total_orders"] = int(cells["orders"].sum())
+    if wanted("revenue_per_unit_mean"):
+        metrics["revenue_per_unit_mean"] = cells["revenue_per_unit_sum"].sum() / rows if has_rows else 0
+    if wanted("avg_rating"):
+        metrics["avg_rating"] = (
+            cells["rating_sum"].sum() / cells["rating_count"].sum()
+            if cells["rating_count"].sum() > 0 else (np.nan if has_rows else 0)
+        )
+    if wanted("high_rating_pct"):
+        metrics["high_rating_pct"] = cells["rating_high"].sum() / rows * 100 if has_rows else 0
+    if wanted("category_count"):
+        metrics["category_count"] = cells["product_category"].nunique()
+    if wanted("region_revenue"):
+        metrics["region_revenue"] = revenue_by("customer_region")
+    if wanted("payment_revenue"):
+        metrics["payment_revenue"] = revenue_by("payment_method")
+    if wanted("daily_revenue"):
+        metrics["daily_revenue"] = revenue_by("order_date")
+
+    if wanted("heatmap"):
+        metrics["heatmap"] = order_heatmap(
+            cells.assign(
+                day_of_week=cells["order_date"].dt.day_name(),
+                month_name=cells["order_date"].dt.month_name(),
+            ).pivot_table(
+                values="revenue",
+                index="day_of_week",
+                columns="month_name",
+                aggfunc="sum",
+                fill_value=0,
+                observed=True,
+            )
+        )
+
+    if wanted("category_metrics") or wanted("top_categories"):
+        by_category = cells.groupby("product_category", observed=True).agg(
+            total_revenue=("revenue", "sum"),
+            quantity_sold=("quantity", "sum"),
+            order_id=("orders", "sum"),
+            rating_sum=("rating_sum", "sum"),
+            rating_count=("rating_count", "sum"),
+            price_sum=("price_sum", "sum"),
+            rows=("rows", "sum"),
+        )
+        by_category["rating"] = by_category["rating_sum"] / by_category["rating_count"]
+        by_category["price"] = by_category["price_sum"] / by_category["rows"]
+        if wanted("category_metrics"):
+            metrics["category_metrics"] = by_category[
+                ["total_revenue", "quantity_sold", "order_id", "rating", "price"]
+            ].reset_index()
+        if wanted("top_categories"):
+            metrics["top_categories"] = by_category["total_revenue"].nlargest(3)
+
+    if wanted("monthly_revenue"):
+        metrics["monthly_revenue"] = cells.groupby(
+            cells["order_date"].dt.month.rename("month")
+        )["revenue"].sum().rename("total_revenue")
+    if wanted("monthly_trend"):
+        metrics["monthly_trend"] = cells.groupby(
+            pd.Grouper(key="order_date", freq="ME")
+        )["revenue"].sum().rename("total_revenue").reset_index()
+
+    return metrics
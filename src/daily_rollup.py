@@ -0,0 +1,134 @@
+import numpy as np
+import pandas as pd
+
+from .dashboard_metrics import DashboardFilters
+
+
+# Medidas do cubo acumuladas por dia
+ROLLUP_MEASURES = [
+    "revenue",
+    "quantity",
+    "rows",
+    "orders",
+    "rating_sum",
+    "rating_count",
+    "rating_high",
+    "revenue_per_unit_sum",
+]
+# Dimensões de filtro da sidebar, na ordem dos eixos do rollup
+ROLLUP_DIMENSIONS = ["customer_region", "product_category", "payment_method"]
+# KPIs do dashboard respondidos pelo rollup
+ROLLUP_KEYS = (
+    "row_count",
+    "total_revenue",
+    "total_orders",
+    "revenue_per_unit_mean",
+    "avg_rating",
+    "high_rating_pct",
+)
+
+
+class DailyRollup:
+    """
+    Somas acumuladas por dia, densas no calendário, para cada combinação de filtros.
+
+    Os eixos são ``dia x região x categoria x pagamento``, onde o índice 0 de
+    cada dimensão é "Todas"/"Todos". Cada medida guarda o prefixo
+    ``P[d] = soma dos dias < d``, então o total de qualquer período é
+    ``P[fim + 1] - P[início]``: duas leituras, qualquer que seja o tamanho do
+    histórico. Construído a partir do cubo (``src.cube``), com tamanho
+    ``dias x (valores + 1)`` por dimensão.
+    """
+
+    def __init__(self, cube: pd.DataFrame):
+        dates = pd.to_datetime(cube["order_date"]).dt.normalize()
+        if len(cube):
+            self.days = pd.date_range(dates.min(), dates.max(), freq="D").to_numpy()
+            day_codes = (dates - dates.min()).dt.days.to_numpy()
+        else:
+            self.days = np.array([], dtype="datetime64[ns]")
+            day_codes = np.array([], dtype=np.int64)
+
+        self.labels = {}
+        dimension_codes = []
+        for col in ROLLUP_DIMENSIONS:
+            codes, labels = pd.factorize(cube[col], sort=True)
+            self.labels[col] = {label: code + 1 for code, label in enumerate(labels)}
+            dimension_codes.append(codes + 1)
+        shape = (len(self.days),) + tuple(len(self.labels[col]) + 1 for col in ROLLUP_DIMENSIONS)
+        size = int(np.prod(shape))
+
+        # Cada célula entra nas 8 combinações (valor ou "todas") das três dimensões
+        flat_indexes = [
+            np.ravel_multi_index(
+                (day_codes,) + tuple(
+                    codes if mask >> axis & 1 else np.zeros_like(codes)
+                    for axis, codes in enumerate(dimension_codes)
+                ),
+                shape,
+            )
+            for mask in range(2 ** len(ROLLUP_DIMENSIONS))
+        ]
+        self.prefix = {}
+        for measure in ROLLUP_MEASURES:
+            values = cube[measure].to_numpy(dtype="float64")
+            totals = sum(np.bincount(flat, weights=values, minlength=size) for flat in flat_indexes)
+            self.prefix[measure] = np.concatenate(
+                [np.zeros((1,) + shape[1:]), np.cumsum(np.reshape(totals, shape), axis=0)]
+            )
+
+    def _day_bounds(self, start, end) -> tuple[int, int]:
+        # Dias d com start <= d <= end (start/end podem ter horário, como em count_orders)
+        lo = int(np.searchsorted(self.days, np.datetime64(pd.Timestamp(start)), side="left"))
+        hi = int(np.searchsorted(self.days, np.datetime64(pd.Timestamp(end)), side="right"))
+        return lo, max(lo, hi)
+
+    def _cell(self, region=None, category=None, payment=None) -> tuple | None:
+        cell = []
+        for col, value in zip(ROLLUP_DIMENSIONS, (region, category, payment)):
+            if value is None:
+                cell.append(0)
+            elif value in self.labels[col]:
+                cell.append(self.labels[col][value])
+            else:
+                return None
+        return tuple(cell)
+
+    def range_totals(self, start, end, region=None, category=None, payment=None) -> dict:
+        """Soma de cada medida entre ``start`` e ``end`` (inclusivos) nos filtros dados."""
+        lo, hi = self._day_bounds(start, end)
+        cell = self._cell(region, category, payment)
+        if cell is None:
+            return {measure: 0.0 for measure in ROLLUP_MEASURES}
+        return {
+            measure: prefix[(hi,) + cell] - prefix[(lo,) + cell]
+            for measure, prefix in self.prefix.items()
+        }
+
+    def kpis(self, filters: DashboardFilters) -> dict:
+        """``ROLLUP_KEYS`` no mesmo formato de ``compute_dashboard_metrics``."""
+        end = pd.Timestamp(filters.end_date) + pd.Timedelta(days=1) - pd.Timedelta(seconds=1)
+        totals = self.range_totals(
+            filters.start_date, end, filters.region, filters.category, filters.payment
+        )
+        rows = int(round(totals["rows"]))
+        has_rows = rows > 0
+        rating_count = round(totals["rating_count"])
+        return {
+            "row_count": rows,
+            "total_revenue": totals["revenue"],
+            "total_orders": int(round(totals["orders"])),
+            "revenue_per_unit_mean": totals["revenue_per_unit_sum"] / rows if has_rows else 0,
+            "avg_rating": (
+                totals["rating_sum"] / rating_count if rating_count > 0 else (np.nan if has_rows else 0)
+            ),
+            "high_rating_pct": totals["rating_high"] / rows * 100 if has_rows else 0,
+        }
+
+    def count_orders(self, start, end) -> int:
+        """Equivalente de ``count_orders`` (apenas filtro de período)."""
+        return int(round(self.range_totals(start, end)["orders"]))
+
+    def total_revenue(self) -> float:
+        """Receita de todo o histórico."""
+        return float(self.prefix["revenue"][(-1, 0, 0, 0)])
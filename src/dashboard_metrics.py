@@ -0,0 +1,156 @@
+import calendar
+from datetime import date
+from typing import NamedTuple
+
+import pandas as pd
+
+
+DAY_ORDER = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
+MONTH_ORDER = list(calendar.month_name)[1:]
+
+# Métricas que dependem de product_id/discount_percent e não cabem no cubo
+ROW_LEVEL_KEYS = ("discount_analysis", "discount_efficiency", "top_products")
+
+
+class DashboardFilters(NamedTuple):
+    """Estado dos filtros da sidebar; ``None`` significa "Todas"/"Todos"."""
+
+    start_date: date
+    end_date: date
+    region: str | None = None
+    category: str | None = None
+    payment: str | None = None
+
+
+def filter_sales_frame(df: pd.DataFrame, filters: DashboardFilters) -> pd.DataFrame:
+    """Aplica o período (datas inclusivas) e os filtros de dimensão linha a linha."""
+    start_datetime = pd.to_datetime(filters.start_date)
+    end_datetime = pd.to_datetime(filters.end_date) + pd.DateOffset(days=1) - pd.DateOffset(seconds=1)
+
+    df_filtered = df[(df["order_date"] >= start_datetime) & (df["order_date"] <= end_datetime)]
+    if filters.region is not None:
+        df_filtered = df_filtered[df_filtered["customer_region"] == filters.region]
+    if filters.category is not None:
+        df_filtered = df_filtered[df_filtered["product_category"] == filters.category]
+    if filters.payment is not None:
+        df_filtered = df_filtered[df_filtered["payment_method"] == filters.payment]
+    return df_filtered
+
+
+def previous_period_bounds(start_date: date, end_date: date) -> tuple[pd.Timestamp, pd.Timestamp]:
+    """Período anterior de mesma duração usado no delta de "Total Pedidos"."""
+    start_datetime = pd.to_datetime(start_date)
+    end_datetime = pd.to_datetime(end_date) + pd.DateOffset(days=1) - pd.DateOffset(seconds=1)
+    period_days = (end_datetime - start_datetime).days
+    prev_start = start_datetime - pd.Timedelta(days=period_days)
+    prev_end = start_datetime - pd.Timedelta(seconds=1)
+    return prev_start, prev_end
+
+
+def count_orders(df: pd.DataFrame, start: pd.Timestamp, end: pd.Timestamp) -> int:
+    """Pedidos distintos com ``start <= order_date <= end`` em todo o dataset."""
+    return df[(df["order_date"] >= start) & (df["order_date"] <= end)]["order_id"].nunique()
+
+
+def order_heatmap(heatmap_data: pd.DataFrame) -> pd.DataFrame:
+    """Ordena dias da semana e meses do mapa de calor, mantendo só os existentes."""
+    if heatmap_data.empty:
+        return heatmap_data
+    available_months = [m for m in MONTH_ORDER if m in heatmap_data.columns]
+    available_days = [d for d in DAY_ORDER if d in heatmap_data.index]
+    return heatmap_data.reindex(available_days)[available_months]
+
+
+def compute_dashboard_metrics(df_filtered: pd.DataFrame, keys=None) -> dict:
+    """
+    Calcula, a partir das linhas filtradas, todas as agregações das abas.
+
+    É a implementação de referência (groupbys pandas) que os demais backends
+    devem reproduzir. ``keys`` restringe o cálculo a um subconjunto de métricas.
+    """
+    def wanted(key):
+        return keys is None or key in keys
+
+    metrics = {}
+    has_rows = len(df_filtered) > 0
+
+    if wanted("row_count"):
+        metrics["row_count"] = len(df_filtered)
+    if wanted("total_revenue"):
+        metrics["total_revenue"] = df_filtered["total_revenue"].sum()
+    if wanted("total_orders"):
+        metrics["total_orders"] = df_filtered["order_id"].nunique()
+    if wanted("revenue_per_unit_mean"):
+        metrics["revenue_per_unit_mean"] = (
+            (df_filtered["total_revenue"] / df_filtered["quantity_sold"]).mean() if has_rows else 0
+        )
+    if wanted("avg_rating"):
+        metrics["avg_rating"] = df_filtered["rating"].mean() if has_rows else 0
+    if wanted("high_rating_pct"):
+        metrics["high_rating_pct"] = (df_filtered["rating"] >= 4).mean() * 100 if has_rows else 0
+    if wanted("category_count"):
+        metrics["category_count"] = df_filtered["product_category"].nunique()
+
+    if wanted("region_revenue"):
+        metrics["region_revenue"] = (
+            df_filtered.groupby("customer_region", observed=True)["total_revenue"].sum().reset_index()
+        )
+    if wanted("payment_revenue"):
+        metrics["payment_revenue"] = (
+            df_filtered.groupby("payment_method", observed=True)["total_revenue"].sum().reset_index()
+        )
+    if wanted("daily_revenue"):
+        metrics["daily_revenue"] = (
+            df_filtered.groupby("order_date")["total_revenue"].sum().reset_index()
+        )
+    if wanted("heatmap"):
+        metrics["heatmap"] = order_heatmap(
+            df_filtered.assign(
+                day_of_week=df_filtered["order_date"].dt.day_name(),
+                month_name=df_filtered["order_date"].dt.month_name(),
+            ).pivot_table(
+                values="total_revenue",
+                index="day_of_week",
+                columns="month_name",
+                aggfunc="sum",
+                fill_value=0,
+                observed=True,
+            )
+        )
+    if wanted("category_metrics"):
+        metrics["category_metrics"] = df_filtered.groupby("product_category", observed=True).agg({
+            "total_revenue": "sum",
+            "quantity_sold": "sum",
+            "order_id": "nunique",
+            "rating": "mean",
+            "price": "mean",
+        }).reset_index()
+    if wanted("top_categories"):
+        metrics["top_categories"] = (
+            df_filtered.groupby("product_category", observed=True)["total_revenue"].sum().nlargest(3)
+        )
+    if wanted("monthly_revenue"):
+        metrics["monthly_revenue"] = (
+            df_filtered.groupby(df_filtered["order_date"].dt.month.rename("month"))["total_revenue"].sum()
+        )
+    if wanted("monthly_trend"):
+        metrics["monthly_trend"] = df_filtered.groupby(
+            pd.Grouper(key="order_date", freq="ME")
+        )["total_revenue"].sum().reset_index()
+
+    if wanted("discount_analysis"):
+        metrics["discount_analysis"] = df_filtered.groupby("discount_percent")["total_revenue"].agg(
+            ["sum", "count"]).reset_index()
+    if wanted("discount_efficiency"):
+        metrics["discount_efficiency"] = df_filtered.groupby("discount_percent").agg({
+            "total_revenue": "sum",
+            "quantity_sold": "sum",
+        }).reset_index()
+    if wanted("top_products"):
+        metrics["top_products"] = df_filtered.groupby("product_id").agg({
+            "total_revenue": "sum",
+            "quantity_sold": "sum",
+            "rating": "mean",
+        }).sort_values("total_revenue", ascending=False).head(10).reset_index()
+
+    return metrics
@@ -1,35 +1,266 @@
+import errno
+import hashlib
+import json
+import os
 import shutil
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
 from pathlib import Path
 
-import kagglehub
-from .config import RAW_DATA_DIR, KAGGLE_DATASET
+from .config import KAGGLE_DATASET, RAW_DATA_DIR, RAW_STAGING_MODE, RAW_STAGING_WORKERS
 
 
-def download_amazon_sales_dataset() -> Path:
+MANIFEST_FILENAME = ".manifest.json"
+STAGING_MODES = ("auto", "reflink", "copy")
+# ioctl FICLONE do Linux: o destino passa a compartilhar os blocos da origem (btrfs, XFS)
+FICLONE = 0x40049409
+# renameat2 do Linux (>= 3.15, glibc >= 2.28): RENAME_EXCHANGE troca dois caminhos numa só chamada
+AT_FDCWD = -100
+RENAME_EXCHANGE = 2
+
+
+@dataclass
+class LocalDirectorySource:
+    """Origem já presente em disco (execuções offline e testes)."""
+
+    path: Path
+
+    def fetch(self) -> Path:
+        path = Path(self.path)
+        if not path.is_dir():
+            raise FileNotFoundError(f"Diretório de origem não encontrado: {path}")
+        return path
+
+
+@dataclass
+class KaggleHubSource:
+    """Última versão do dataset Kaggle, baixada (ou reaproveitada do cache) pelo kagglehub."""
+
+    dataset: str = field(default=KAGGLE_DATASET)
+
+    def fetch(self) -> Path:
+        # Importado só aqui: o kagglehub (e o IPython que ele carrega) custa ~0,5 s
+        import kagglehub
+
+        print(f"Baixando dataset '{self.dataset}' via kagglehub...")
+        return Path(kagglehub.dataset_download(self.dataset))
+
+
+def file_sha256(path: Path, block_size: int = 1024 * 1024) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(block_size), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def load_manifest(directory: Path) -> dict:
+    """Manifesto dos arquivos já copiados: caminho relativo -> tamanho, mtime e sha256."""
+    manifest_path = directory / MANIFEST_FILENAME
+    if not manifest_path.exists():
+        return {}
+    return json.loads(manifest_path.read_text(encoding="utf-8"))
+
+
+def save_manifest(directory: Path, manifest: dict):
+    manifest_path = directory / MANIFEST_FILENAME
+    manifest_path.write_text(json.dumps(manifest, indent=2, sort_keys=True), encoding="utf-8")
+
+
+def _reflink(source: Path, dest: Path):
+    import fcntl
+
+    with open(source, "rb") as src, open(dest, "wb") as dst:
+        fcntl.ioctl(dst.fileno(), FICLONE, src.fileno())
+    shutil.copystat(source, dest)
+
+
+def place_file(source: Path, dest: Path, mode: str = RAW_STAGING_MODE) -> str:
+    """
+    Coloca ``source`` em ``dest`` sem duplicar dados quando possível e
+    retorna como: "hardlink" (só em ``mode="auto"`` e no mesmo sistema de
+    arquivos; o destino compartilha o inode com a origem), "reflink" ou "copy".
+    """
+    if mode == "auto":
+        try:
+            os.link(source, dest)
+            return "hardlink"
+        except OSError:
+            pass
+    if mode in ("auto", "reflink"):
+        try:
+            _reflink(source, dest)
+            return "reflink"
+        except (ImportError, OSError):
+            dest.unlink(missing_ok=True)
+    shutil.copy2(source, dest)
+    return "copy"
+
+
+def _stage_file(item: Path, staged: Path, current: Path, entry: dict | None, mode: str):
+    """
+    Monta um arquivo no diretório de staging. Inalterado em relação ao
+    manifesto: hardlink do arquivo atual do destino. Novo ou alterado:
+    ``place_file`` a partir da origem, com o sha256 conferido (cópias e
+    reflinks são relidos; hardlinks são o mesmo inode).
     """
-    Faz o download da última versão do dataset de vendas da Amazon
-    via kagglehub e copia os arquivos para data/raw.
+    stat = item.stat()
+    staged.parent.mkdir(parents=True, exist_ok=True)
+    digest = None
+    if entry and current.exists():
+        if entry["size"] == stat.st_size and entry["mtime_ns"] == stat.st_mtime_ns:
+            os.link(current, staged)
+            return entry, "skipped"
+        digest = file_sha256(item)
+        if entry["sha256"] == digest:
+            os.link(current, staged)
+            return {**entry, "mtime_ns": stat.st_mtime_ns}, "skipped"
+
+    digest = digest or file_sha256(item)
+    method = place_file(item, staged, mode)
+    verified = os.path.samefile(item, staged) if method == "hardlink" else file_sha256(staged) == digest
+    if not verified:
+        raise OSError(f"sha256 divergente após {method} de {item} para {staged}")
+    return {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns, "sha256": digest}, method
+
+
+def _exchange_paths(first: Path, second: Path) -> bool:
+    """
+    Troca ``first`` e ``second`` atomicamente (``renameat2`` com
+    ``RENAME_EXCHANGE``). Retorna False quando a chamada não existe no
+    sistema, no kernel ou no sistema de arquivos.
+    """
+    if not sys.platform.startswith("linux"):
+        return False
+    import ctypes
+
+    try:
+        renameat2 = ctypes.CDLL(None, use_errno=True).renameat2
+    except (OSError, AttributeError):
+        return False
+    renameat2.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_int, ctypes.c_char_p, ctypes.c_uint]
+    renameat2.restype = ctypes.c_int
+    if renameat2(AT_FDCWD, os.fsencode(first), AT_FDCWD, os.fsencode(second), RENAME_EXCHANGE) == 0:
+        return True
+    error = ctypes.get_errno()
+    if error in (errno.ENOSYS, errno.EINVAL, errno.EOPNOTSUPP):
+        return False
+    raise OSError(error, os.strerror(error), str(first), None, str(second))
+
+
+def swap_directories(staging_dir: Path, target_dir: Path):
+    """
+    Põe ``staging_dir`` no lugar de ``target_dir`` e apaga a versão anterior.
+
+    No Linux os dois diretórios são trocados numa única chamada
+    (``_exchange_paths``): quem lê ``target_dir`` vê a versão anterior ou a
+    nova, nunca a ausência do diretório. Sem essa chamada, a troca usa dois
+    renames (o atual vai para ``.old``, o staging entra no lugar), com uma
+    breve janela sem ``target_dir``; numa falha do segundo, o anterior volta.
+    """
+    if target_dir.exists() and _exchange_paths(staging_dir, target_dir):
+        # Depois da troca, o staging guarda a versão anterior
+        shutil.rmtree(staging_dir)
+        return
+
+    backup_dir = target_dir.with_name(target_dir.name + ".old")
+    if backup_dir.exists():
+        shutil.rmtree(backup_dir)
+    if target_dir.exists():
+        target_dir.rename(backup_dir)
+    try:
+        staging_dir.rename(target_dir)
+    except OSError:
+        if backup_dir.exists():
+            backup_dir.rename(target_dir)
+        raise
+    if backup_dir.exists():
+        shutil.rmtree(backup_dir)
+
+
+def sync_raw_files(
+    source_path: Path,
+    target_dir: Path,
+    mode: str = RAW_STAGING_MODE,
+    workers: int = RAW_STAGING_WORKERS,
+) -> dict:
+    """
+    Espelha ``source_path`` em ``target_dir`` trazendo só os arquivos novos ou alterados.
+
+    Um arquivo é considerado inalterado quando tamanho e mtime batem com o
+    manifesto; se só o mtime mudou, o sha256 decide. A nova versão é montada
+    em ``<target_dir>.staging`` (inalterados por hardlink do destino atual,
+    os demais por ``place_file`` em ``workers`` threads, com sha256
+    conferido) e troca o destino só quando está completa; numa falha o
+    destino fica intacto. Arquivos que saíram da origem não entram na nova
+    versão. Retorna as contagens por forma (hardlink, reflink, copy),
+    ignorados e removidos.
+    """
+    if mode not in STAGING_MODES:
+        raise ValueError(f"Modo de staging desconhecido: {mode}")
+
+    manifest = load_manifest(target_dir)
+    staging_dir = target_dir.with_name(target_dir.name + ".staging")
+    if staging_dir.exists():
+        shutil.rmtree(staging_dir)
+    staging_dir.mkdir(parents=True)
+
+    items = sorted(p for p in source_path.rglob("*") if p.is_file())
+    rels = [item.relative_to(source_path).as_posix() for item in items]
+    try:
+        with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+            futures = [
+                pool.submit(_stage_file, item, staging_dir / rel, target_dir / rel, manifest.get(rel), mode)
+                for item, rel in zip(items, rels)
+            ]
+            results = [future.result() for future in futures]
+    except BaseException:
+        shutil.rmtree(staging_dir, ignore_errors=True)
+        raise
+
+    stats = {"hardlink": 0, "reflink": 0, "copy": 0, "skipped": 0}
+    new_manifest = {}
+    for rel, (entry, method) in zip(rels, results):
+        new_manifest[rel] = entry
+        stats[method] += 1
+    stats["removed"] = len(set(manifest) - set(new_manifest))
+
+    save_manifest(staging_dir, new_manifest)
+    swap_directories(staging_dir, target_dir)
+    return stats
+
+
+def download_amazon_sales_dataset(
+    source_dir: Path | None = None,
+    target_dir: Path | None = None,
+    source: LocalDirectorySource | KaggleHubSource | None = None,
+    mode: str = RAW_STAGING_MODE,
+) -> Path:
+    """
+    Obtém a última versão do dataset de vendas da Amazon (por padrão via
+    kagglehub, ``KaggleHubSource``) e a espelha em data/raw.
     Retorna o caminho local do diretório em data/raw.
+
+    ``source`` aceita qualquer origem com ``fetch() -> Path``; ``source_dir``
+    é um atalho para ``LocalDirectorySource`` (testes e execuções offline).
+    Arquivos inalterados desde a última execução não são copiados de novo.
     """
-    print(f"Baixando dataset '{KAGGLE_DATASET}' via kagglehub...")
-    path = kagglehub.dataset_download(KAGGLE_DATASET)
-    source_path = Path(path)
+    if source is None:
+        source = LocalDirectorySource(source_dir) if source_dir is not None else KaggleHubSource()
+    source_path = source.fetch()
 
-    target_dir = RAW_DATA_DIR / "amazon_sales"
-    target_dir.mkdir(parents=True, exist_ok=True)
+    target_dir = target_dir or RAW_DATA_DIR / "amazon_sales"
 
-    # Copia todos os arquivos do download para data/raw/amazon_sales
-    for item in source_path.iterdir():
-        dest = target_dir / item.name
-        if item.is_dir():
-            if dest.exists():
-                shutil.rmtree(dest)
-            shutil.copytree(item, dest)
-        else:
-            shutil.copy2(item, dest)
+    # Monta a nova versão de data/raw/amazon_sales ao lado e troca de uma vez
+    stats = sync_raw_files(source_path, target_dir, mode)
 
+    placed = ", ".join(f"{stats[method]} por {method}" for method in ("hardlink", "reflink", "copy"))
     print("Download concluído.")
-    print("Arquivos copiados para:", target_dir)
+    print(
+        f"Arquivos em: {target_dir} "
+        f"({placed}, {stats['skipped']} inalterados, {stats['removed']} removidos)"
+    )
 
     return target_dir
 
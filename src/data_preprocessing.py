@@ -1,12 +1,41 @@
+import csv
+import hashlib
+import io
+import json
+import os
+import shutil
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
+import numpy as np
 import pandas as pd
 
-from .config import RAW_DATA_DIR, PROCESSED_DATA_DIR
+from .config import (
+    RAW_DATA_DIR,
+    PROCESSED_DATA_DIR,
+    PROCESSED_FORMAT,
+    PROCESSED_COMPRESSION,
+    PROCESSED_WRITE_CSV,
+    CLEANING_MEMORY_BUDGET_MB,
+    CLEANING_MEMORY_FACTOR,
+    CLEANING_PARTITION_MB,
+    CLEANING_WORKERS,
+    DATAFRAME_ENGINE,
+)
+from .data_ingestion import swap_directories
+from .storage import (
+    PROCESSED_CSV_FILENAME,
+    PROCESSED_DATASET_DIRNAME,
+    load_processed_sales_data,
+    write_processed_dataset,
+)
 
 
 RAW_SUBDIR = "amazon_sales"
 RAW_FILENAME = "amazon_sales_dataset.csv"
-PROCESSED_FILENAME = "amazon_sales_clean.csv"
+PROCESSED_FILENAME = PROCESSED_CSV_FILENAME
+WATERMARK_FILENAME = "amazon_sales_clean.watermark.json"
+# Bytes iniciais do arquivo bruto usados para detectar que ele foi substituído
+WATERMARK_HEAD_BYTES = 64 * 1024
 
 REQUIRED_COLUMNS = {
     "order_id",
@@ -25,20 +54,294 @@ REQUIRED_COLUMNS = {
 }
 
 
-def load_raw_sales_data() -> pd.DataFrame:
+def raw_sales_file() -> Path:
+    """Caminho do arquivo bruto principal em data/raw/amazon_sales."""
+    return RAW_DATA_DIR / RAW_SUBDIR / RAW_FILENAME
+
+
+NUMERIC_COLUMNS = [
+    "order_id",
+    "product_id",
+    "price",
+    "discount_percent",
+    "quantity_sold",
+    "rating",
+    "review_count",
+    "discounted_price",
+    "total_revenue",
+]
+
+# Tamanho de uma data ISO sem horário (AAAA-MM-DD)
+ISO_DATE_LENGTH = 10
+
+# Schema declarado do CSV bruto: tipo de cada coluna de REQUIRED_COLUMNS
+RAW_DATE_FORMAT = "%Y-%m-%d"
+RAW_INTEGER_COLUMNS = ["order_id", "product_id", "discount_percent", "quantity_sold", "review_count"]
+RAW_FLOAT_COLUMNS = ["price", "rating", "discounted_price", "total_revenue"]
+RAW_CATEGORY_COLUMNS = ["product_category", "customer_region", "payment_method"]
+# Textos aceitos como número quando a coluna é relida como texto (os mesmos de pd.to_numeric)
+RAW_NUMBER_PATTERN = r"^(?i)[+-]?((\d+(\.\d*)?|\.\d+)(e[+-]?\d+)?|inf(inity)?|nan)$"
+
+
+def raw_arrow_types() -> dict:
+    """Tipos do Arrow de cada coluna na leitura do CSV bruto."""
+    import pyarrow as pa
+
+    # date32 só aceita AAAA-MM-DD com dia existente (RAW_DATE_FORMAT)
+    types = {"order_date": pa.date32()}
+    types.update({col: pa.int64() for col in RAW_INTEGER_COLUMNS})
+    types.update({col: pa.float64() for col in RAW_FLOAT_COLUMNS})
+    types.update({col: pa.dictionary(pa.int32(), pa.string()) for col in RAW_CATEGORY_COLUMNS})
+    return types
+
+
+def _csv_header(source: Path | bytes) -> list[str]:
+    if isinstance(source, bytes):
+        first_line = source.split(b"\n", 1)[0]
+    else:
+        with open(source, "rb") as f:
+            first_line = f.readline()
+    return next(csv.reader([first_line.decode("utf-8-sig").rstrip("\r\n")]), [])
+
+
+def _parse_raw_dates(values):
+    """
+    Texto -> timestamp[us] no formato ``RAW_DATE_FORMAT``, com valores
+    inválidos como nulos. O ``strptime`` do Arrow aceita dias inexistentes
+    (2023-02-30 vira 2023-03-02) e campos sem zero à esquerda, então também
+    se exige o tamanho exato e o mesmo dia do texto.
+    """
+    import pyarrow as pa
+    import pyarrow.compute as pc
+
+    values = pc.utf8_trim_whitespace(values)
+    parsed = pc.strptime(values, format=RAW_DATE_FORMAT, unit="us", error_is_null=True)
+    day = pc.utf8_lpad(pc.cast(pc.day(parsed), pa.string()), 2, "0")
+    valid = pc.and_(
+        pc.equal(pc.utf8_length(values), ISO_DATE_LENGTH),
+        pc.equal(pc.utf8_slice_codeunits(values, 8, 10), day),
+    )
+    return pc.if_else(valid, parsed, pa.scalar(None, parsed.type))
+
+
+def _parse_raw_numbers(values):
+    """
+    Texto -> float64 com valores inválidos como nulos, como
+    ``pd.to_numeric(errors="coerce")``: só os textos com forma de número
+    chegam ao cast.
+    """
+    import pyarrow as pa
+    import pyarrow.compute as pc
+
+    values = pc.utf8_trim_whitespace(values)
+    valid = pc.match_substring_regex(values, RAW_NUMBER_PATTERN)
+    return pc.cast(pc.if_else(valid, values, pa.scalar(None, pa.string())), pa.float64())
+
+
+def _cast_raw_column(values, arrow_type):
+    """Coluna relida como texto -> tipo declarado; se algum valor é inválido, nulo no lugar dele."""
+    import pyarrow as pa
+    import pyarrow.compute as pc
+
+    try:
+        return pc.cast(values, arrow_type)
+    except pa.ArrowInvalid:
+        pass
+    if pa.types.is_date(arrow_type):
+        return _parse_raw_dates(values)
+    return _parse_raw_numbers(values)
+
+
+def read_raw_sales_csv(source: Path | bytes) -> pd.DataFrame:
+    """
+    Lê o CSV bruto (caminho ou bytes) com o leitor multi-thread do Arrow e o
+    schema declarado: só as colunas de ``raw_arrow_types``, inteiros e floats
+    já tipados, dimensões de texto como ``category`` (categorias em ordem
+    alfabética) e ``order_date`` no formato fixo ``RAW_DATE_FORMAT``.
+
+    Um valor inválido faz a leitura tipada falhar. O arquivo é então relido
+    uma única vez, com datas e números como texto, e cada coluna é convertida
+    pelo ``pyarrow.compute``: as válidas pelo cast direto, as demais com os
+    valores inválidos como nulos (datas por ``_parse_raw_dates``, números por
+    ``_parse_raw_numbers``, em float64).
+    """
+    import pyarrow as pa
+    import pyarrow.csv as pacsv
+
+    header = _csv_header(source)
+    types = raw_arrow_types()
+    columns = [col for col in header if col in types]
+
+    def read(column_types: dict):
+        data = io.BytesIO(source) if isinstance(source, bytes) else source
+        options = pacsv.ConvertOptions(
+            column_types=column_types,
+            include_columns=columns,
+            strings_can_be_null=True,
+        )
+        return pacsv.read_csv(data, convert_options=options)
+
+    try:
+        table = read({col: types[col] for col in columns})
+    except pa.ArrowInvalid:
+        text_columns = [col for col in columns if col not in RAW_CATEGORY_COLUMNS]
+        table = read({col: pa.string() if col in text_columns else types[col] for col in columns})
+        for col in text_columns:
+            index = table.column_names.index(col)
+            table = table.set_column(index, col, _cast_raw_column(table[col], types[col]))
+
+    return _raw_frame(table, columns)
+
+
+def _raw_frame(table, columns: list[str]) -> pd.DataFrame:
+    """Tabela do Arrow já no schema declarado -> DataFrame na ordem de ``columns``."""
+    import pyarrow as pa
+
+    if "order_date" in table.column_names:
+        dates = table["order_date"].cast(pa.timestamp("us"))
+        table = table.set_column(table.column_names.index("order_date"), "order_date", dates)
+    df = table.to_pandas()
+    del table
+    for col in RAW_CATEGORY_COLUMNS:
+        if col in df.columns and isinstance(df[col].dtype, pd.CategoricalDtype):
+            df[col] = df[col].cat.set_categories(pd.Index(sorted(df[col].cat.categories), dtype="str"))
+    return df[columns]
+
+
+def iter_raw_sales_chunks(sales_file: Path, chunk_rows: int):
     """
-    Carrega o arquivo principal de vendas da pasta data/raw/amazon_sales.
+    Percorre o CSV bruto em DataFrames de ``chunk_rows`` linhas com o leitor
+    em streaming do Arrow e o schema de ``read_raw_sales_csv``: os tipos de
+    cada chunk não dependem do conteúdo dele. Datas e números são lidos como
+    texto e convertidos por ``_cast_raw_column``; as dimensões vêm como texto
+    (o dicionário do Arrow mudaria de um bloco para outro).
     """
-    dataset_dir = RAW_DATA_DIR / RAW_SUBDIR
-    sales_file = dataset_dir / RAW_FILENAME
+    import pyarrow as pa
+    import pyarrow.csv as pacsv
+
+    types = raw_arrow_types()
+    columns = [col for col in _csv_header(sales_file) if col in types]
+    options = pacsv.ConvertOptions(
+        column_types={col: pa.string() for col in columns},
+        include_columns=columns,
+        strings_can_be_null=True,
+    )
+
+    def chunk(table):
+        for col in columns:
+            if col not in RAW_CATEGORY_COLUMNS:
+                index = table.column_names.index(col)
+                table = table.set_column(index, col, _cast_raw_column(table[col], types[col]))
+        return _raw_frame(table, columns)
+
+    pending = []
+    pending_rows = 0
+    for batch in pacsv.open_csv(sales_file, convert_options=options):
+        pending.append(batch)
+        pending_rows += batch.num_rows
+        if pending_rows < chunk_rows:
+            continue
+        table = pa.Table.from_batches(pending)
+        for start in range(0, pending_rows - chunk_rows + 1, chunk_rows):
+            yield chunk(table.slice(start, chunk_rows))
+        rest = table.slice(pending_rows - pending_rows % chunk_rows)
+        pending = rest.to_batches()
+        pending_rows = rest.num_rows
+    if pending_rows:
+        yield chunk(pa.Table.from_batches(pending))
+
+
+def load_raw_sales_data(sales_file: Path | None = None) -> pd.DataFrame:
+    """
+    Carrega o arquivo principal de vendas da pasta data/raw/amazon_sales
+    (ou ``sales_file``, se informado) com o schema declarado
+    (``read_raw_sales_csv``).
+    """
+    sales_file = sales_file or raw_sales_file()
     if not sales_file.exists():
         raise FileNotFoundError(f"Arquivo bruto não encontrado em {sales_file}")
     print(f"Carregando dados de: {sales_file}")
-    df = pd.read_csv(sales_file)
-    return df
+    return read_raw_sales_csv(sales_file)
+
+
+def processed_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Dimensões ``category`` da leitura tipada de volta ao tipo de texto padrão,
+    o schema do dataset processado que os carregadores esperam.
+    """
+    decoded = {
+        col: pd.Series(
+            df[col].cat.categories.astype("str").array.take(df[col].cat.codes.to_numpy(), allow_fill=True),
+            index=df.index,
+        )
+        for col in df.columns
+        if isinstance(df[col].dtype, pd.CategoricalDtype)
+    }
+    return df.assign(**decoded) if decoded else df
+
 
+# Regras de rejeição, na ordem em que são avaliadas. Cada linha rejeitada é
+# contada só na primeira regra que falha.
+REJECTION_RULES = (
+    "order_date_invalida",
+    "total_revenue_ausente",
+    "price_ausente",
+    "discount_percent_ausente",
+    "quantity_sold_ausente",
+    "quantity_sold_nao_positiva",
+    "price_negativo",
+)
 
-def clean_sales_data(df: pd.DataFrame) -> pd.DataFrame:
+
+def _as_numeric(series: pd.Series) -> pd.Series:
+    if pd.api.types.is_numeric_dtype(series) and not pd.api.types.is_bool_dtype(series):
+        return series
+    return pd.to_numeric(series, errors="coerce")
+
+
+def _as_datetime(series: pd.Series, date_format: str | None = None) -> pd.Series:
+    if pd.api.types.is_datetime64_dtype(series):
+        return series
+    parsed = _parse_iso_dates(series)
+    if parsed is not None:
+        return parsed
+    return pd.to_datetime(series, format=date_format, errors="coerce")
+
+
+def _parse_iso_dates(series: pd.Series) -> pd.Series | None:
+    """
+    Caminho rápido para colunas só com datas ``AAAA-MM-DD``: conversão estrita
+    do Arrow (uma data inválida como 2022-02-30 falha em vez de virar outra).
+    Retorna None quando a coluna não se encaixa, e ``pd.to_datetime`` decide.
+    """
+    import pyarrow as pa
+    import pyarrow.compute as pc
+
+    try:
+        values = pa.array(series.array)
+    except (pa.ArrowInvalid, pa.ArrowTypeError):
+        return None
+    if not pa.types.is_string(values.type) and not pa.types.is_large_string(values.type):
+        return None
+    if values.null_count == len(values):
+        return None
+
+    lengths = pc.min_max(pc.utf8_length(values))
+    if lengths["min"].as_py() != ISO_DATE_LENGTH or lengths["max"].as_py() != ISO_DATE_LENGTH:
+        return None
+    try:
+        parsed = pc.cast(values, pa.timestamp("us"))
+    except pa.ArrowInvalid:
+        return None
+    return pd.Series(parsed.to_numpy(zero_copy_only=False), index=series.index, name=series.name)
+
+
+def clean_sales_data(
+    df: pd.DataFrame,
+    rejections: dict | None = None,
+    consume: bool = False,
+    date_format: str | None = None,
+) -> pd.DataFrame:
     """
     Limpeza específica para o schema do dataset Amazon:
 
@@ -56,70 +359,484 @@ def clean_sales_data(df: pd.DataFrame) -> pd.DataFrame:
     - review_count (int)
     - discounted_price (float)
     - total_revenue (float)
+
+    As regras de ``REJECTION_RULES`` viram uma única máscara de validade, e
+    cada coluna é convertida (só se ainda não for numérica/data) e filtrada
+    uma vez. Se ``rejections`` for um dicionário, as linhas rejeitadas por
+    regra são somadas nele. Com ``consume=True`` as colunas de ``df`` são
+    liberadas à medida que a saída é montada (``df`` fica vazio), mantendo
+    o pico de memória próximo do tamanho da entrada. ``date_format`` fixa o
+    formato de ``order_date`` fora do caminho ISO (por padrão o pandas o
+    deduz do primeiro valor não nulo).
     """
     missing_columns = REQUIRED_COLUMNS - set(df.columns)
     if missing_columns:
         missing = ", ".join(sorted(missing_columns))
         raise ValueError(f"Colunas obrigatórias ausentes no dataset: {missing}")
 
-    df = df.copy()
-
     # Garantir tipos adequados
-    df["order_date"] = pd.to_datetime(df["order_date"], errors="coerce")
-    numeric_cols = [
-        "order_id",
-        "product_id",
-        "price",
-        "discount_percent",
-        "quantity_sold",
-        "rating",
-        "review_count",
-        "discounted_price",
-        "total_revenue",
-    ]
-    for col in numeric_cols:
-        df[col] = pd.to_numeric(df[col], errors="coerce")
-
-    # Remover linhas sem data ou sem receita total
-    df = df.dropna(subset=["order_date", "total_revenue"])
-    # Remover linhas sem data, preço ou quantidade
-    df = df.dropna(subset=["order_date", "price", "discount_percent", "quantity_sold"])
-
-    # Remover vendas com quantidade <= 0
-    df = df[df["quantity_sold"] > 0]
+    converted = {"order_date": _as_datetime(df["order_date"], date_format)}
+    for col in NUMERIC_COLUMNS:
+        converted[col] = _as_numeric(df[col])
+
+    # Máscara única: a primeira regra que falha decide a rejeição
+    price = converted["price"].to_numpy()
+    quantity = converted["quantity_sold"].to_numpy()
+    checks = (
+        converted["order_date"].isna().to_numpy(),
+        converted["total_revenue"].isna().to_numpy(),
+        converted["price"].isna().to_numpy(),
+        converted["discount_percent"].isna().to_numpy(),
+        converted["quantity_sold"].isna().to_numpy(),
+        ~(quantity > 0),
+        ~(price >= 0),
+    )
+    valid = np.ones(len(df), dtype=bool)
+    for rule, failed in zip(REJECTION_RULES, checks):
+        rejected = valid & failed
+        if rejections is not None:
+            rejections[rule] = rejections.get(rule, 0) + int(rejected.sum())
+        valid &= ~rejected
+
+    keep_all = bool(valid.all())
+    positions = None if keep_all else np.flatnonzero(valid)
+
+    columns = {}
+    for col in list(df.columns):
+        series = converted.pop(col, df[col])
+        values = series.array
+        if not keep_all:
+            values = values.take(positions)
+        columns[col] = values
+        if consume:
+            del df[col]
+        del series, values
+
+    result = pd.DataFrame(columns, copy=False)
+
     # Corrigir limites conhecidos do domínio
-    df = df[(df["quantity_sold"] > 0) & (df["price"] >= 0)]
-    df["discount_percent"] = df["discount_percent"].clip(lower=0, upper=100)
-    df["rating"] = df["rating"].clip(lower=0, upper=5)
+    result["discount_percent"] = result["discount_percent"].clip(lower=0, upper=100)
+    result["rating"] = result["rating"].clip(lower=0, upper=5)
 
-    # Recalcular total_revenue e discounted_price para consistência
-    df["discounted_price_calc"] = df["price"] * (1 - df["discount_percent"] / 100)
-    df["total_revenue_calc"] = df["discounted_price_calc"] * df["quantity_sold"]
+    # Recalcular discounted_price e total_revenue para consistência
+    # (priorizar valores calculados), sem colunas temporárias
+    discounted = np.divide(result["discount_percent"].to_numpy(), 100, dtype="float64")
+    np.subtract(1, discounted, out=discounted)
+    np.multiply(result["price"].to_numpy(), discounted, out=discounted)
+    result["discounted_price"] = discounted
+    result["total_revenue"] = discounted * result["quantity_sold"].to_numpy()
 
-    # Se a diferença for pequena, substitui pelos valores calculados
-    # Priorizar valores calculados para garantir consistência
-    df["total_revenue"] = df["total_revenue_calc"]
-    df["discounted_price"] = df["discounted_price_calc"]
+    return result
 
-    df = df.drop(columns=["discounted_price_calc", "total_revenue_calc"])
 
-    # Reset index
-    df = df.reset_index(drop=True)
+def raw_byte_ranges(sales_file: Path, partition_bytes: int) -> list[tuple[int, int]]:
+    """
+    Divide o CSV bruto (após o cabeçalho) em faixas ``(início, fim)`` de
+    ~``partition_bytes`` bytes, com cada fim avançado até o próximo ``\\n``:
+    toda faixa contém só linhas completas. Assume, como a leitura
+    incremental, que nenhum campo entre aspas tem quebra de linha.
+    """
+    size = sales_file.stat().st_size
+    ranges = []
+    with open(sales_file, "rb") as f:
+        f.readline()
+        start = f.tell()
+        while start < size:
+            f.seek(max(start + partition_bytes - 1, start))
+            f.readline()
+            end = min(f.tell(), size)
+            ranges.append((start, end))
+            start = end
+    return ranges
+
+
+def _clean_byte_range(sales_file: Path, start: int, end: int):
+    with open(sales_file, "rb") as f:
+        header = f.readline()
+        f.seek(start)
+        data = f.read(end - start)
+    rejections = {}
+    raw = read_raw_sales_csv(header + data)
+    del data
+    return clean_sales_data(raw, rejections, consume=True), rejections
+
+
+def _concat_partitions(parts: list[pd.DataFrame]) -> pd.DataFrame:
+    """Concatena na ordem dada, com as mesmas categorias (ordenadas) em todas as partes."""
+    for col in RAW_CATEGORY_COLUMNS:
+        if col in parts[0].columns and all(isinstance(part[col].dtype, pd.CategoricalDtype) for part in parts):
+            categories = pd.Index(sorted(set().union(*(part[col].cat.categories for part in parts))), dtype="str")
+            parts = [part.assign(**{col: part[col].cat.set_categories(categories)}) for part in parts]
+    return pd.concat(parts, ignore_index=True)
+
+
+def clean_sales_data_parallel(
+    sales_file: Path | None = None,
+    rejections: dict | None = None,
+    workers: int = CLEANING_WORKERS,
+    partition_mb: float = CLEANING_PARTITION_MB,
+) -> pd.DataFrame:
+    """
+    Lê e limpa o arquivo bruto em faixas de bytes, em ``workers`` processos.
+
+    As faixas têm até ``partition_mb`` MB (menores em arquivos pequenos, para
+    ocupar todos os processos) e os resultados são concatenados na ordem do
+    arquivo. Como a leitura tipada não depende do resto do arquivo (schema e
+    formato de data fixos), a saída e as rejeições são as mesmas da limpeza
+    serial (``clean_sales_data`` sobre ``load_raw_sales_data``). Com um único
+    processo (``workers <= 1``), roda a limpeza serial.
+    """
+    sales_file = sales_file or raw_sales_file()
+    if not sales_file.exists():
+        raise FileNotFoundError(f"Arquivo bruto não encontrado em {sales_file}")
+    if workers <= 1:
+        return clean_sales_data(load_raw_sales_data(sales_file), rejections, consume=True)
+
+    size = sales_file.stat().st_size
+    partition_bytes = max(1, min(int(partition_mb * 1024 * 1024), -(-size // workers)))
+    ranges = raw_byte_ranges(sales_file, partition_bytes)
+    print(f"Limpando {sales_file} em {len(ranges)} faixas com {workers} processos")
+
+    parts = []
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [
+            pool.submit(_clean_byte_range, sales_file, start, end)
+            for start, end in ranges
+        ]
+        for future in futures:
+            part, part_rejections = future.result()
+            parts.append(part)
+            if rejections is not None:
+                for rule, count in part_rejections.items():
+                    rejections[rule] = rejections.get(rule, 0) + count
+
+    # Faixas sem linhas válidas não entram na concatenação (não mudam os tipos)
+    non_empty = [part for part in parts if len(part)]
+    if not non_empty:
+        return _clean_byte_range(sales_file, size, size)[0]
+    return _concat_partitions(non_empty)
+
+
+def load_and_clean_sales_data(
+    sales_file: Path | None = None,
+    rejections: dict | None = None,
+    engine: str = DATAFRAME_ENGINE,
+    workers: int = CLEANING_WORKERS,
+) -> pd.DataFrame:
+    """
+    Carrega e limpa o arquivo bruto com o motor escolhido em ``engine``:
+    "pandas" (``clean_sales_data``, em ``workers`` processos com
+    ``clean_sales_data_parallel``) ou "polars" (leitura e limpeza num plano
+    lazy em todos os núcleos, ``src.polars_backend``).
+    """
+    sales_file = sales_file or raw_sales_file()
+    if engine == "pandas":
+        # Mais processos que núcleos só acrescenta cópias entre processos
+        workers = min(workers, os.cpu_count() or 1)
+        return clean_sales_data_parallel(sales_file, rejections, workers)
+    if engine != "polars":
+        raise ValueError(f"Motor de DataFrame desconhecido: {engine}")
+    if not sales_file.exists():
+        raise FileNotFoundError(f"Arquivo bruto não encontrado em {sales_file}")
+
+    from .polars_backend import clean_sales_file_polars
+
+    print(f"Carregando e limpando dados com Polars: {sales_file}")
+    return clean_sales_file_polars(sales_file, rejections)
+
 
-    return df
+def rejection_summary(rejections: dict) -> str:
+    """Resumo de uma linha das rejeições por regra (só as regras com linhas)."""
+    total = sum(rejections.values())
+    if not total:
+        return "Nenhuma linha rejeitada na limpeza"
+    detail = ", ".join(f"{rule}={count:,}" for rule, count in rejections.items() if count)
+    return f"{total:,} linhas rejeitadas na limpeza ({detail})"
 
 
-def save_processed_data(df: pd.DataFrame, filename: str = PROCESSED_FILENAME) -> Path:
+def save_processed_data(
+    df: pd.DataFrame,
+    filename: str = PROCESSED_FILENAME,
+    output_dir: Path = PROCESSED_DATA_DIR,
+    fmt: str = PROCESSED_FORMAT,
+    compression: str = PROCESSED_COMPRESSION,
+    write_csv: bool = PROCESSED_WRITE_CSV,
+) -> Path:
     """
     Salva o DataFrame limpo na pasta data/processed.
+
+    Grava o dataset colunar (Parquet/Feather) usado pelos carregadores e,
+    se ``write_csv`` for verdadeiro, também o CSV ao lado dele.
+    Retorna o caminho do dataset colunar.
     """
-    output_path = PROCESSED_DATA_DIR / filename
-    df.to_csv(output_path, index=False)
-    print(f"Dados processados salvos em: {output_path}")
+    output_dir.mkdir(parents=True, exist_ok=True)
+    df = processed_frame(df)
+    if write_csv:
+        csv_path = output_dir / filename
+        df.to_csv(csv_path, index=False)
+        print(f"CSV processado salvo em: {csv_path}")
+
+    output_path = write_processed_dataset(
+        df,
+        output_dir / PROCESSED_DATASET_DIRNAME,
+        fmt=fmt,
+        compression=compression,
+    )
+    print(f"Dados processados salvos em: {output_path} ({fmt}, {compression})")
+    return output_path
+
+
+def estimate_chunk_rows(
+    sales_file: Path,
+    memory_budget_mb: float = CLEANING_MEMORY_BUDGET_MB,
+    sample_rows: int = 1_000,
+) -> int:
+    """
+    Estima quantas linhas cabem em um chunk dentro do orçamento de memória.
+
+    Mede o tamanho em memória de uma amostra do arquivo e considera que a
+    limpeza mantém ``CLEANING_MEMORY_FACTOR`` cópias do chunk ao mesmo tempo.
+    """
+    sample = pd.read_csv(sales_file, nrows=sample_rows)
+    if sample.empty:
+        return sample_rows
+    bytes_per_row = sample.memory_usage(deep=True).sum() / len(sample)
+    budget_bytes = memory_budget_mb * 1024 * 1024
+    return max(1_000, int(budget_bytes / (bytes_per_row * CLEANING_MEMORY_FACTOR)))
+
+
+def clean_sales_data_chunked(
+    sales_file: Path | None = None,
+    memory_budget_mb: float = CLEANING_MEMORY_BUDGET_MB,
+    output_dir: Path = PROCESSED_DATA_DIR,
+    filename: str = PROCESSED_FILENAME,
+    fmt: str = PROCESSED_FORMAT,
+    compression: str = PROCESSED_COMPRESSION,
+    write_csv: bool = PROCESSED_WRITE_CSV,
+) -> Path:
+    """
+    Limpeza em streaming para arquivos brutos maiores que a memória.
+
+    Lê o CSV bruto em chunks dimensionados por ``memory_budget_mb``, aplica
+    ``clean_sales_data`` em cada um e acrescenta o resultado ao dataset
+    processado (e ao CSV, se ``write_csv``). A saída é montada em caminhos
+    temporários e só substitui a anterior quando todos os chunks terminam,
+    por ``swap_directories``: quem lê o dataset vê a versão anterior ou a
+    nova, e a anterior só é apagada depois da troca. Retorna o caminho do
+    dataset colunar.
+    """
+    sales_file = sales_file or raw_sales_file()
+    if not sales_file.exists():
+        raise FileNotFoundError(f"Arquivo bruto não encontrado em {sales_file}")
+
+    chunk_rows = estimate_chunk_rows(sales_file, memory_budget_mb)
+    print(f"Limpando {sales_file} em chunks de {chunk_rows:,} linhas")
+
+    dataset_dir = output_dir / PROCESSED_DATASET_DIRNAME
+    staging_dir = dataset_dir.with_name(dataset_dir.name + ".staging")
+    csv_path = output_dir / filename
+    staging_csv = csv_path.with_name(csv_path.name + ".staging")
+    if staging_dir.exists():
+        shutil.rmtree(staging_dir)
+
+    total_rows = 0
+    written_parts = 0
+    clean_chunk = None
+    rejections = {}
+    for raw_chunk in iter_raw_sales_chunks(sales_file, chunk_rows):
+        clean_chunk = processed_frame(clean_sales_data(raw_chunk, rejections, consume=True))
+        del raw_chunk
+        if clean_chunk.empty:
+            continue
+        if write_csv:
+            clean_chunk.to_csv(
+                staging_csv,
+                index=False,
+                mode="a" if written_parts else "w",
+                header=not written_parts,
+            )
+        write_processed_dataset(
+            clean_chunk, staging_dir, fmt=fmt, compression=compression, append=True
+        )
+        written_parts += 1
+        total_rows += len(clean_chunk)
+
+    if not written_parts:
+        # Nenhuma linha válida: grava a saída vazia com o schema esperado
+        if clean_chunk is None:
+            clean_chunk = processed_frame(clean_sales_data(read_raw_sales_csv(sales_file)))
+        if write_csv:
+            clean_chunk.to_csv(staging_csv, index=False)
+        write_processed_dataset(clean_chunk, staging_dir, fmt=fmt, compression=compression)
+
+    if write_csv:
+        os.replace(staging_csv, csv_path)
+    swap_directories(staging_dir, dataset_dir)
+
+    print(rejection_summary(rejections))
+    print(f"{total_rows:,} linhas processadas salvas em: {dataset_dir}")
+    return dataset_dir
+
+
+def _head_sha256(sales_file: Path, length: int) -> str:
+    with open(sales_file, "rb") as f:
+        return hashlib.sha256(f.read(length)).hexdigest()
+
+
+def load_watermark(output_dir: Path = PROCESSED_DATA_DIR) -> dict | None:
+    """Marca d'água da última execução incremental (ou None se não houver)."""
+    path = output_dir / WATERMARK_FILENAME
+    if not path.exists():
+        return None
+    return json.loads(path.read_text(encoding="utf-8"))
+
+
+def update_watermark(
+    sales_file: Path,
+    clean_df: pd.DataFrame,
+    offset: int | None = None,
+    output_dir: Path = PROCESSED_DATA_DIR,
+    previous: dict | None = None,
+) -> dict:
+    """
+    Registra até onde o arquivo bruto já foi processado.
+
+    Guarda o offset em bytes lido, um hash do início do arquivo (para
+    detectar substituição) e o maior ``order_id``/``order_date`` já gravados.
+    """
+    offset = sales_file.stat().st_size if offset is None else offset
+    head_bytes = min(WATERMARK_HEAD_BYTES, offset)
+
+    order_id = previous["order_id"] if previous else None
+    order_date = previous["order_date"] if previous else None
+    new_max_id = clean_df["order_id"].max()
+    if pd.notna(new_max_id):
+        new_max_id = int(new_max_id)
+        order_id = new_max_id if order_id is None else max(order_id, new_max_id)
+    new_max_date = clean_df["order_date"].max()
+    if pd.notna(new_max_date):
+        new_max_date = new_max_date.isoformat()
+        order_date = new_max_date if order_date is None else max(order_date, new_max_date)
+
+    watermark = {
+        "file": sales_file.name,
+        "offset": offset,
+        "head_bytes": head_bytes,
+        "head_sha256": _head_sha256(sales_file, head_bytes),
+        "order_id": order_id,
+        "order_date": order_date,
+    }
+    (output_dir / WATERMARK_FILENAME).write_text(json.dumps(watermark, indent=2), encoding="utf-8")
+    return watermark
+
+
+def _watermark_is_valid(watermark: dict | None, sales_file: Path, output_dir: Path) -> bool:
+    if watermark is None or watermark["file"] != sales_file.name:
+        return False
+    if not (output_dir / PROCESSED_DATASET_DIRNAME).exists():
+        return False
+    if sales_file.stat().st_size < watermark["offset"]:
+        return False
+    return _head_sha256(sales_file, watermark["head_bytes"]) == watermark["head_sha256"]
+
+
+def clean_sales_data_incremental(
+    sales_file: Path | None = None,
+    output_dir: Path = PROCESSED_DATA_DIR,
+    watermark_column: str = "order_id",
+    write_csv: bool = PROCESSED_WRITE_CSV,
+) -> pd.DataFrame:
+    """
+    Limpa apenas as linhas acrescentadas ao arquivo bruto desde a última execução.
+
+    A leitura começa no offset guardado na marca d'água, e das linhas lidas só
+    seguem as com ``watermark_column`` ("order_id" ou "order_date") acima do
+    último valor processado. O resultado é anexado ao dataset processado (e
+    ao CSV). Sem marca d'água válida (primeira execução, arquivo substituído
+    ou truncado) o arquivo inteiro é reprocessado. Retorna as linhas novas.
+    """
+    sales_file = sales_file or raw_sales_file()
+    if not sales_file.exists():
+        raise FileNotFoundError(f"Arquivo bruto não encontrado em {sales_file}")
+
+    watermark = load_watermark(output_dir)
+    if not _watermark_is_valid(watermark, sales_file, output_dir):
+        print(f"Sem marca d'água válida: reprocessando {sales_file} por completo")
+        offset = sales_file.stat().st_size
+        rejections = {}
+        clean_df = load_and_clean_sales_data(sales_file, rejections)
+        print(rejection_summary(rejections))
+        save_processed_data(clean_df, output_dir=output_dir, write_csv=write_csv)
+        update_watermark(sales_file, clean_df, offset, output_dir)
+        return clean_df
+
+    with open(sales_file, "rb") as f:
+        header = f.readline()
+        f.seek(watermark["offset"])
+        data = f.read()
+    # Ignora uma última linha ainda incompleta; ela entra na próxima execução
+    data = data[: data.rfind(b"\n") + 1]
+    offset = watermark["offset"] + len(data)
+
+    raw_new = read_raw_sales_csv(header + data)
+    last_value = watermark[watermark_column]
+    if last_value is not None and not raw_new.empty:
+        # Valor ausente ou inválido não é comparável com a marca d'água: a linha
+        # segue e clean_sales_data/REJECTION_RULES decidem, como na limpeza completa
+        if watermark_column == "order_date":
+            values = pd.to_datetime(raw_new["order_date"], errors="coerce")
+            raw_new = raw_new[values.isna() | (values > pd.Timestamp(last_value))]
+        else:
+            values = pd.to_numeric(raw_new[watermark_column], errors="coerce")
+            raw_new = raw_new[values.isna() | (values > last_value)]
+
+    rejections = {}
+    clean_df = clean_sales_data(raw_new, rejections, consume=True)
+    print(rejection_summary(rejections))
+    if not clean_df.empty:
+        csv_path = output_dir / PROCESSED_FILENAME
+        if write_csv and csv_path.exists():
+            clean_df.to_csv(csv_path, index=False, mode="a", header=False)
+        write_processed_dataset(processed_frame(clean_df), output_dir / PROCESSED_DATASET_DIRNAME, append=True)
+    update_watermark(sales_file, clean_df, offset, output_dir, previous=watermark)
+    print(f"{len(clean_df):,} linhas novas anexadas aos dados processados")
+    return clean_df
+
+
+def run_cleaning(
+    mode: str = "full",
+    memory_budget_mb: float = CLEANING_MEMORY_BUDGET_MB,
+) -> Path:
+    """
+    Limpa o arquivo bruto e grava os dados processados e a marca d'água.
+
+    ``mode``: "full" (em memória), "streaming" (em chunks) ou "incremental"
+    (apenas linhas novas). Retorna o caminho do dataset processado.
+    """
+    sales_file = raw_sales_file()
+    if mode == "incremental":
+        clean_sales_data_incremental(sales_file)
+        return PROCESSED_DATA_DIR / PROCESSED_DATASET_DIRNAME
+    if mode not in ("full", "streaming"):
+        raise ValueError(f"Modo de limpeza desconhecido: {mode}")
+
+    # Offset lido antes da carga: linhas acrescentadas durante a execução
+    # são relidas na próxima incremental e descartadas pelo order_id
+    offset = sales_file.stat().st_size
+    if mode == "streaming":
+        output_path = clean_sales_data_chunked(sales_file, memory_budget_mb=memory_budget_mb)
+        clean_df = load_processed_sales_data(columns=["order_id", "order_date"])
+    else:
+        rejections = {}
+        clean_df = load_and_clean_sales_data(sales_file, rejections)
+        print(rejection_summary(rejections))
+        output_path = save_processed_data(clean_df)
+    update_watermark(sales_file, clean_df, offset)
     return output_path
 
 
 if __name__ == "__main__":
-    raw_df = load_raw_sales_data()
-    clean_df = clean_sales_data(raw_df)
+    rejections = {}
+    clean_df = load_and_clean_sales_data(rejections=rejections)
+    print(rejection_summary(rejections))
     save_processed_data(clean_df)
@@ -0,0 +1,92 @@
+import numpy as np
+import pandas as pd
+
+from .config import (
+    CHART_DOWNSAMPLE_METHOD,
+    CHART_POINTS_PER_PIXEL,
+    CHART_WEBGL_THRESHOLD,
+    CHART_WIDTH_PX,
+)
+
+
+DOWNSAMPLE_METHODS = ("lttb", "minmax", "none")
+
+
+def point_budget(width_px: int = CHART_WIDTH_PX, points_per_pixel: float = CHART_POINTS_PER_PIXEL) -> int:
+    """Máximo de pontos por série para um gráfico com ``width_px`` de largura."""
+    return max(3, int(width_px * points_per_pixel))
+
+
+def _as_float(values) -> np.ndarray:
+    values = np.asarray(values)
+    if np.issubdtype(values.dtype, np.datetime64):
+        return values.astype("datetime64[ns]").astype(np.int64).astype(np.float64)
+    return values.astype(np.float64)
+
+
+def lttb_indices(x, y, n_out: int) -> np.ndarray:
+    """
+    Largest-Triangle-Three-Buckets: escolhe ``n_out`` posições que preservam o
+    formato da série. Primeiro e último pontos são mantidos; de cada balde
+    intermediário fica o ponto que forma o maior triângulo com o ponto escolhido
+    no balde anterior e a média do balde seguinte.
+    """
+    n = len(y)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+    x, y = _as_float(x), _as_float(y)
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)
+    indices = np.empty(n_out, dtype=np.int64)
+    indices[0], indices[-1] = 0, n - 1
+    selected = 0
+    for bucket in range(n_out - 2):
+        lo, hi = edges[bucket], edges[bucket + 1]
+        if bucket + 2 < len(edges):
+            next_x = x[hi:edges[bucket + 2]].mean()
+            next_y = y[hi:edges[bucket + 2]].mean()
+        else:
+            next_x, next_y = x[n - 1], y[n - 1]
+        ax, ay = x[selected], y[selected]
+        areas = np.abs((ax - next_x) * (y[lo:hi] - ay) - (ax - x[lo:hi]) * (next_y - ay))
+        selected = lo + int(np.argmax(areas))
+        indices[bucket + 1] = selected
+    return indices
+
+
+def minmax_indices(y, n_out: int) -> np.ndarray:
+    """Primeiro e último pontos mais mínimo e máximo de cada balde, em ordem de posição."""
+    n = len(y)
+    if n_out >= n or n_out < 4:
+        return np.arange(n)
+    y = _as_float(y)
+    buckets = (n_out - 2) // 2
+    bucket_of = np.arange(n) * buckets // n
+    order = np.lexsort((y, bucket_of))
+    starts = np.searchsorted(bucket_of[order], np.arange(buckets), side="left")
+    ends = np.append(starts[1:], n)
+    return np.unique(np.concatenate([[0, n - 1], order[starts], order[ends - 1]]))
+
+
+def downsample_frame(
+    df: pd.DataFrame,
+    x: str,
+    y: str,
+    max_points: int | None = None,
+    method: str = CHART_DOWNSAMPLE_METHOD,
+) -> pd.DataFrame:
+    """Linhas de ``df`` (ordenado por ``x``) que representam a série ``y`` com até ``max_points`` pontos."""
+    if method not in DOWNSAMPLE_METHODS:
+        raise ValueError(f"Método de downsampling desconhecido: {method}")
+    max_points = point_budget() if max_points is None else max_points
+    if method == "none" or len(df) <= max_points:
+        return df
+    if method == "lttb":
+        positions = lttb_indices(df[x].to_numpy(), df[y].to_numpy(), max_points)
+    else:
+        positions = minmax_indices(df[y].to_numpy(), max_points)
+    return df.iloc[positions]
+
+
+def render_mode(n_points: int, threshold: int = CHART_WEBGL_THRESHOLD) -> str:
+    """``render_mode`` do Plotly Express: WebGL a partir de ``threshold`` pontos."""
+    return "webgl" if n_points >= threshold else "svg"
@@ -1,43 +1,129 @@
-import pandas as pd
-import seaborn as sns
-import matplotlib.pyplot as plt
+import pickle
+from dataclasses import dataclass
+from pathlib import Path
 
-from .config import PROCESSED_DATA_DIR, FIGURES_DIR
+import pandas as pd
 
-PROCESSED_FILENAME = "amazon_sales_clean.csv"
+from .config import EDA_HISTOGRAM_WIDTHS, EDA_QUANTILE_K, PROCESSED_DATA_DIR
+from .figures import (
+    FigureSpec,
+    category_revenue,
+    correlation_matrix_spec,
+    histogram_distribution_spec,
+    monthly_revenue,
+    monthly_revenue_spec,
+    render_figures,
+    top_categories_spec,
+)
+from .storage import (
+    PROCESSED_CSV_FILENAME,
+    PROCESSED_DATASET_DIRNAME,
+    appended_since,
+    load_processed_files,
+    load_processed_sales_data,
+    save_dataset_sources,
+)
+from .streaming_stats import StreamingStats, compute_streaming_stats
 
 
-def load_processed_sales_data(filename: str = PROCESSED_FILENAME) -> pd.DataFrame:
-    path = PROCESSED_DATA_DIR / filename
-    df = pd.read_csv(path, parse_dates=["order_date"])
-    return df
+# Agregados do relatório guardados entre execuções (atualização incremental)
+REPORT_STATE_FILENAME = "amazon_sales_report_state.pkl"
+# Colunas das figuras por mês e por categoria
+REPORT_COLUMNS = ["order_date", "product_category", "total_revenue"]
 
 
-def basic_eda(df: pd.DataFrame):
+def print_eda_summary(stats: StreamingStats):
     print("==== Info ====")
-    print(df.info())
+    print(f"{stats.rows:,} linhas")
+    print(stats.info())
     print("\n==== Describe (numéricas) ====")
-    print(df.describe())
-
-    # Distribuição de preço
-    plt.figure(figsize=(8, 5))
-    sns.histplot(df["price"], kde=True)
-    plt.title("Distribuição de Preço")
-    plt.tight_layout()
-    fig_path = FIGURES_DIR / "dist_price.png"
-    plt.savefig(fig_path)
-    plt.close()
-
-    # Correlação
-    plt.figure(figsize=(10, 8))
-    sns.heatmap(df.select_dtypes("number").corr(), cmap="viridis")
-    plt.title("Matriz de Correlação")
-    plt.tight_layout()
-    fig_path = FIGURES_DIR / "correlation_matrix.png"
-    plt.savefig(fig_path)
-    plt.close()
+    print(stats.describe())
+
+
+def stats_figure_specs(stats: StreamingStats) -> list[FigureSpec]:
+    """Distribuição de preço e correlação a partir das estatísticas em streaming."""
+    specs = []
+    if "price" in stats.histograms:
+        price = stats.histograms["price"]
+        describe = stats.describe()["price"]
+        specs.append(
+            histogram_distribution_spec(price.counts, price.edges, describe["std"], describe["75%"] - describe["25%"])
+        )
+    specs.append(correlation_matrix_spec(stats.corr()))
+    return specs
+
+
+def basic_eda(data: pd.DataFrame | StreamingStats):
+    stats = data if isinstance(data, StreamingStats) else StreamingStats.from_frame(data)
+    print_eda_summary(stats)
+    render_figures(stats_figure_specs(stats))
+
+
+@dataclass
+class ReportAggregates:
+    """Tudo o que o relatório usa, combinável: estatísticas em streaming e receita por mês e por categoria."""
+
+    stats: StreamingStats
+    monthly_revenue: pd.Series
+    category_revenue: pd.Series
+
+    def merge(self, other: "ReportAggregates") -> "ReportAggregates":
+        self.stats.merge(other.stats)
+        self.monthly_revenue = self.monthly_revenue.add(other.monthly_revenue, fill_value=0)
+        self.category_revenue = self.category_revenue.add(other.category_revenue, fill_value=0)
+        return self
+
+
+def compute_report_aggregates(
+    output_dir: Path = PROCESSED_DATA_DIR,
+    files: list[Path] | None = None,
+) -> ReportAggregates:
+    """
+    Resumo, distribuição de preço e correlação de uma passada em streaming
+    (memória limitada ao lote); receita por mês e categoria carregando só as
+    três colunas que usam. ``files`` restringe a alguns arquivos do dataset.
+    """
+    dataset_dir = output_dir / PROCESSED_DATASET_DIRNAME
+    csv_path = output_dir / PROCESSED_CSV_FILENAME
+    stats = compute_streaming_stats(dataset_dir=dataset_dir, csv_path=csv_path, files=files)
+    if files is None:
+        df = load_processed_sales_data(columns=REPORT_COLUMNS, dataset_dir=dataset_dir, csv_path=csv_path)
+    else:
+        df = load_processed_files(files, REPORT_COLUMNS)
+    return ReportAggregates(stats, monthly_revenue(df), category_revenue(df))
+
+
+def run_eda_report(output_dir: Path = PROCESSED_DATA_DIR, incremental: bool = False):
+    """
+    Estágio do pipeline: EDA e todas as figuras de reports/figures.
+
+    Os agregados (``ReportAggregates``) ficam em ``REPORT_STATE_FILENAME``.
+    Com ``incremental``, só os arquivos acrescentados pela limpeza
+    incremental são lidos e seus agregados combinados aos guardados; sem esse
+    histórico, a passada cobre o dataset inteiro. Os PNGs são renderizados
+    em paralelo.
+    """
+    state_path = output_dir / REPORT_STATE_FILENAME
+    params = {"histogram_widths": EDA_HISTOGRAM_WIDTHS, "quantile_k": EDA_QUANTILE_K}
+    sources, new_files = appended_since(state_path, output_dir / PROCESSED_DATASET_DIRNAME, params)
+    if incremental and new_files is not None:
+        aggregates = pickle.loads(state_path.read_bytes())
+        if new_files:
+            aggregates.merge(compute_report_aggregates(output_dir, new_files))
+    else:
+        aggregates = compute_report_aggregates(output_dir)
+    state_path.write_bytes(pickle.dumps(aggregates))
+    save_dataset_sources(state_path, sources, params)
+
+    print_eda_summary(aggregates.stats)
+    specs = stats_figure_specs(aggregates.stats) + [
+        monthly_revenue_spec(aggregates.monthly_revenue),
+        top_categories_spec(aggregates.category_revenue),
+    ]
+    status = render_figures(specs)
+    for filename, state in status.items():
+        print(f"{filename}: {state}")
 
 
 if __name__ == "__main__":
-    df = load_processed_sales_data()
-    basic_eda(df)
+    run_eda_report()
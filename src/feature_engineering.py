@@ -0,0 +1,158 @@
+from pathlib import Path
+
+import pandas as pd
+
+from .config import DATAFRAME_ENGINE, PROCESSED_DATA_DIR
+from .storage import (
+    PROCESSED_CSV_FILENAME,
+    PROCESSED_DATASET_DIRNAME,
+    appended_since,
+    load_processed_files,
+    load_processed_sales_data,
+    processed_dataset_exists,
+    save_dataset_sources,
+    sources_are_current,
+    write_processed_dataset,
+)
+
+
+FEATURES_DIRNAME = "amazon_sales_features"
+# Colunas processadas lidas pelo dashboard
+DASHBOARD_COLUMNS = [
+    "order_id",
+    "order_date",
+    "product_id",
+    "product_category",
+    "price",
+    "discount_percent",
+    "quantity_sold",
+    "customer_region",
+    "payment_method",
+    "rating",
+    "total_revenue",
+]
+# Colunas acrescentadas por add_sales_features
+FEATURE_COLUMNS = [
+    "year",
+    "month",
+    "month_name",
+    "quarter",
+    "day_of_week",
+    "is_weekend",
+    "week",
+    "revenue_per_unit",
+    "discount_impact",
+    "profit_margin",
+    "discount_impact_pct",
+]
+
+
+def add_sales_features(df: pd.DataFrame) -> pd.DataFrame:
+    """Acrescenta (in place) as features de data e as métricas derivadas usadas no dashboard."""
+    # Feature Engineering Avançado
+    df['year'] = df['order_date'].dt.year
+    df['month'] = df['order_date'].dt.month
+    df['month_name'] = df['order_date'].dt.month_name()
+    df['quarter'] = df['order_date'].dt.quarter
+    df['day_of_week'] = df['order_date'].dt.day_name()
+    df['is_weekend'] = df['day_of_week'].isin(['Saturday', 'Sunday'])
+    df['week'] = df['order_date'].dt.isocalendar().week.astype(int)
+
+    # Métricas derivadas
+    df['revenue_per_unit'] = df['total_revenue'] / df['quantity_sold']
+    df['discount_impact'] = (df['price'] * df['quantity_sold']) - df['total_revenue']
+    df['profit_margin'] = (df['total_revenue'] - df['discount_impact']) / df['total_revenue'] * 100
+    df['discount_impact_pct'] = (
+        (df['discount_impact'] / (df['price'] * df['quantity_sold']).replace(0, pd.NA)) * 100
+    ).fillna(0)
+    return df
+
+
+def compute_sales_features(
+    dataset_dir: Path | None = None,
+    csv_path: Path | None = None,
+    engine: str = DATAFRAME_ENGINE,
+) -> pd.DataFrame:
+    """Lê as colunas do dashboard dos dados processados e calcula as features."""
+    if engine == "polars":
+        from .polars_backend import load_sales_features_polars
+
+        return load_sales_features_polars(DASHBOARD_COLUMNS, dataset_dir=dataset_dir, csv_path=csv_path)
+    return add_sales_features(
+        load_processed_sales_data(columns=DASHBOARD_COLUMNS, dataset_dir=dataset_dir, csv_path=csv_path)
+    )
+
+
+def save_feature_table(df: pd.DataFrame, output_dir: Path = PROCESSED_DATA_DIR) -> Path:
+    output_path = write_processed_dataset(df, output_dir / FEATURES_DIRNAME)
+    print(f"Tabela de features ({len(df):,} linhas) salva em: {output_path}")
+    return output_path
+
+
+def build_features_from_processed(
+    output_dir: Path = PROCESSED_DATA_DIR,
+    engine: str = DATAFRAME_ENGINE,
+    incremental: bool = False,
+) -> Path:
+    """
+    Estágio do pipeline: calcula as features uma vez e grava ao lado dos dados processados.
+
+    As features são por linha: com ``incremental``, só os arquivos
+    acrescentados pela limpeza incremental são lidos, e as linhas com
+    features entram como novos arquivos da tabela. Sem esse histórico, a
+    tabela é refeita inteira.
+    """
+    dataset_dir = output_dir / PROCESSED_DATASET_DIRNAME
+    features_dir = output_dir / FEATURES_DIRNAME
+    params = {"engine": engine}
+    sources, new_files = appended_since(features_dir, dataset_dir, params)
+    if incremental and new_files is not None:
+        if new_files:
+            df = load_processed_files(new_files, DASHBOARD_COLUMNS)
+            if engine == "polars":
+                from .polars_backend import add_sales_features_polars
+
+                df = add_sales_features_polars(df)
+            else:
+                df = add_sales_features(df)
+            write_processed_dataset(df, features_dir, append=True)
+        print(f"Tabela de features: {len(new_files)} arquivo(s) novo(s) acrescentado(s) em {features_dir}")
+        output_path = features_dir
+    else:
+        df = compute_sales_features(
+            dataset_dir=dataset_dir,
+            csv_path=output_dir / PROCESSED_CSV_FILENAME,
+            engine=engine,
+        )
+        output_path = save_feature_table(df, output_dir)
+    save_dataset_sources(features_dir, sources, params)
+    return output_path
+
+
+def load_sales_features(
+    columns: list[str] | None = None,
+    dataset_dir: Path | None = None,
+    features_dir: Path | None = None,
+    engine: str = DATAFRAME_ENGINE,
+) -> pd.DataFrame:
+    """
+    Colunas do dashboard com as features, ordenadas por data.
+
+    Lê a tabela gravada pelo estágio "features" (``features_dir``, por padrão
+    ao lado de ``dataset_dir``) quando ela foi calculada dos arquivos atuais
+    do dataset processado (``sources_are_current``). Se ela ainda não existe,
+    ou se os dados processados mudaram depois dela (ex.: ``main.py --only
+    clean``), calcula as features a partir dos dados processados.
+    """
+    base_dir = dataset_dir.parent if dataset_dir is not None else PROCESSED_DATA_DIR
+    features_dir = features_dir or base_dir / FEATURES_DIRNAME
+    if processed_dataset_exists(features_dir):
+        if sources_are_current(features_dir, dataset_dir):
+            return load_processed_sales_data(
+                columns=columns,
+                dataset_dir=features_dir,
+                csv_path=features_dir.with_suffix(".csv"),
+            )
+        print(f"Tabela de features em {features_dir} desatualizada: calculando a partir dos dados processados")
+    df = compute_sales_features(dataset_dir=dataset_dir, engine=engine)
+    return df if columns is None else df[columns]
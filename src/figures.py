@@ -0,0 +1,256 @@
+import hashlib
+import json
+import pickle
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Callable, NamedTuple
+
+import numpy as np
+import pandas as pd
+
+from .config import FIGURES_DIR, FIGURE_WORKERS, FIGURE_SKIP_UNCHANGED
+
+
+FIGURE_HASHES_FILENAME = ".figure_inputs.json"
+KDE_GRIDSIZE = 200
+
+
+class FigureSpec(NamedTuple):
+    """Figura a renderizar: arquivo de saída, função de desenho e os dados já agregados."""
+
+    filename: str
+    renderer: Callable[[dict, Path], None]
+    data: dict
+
+
+# ---------------------------------------------------------------------------
+# Entradas agregadas (calculadas no processo principal)
+# ---------------------------------------------------------------------------
+
+def histogram_kde(counts: np.ndarray, edges: np.ndarray, std: float, gridsize: int = KDE_GRIDSIZE):
+    """
+    KDE gaussiana com banda de Scott (a mesma do seaborn) a partir de um
+    histograma fino (bins de mesma largura): suaviza as contagens por
+    convolução, O(bins). Retorna a grade (a faixa do histograma) e a densidade.
+    """
+    n = counts.sum()
+    if n < 2 or not std > 0:
+        return np.array([]), np.array([])
+
+    bandwidth = std * n ** (-1 / 5)
+    step = edges[1] - edges[0]
+    half = int(np.ceil(4 * bandwidth / step))
+    offsets = np.arange(-half, half + 1)
+    kernel = np.exp(-0.5 * (offsets * step / bandwidth) ** 2)
+    # Margem de zeros para a convolução não perder massa nas bordas
+    padded = np.pad(counts, half)
+    density = np.convolve(padded, kernel / kernel.sum(), mode="same") / (n * step)
+
+    centers = edges[0] + step * (np.arange(len(padded)) - half + 0.5)
+    grid = np.linspace(edges[0], edges[-1], gridsize)
+    return grid, np.interp(grid, centers, density)
+
+
+def _distribution_spec(counts, edges, grid, density, filename: str) -> FigureSpec:
+    return FigureSpec(
+        filename,
+        render_price_distribution,
+        {
+            "counts": counts,
+            "edges": edges,
+            "kde_x": grid,
+            # Escala a densidade para a altura das barras (contagens)
+            "kde_y": density * counts.sum() * (edges[1] - edges[0]),
+        },
+    )
+
+
+def histogram_distribution_spec(
+    counts: np.ndarray,
+    edges: np.ndarray,
+    std: float,
+    iqr: float,
+    filename: str = "dist_price.png",
+) -> FigureSpec:
+    """
+    Histograma com KDE a partir de um histograma fino de bins fixos (EDA em
+    streaming). As barras juntam bins vizinhos até a largura da regra "auto"
+    do numpy (Sturges ou Freedman-Diaconis) e a KDE usa o histograma fino.
+    """
+    n = counts.sum()
+    if not n:
+        return _distribution_spec(np.array([]), np.array([0.0, 1.0]), np.array([]), np.array([]), filename)
+    nonzero = np.flatnonzero(counts)
+    counts, edges = counts[nonzero[0]:nonzero[-1] + 1], edges[nonzero[0]:nonzero[-1] + 2]
+
+    step = edges[1] - edges[0]
+    width = (edges[-1] - edges[0]) / (np.log2(n) + 1)
+    if iqr > 0:
+        width = min(width, 2 * iqr * n ** (-1 / 3))
+    factor = max(1, int(round(width / step)))
+    padded = np.pad(counts, (0, -len(counts) % factor))
+    coarse = padded.reshape(-1, factor).sum(axis=1)
+    coarse_edges = edges[0] + step * factor * np.arange(len(coarse) + 1)
+
+    grid, density = histogram_kde(counts, edges, std)
+    return _distribution_spec(coarse, coarse_edges, grid, density, filename)
+
+
+def correlation_matrix_spec(corr: pd.DataFrame) -> FigureSpec:
+    return FigureSpec(
+        "correlation_matrix.png",
+        render_correlation_matrix,
+        {"matrix": corr.to_numpy(), "labels": list(corr.columns)},
+    )
+
+
+def monthly_revenue(df: pd.DataFrame) -> pd.Series:
+    """Receita por mês (primeiro dia do mês), somável entre lotes."""
+    return df.groupby(df["order_date"].dt.to_period("M").dt.to_timestamp())["total_revenue"].sum()
+
+
+def category_revenue(df: pd.DataFrame) -> pd.Series:
+    """Receita por categoria, somável entre lotes."""
+    return df.groupby("product_category", observed=True)["total_revenue"].sum()
+
+
+def monthly_revenue_spec(monthly: pd.Series) -> FigureSpec:
+    monthly = monthly.sort_index()
+    return FigureSpec(
+        "sales_trend_over_time.png",
+        render_monthly_revenue,
+        {"x": monthly.index.to_numpy(), "y": monthly.to_numpy()},
+    )
+
+
+def top_categories_spec(revenue: pd.Series, top_n: int = 10) -> FigureSpec:
+    grouped = revenue.sort_values(ascending=False).head(top_n)
+    return FigureSpec(
+        "top_categories_by_sales.png",
+        render_top_categories,
+        {"labels": [str(c) for c in grouped.index], "values": grouped.to_numpy(), "top_n": top_n},
+    )
+
+
+# ---------------------------------------------------------------------------
+# Desenho (executado nos processos do pool)
+# ---------------------------------------------------------------------------
+
+def render_price_distribution(data: dict, path: Path):
+    import matplotlib.pyplot as plt
+    import seaborn as sns
+
+    plt.figure(figsize=(8, 5))
+    edges = data["edges"]
+    centers = (edges[:-1] + edges[1:]) / 2
+    ax = sns.histplot(x=centers, weights=data["counts"], bins=list(edges))
+    if len(data["kde_x"]):
+        ax.plot(data["kde_x"], data["kde_y"], color=ax.patches[0].get_facecolor()[:3] if ax.patches else None)
+    plt.xlabel("price")
+    plt.title("Distribuição de Preço")
+    plt.tight_layout()
+    plt.savefig(path)
+    plt.close()
+
+
+def render_correlation_matrix(data: dict, path: Path):
+    import matplotlib.pyplot as plt
+    import seaborn as sns
+
+    plt.figure(figsize=(10, 8))
+    corr = pd.DataFrame(data["matrix"], index=data["labels"], columns=data["labels"])
+    sns.heatmap(corr, cmap="viridis")
+    plt.title("Matriz de Correlação")
+    plt.tight_layout()
+    plt.savefig(path)
+    plt.close()
+
+
+def render_monthly_revenue(data: dict, path: Path):
+    import matplotlib.pyplot as plt
+    import seaborn as sns
+
+    plt.figure(figsize=(10, 5))
+    sns.lineplot(x=data["x"], y=data["y"], marker="o")
+    plt.title("Tendência de Receita Mensal")
+    plt.xlabel("Ano-Mês")
+    plt.ylabel("Receita Total")
+    plt.xticks(rotation=45)
+    plt.tight_layout()
+    plt.savefig(path)
+    plt.close()
+
+
+def render_top_categories(data: dict, path: Path):
+    import matplotlib.pyplot as plt
+    import seaborn as sns
+
+    plt.figure(figsize=(10, 6))
+    sns.barplot(x=data["values"], y=data["labels"])
+    plt.title(f"Top {data['top_n']} Categorias por Receita")
+    plt.xlabel("Receita Total")
+    plt.ylabel("Categoria")
+    plt.tight_layout()
+    plt.savefig(path)
+    plt.close()
+
+
+def _render_in_worker(spec: FigureSpec, path: Path):
+    import matplotlib
+
+    matplotlib.use("Agg")
+    spec.renderer(spec.data, path)
+
+
+# ---------------------------------------------------------------------------
+# Pool de renderização
+# ---------------------------------------------------------------------------
+
+def spec_hash(spec: FigureSpec) -> str:
+    """Hash dos dados de entrada e da função de desenho de uma figura."""
+    digest = hashlib.sha256(f"{spec.renderer.__module__}.{spec.renderer.__qualname__}".encode())
+    digest.update(pickle.dumps(spec.data, protocol=4))
+    return digest.hexdigest()
+
+
+def render_figures(
+    specs: list[FigureSpec],
+    output_dir: Path = FIGURES_DIR,
+    workers: int = FIGURE_WORKERS,
+    skip_unchanged: bool = FIGURE_SKIP_UNCHANGED,
+) -> dict:
+    """
+    Renderiza as figuras em processos separados (``workers > 1``) ou no
+    processo atual. Com ``skip_unchanged`` pula as figuras cujo PNG existe e
+    cujos dados de entrada têm o mesmo hash da última renderização.
+    Retorna ``{arquivo: "renderizada" | "inalterada"}``.
+    """
+    output_dir.mkdir(parents=True, exist_ok=True)
+    hashes_path = output_dir / FIGURE_HASHES_FILENAME
+    previous = json.loads(hashes_path.read_text(encoding="utf-8")) if hashes_path.exists() else {}
+    current = {spec.filename: spec_hash(spec) for spec in specs}
+
+    status = {}
+    pending = []
+    for spec in specs:
+        path = output_dir / spec.filename
+        if skip_unchanged and path.exists() and previous.get(spec.filename) == current[spec.filename]:
+            status[spec.filename] = "inalterada"
+        else:
+            pending.append(spec)
+
+    if workers > 1 and len(pending) > 1:
+        with ProcessPoolExecutor(max_workers=min(workers, len(pending))) as pool:
+            futures = [
+                pool.submit(_render_in_worker, spec, output_dir / spec.filename) for spec in pending
+            ]
+            for future in futures:
+                future.result()
+    else:
+        for spec in pending:
+            spec.renderer(spec.data, output_dir / spec.filename)
+    for spec in pending:
+        status[spec.filename] = "renderizada"
+
+    hashes_path.write_text(json.dumps({**previous, **current}, indent=2), encoding="utf-8")
+    return status
@@ -0,0 +1,98 @@
+import numpy as np
+import pandas as pd
+
+from .dashboard_metrics import DashboardFilters
+
+
+# Coluna do DataFrame -> campo correspondente em DashboardFilters
+INDEXED_COLUMNS = {
+    "customer_region": "region",
+    "product_category": "category",
+    "payment_method": "payment",
+}
+
+
+class SalesFilterIndex:
+    """
+    Índice para filtrar o DataFrame do dashboard sem varrer todas as linhas.
+
+    - As linhas ficam ordenadas por ``order_date``; o período vira um intervalo
+      de posições encontrado por busca binária.
+    - Para cada valor de região, categoria e pagamento guarda as posições
+      (ordenadas) das linhas com esse valor.
+
+    Um filtro custa O(log n) para o período mais o tamanho da menor lista de
+    posições dentro dele, e não o tamanho da tabela.
+    """
+
+    def __init__(self, df: pd.DataFrame):
+        if not df["order_date"].is_monotonic_increasing:
+            df = df.sort_values("order_date", kind="stable")
+        self.df = df.reset_index(drop=True)
+        self.dates = self.df["order_date"].to_numpy()
+
+        position_dtype = np.int32 if len(self.df) < np.iinfo(np.int32).max else np.int64
+        self.code_arrays = {}
+        self.value_codes = {}
+        self.positions = {}
+        for col in INDEXED_COLUMNS:
+            codes, uniques = pd.factorize(self.df[col], use_na_sentinel=False)
+            order = np.argsort(codes, kind="stable").astype(position_dtype)
+            bounds = np.cumsum(np.bincount(codes, minlength=len(uniques)))
+            self.code_arrays[col] = codes
+            self.value_codes[col] = {value: code for code, value in enumerate(uniques)}
+            self.positions[col] = {
+                value: positions
+                for value, positions in zip(uniques, np.split(order, bounds[:-1]))
+            }
+
+    def _date_position(self, timestamp: pd.Timestamp, side: str) -> int:
+        value = np.array(pd.Timestamp(timestamp).to_datetime64(), dtype=self.dates.dtype)
+        return int(np.searchsorted(self.dates, value, side=side))
+
+    def date_range(self, start: pd.Timestamp, end: pd.Timestamp) -> tuple[int, int]:
+        """Intervalo de posições ``[lo, hi)`` com ``start <= order_date <= end``."""
+        return self._date_position(start, "left"), self._date_position(end, "right")
+
+    def select_positions(self, filters: DashboardFilters) -> np.ndarray | slice:
+        start = pd.to_datetime(filters.start_date)
+        end = pd.to_datetime(filters.end_date) + pd.DateOffset(days=1) - pd.DateOffset(seconds=1)
+        lo, hi = self.date_range(start, end)
+
+        selected = {
+            col: getattr(filters, field)
+            for col, field in INDEXED_COLUMNS.items()
+            if getattr(filters, field) is not None
+        }
+        if not selected:
+            return slice(lo, hi)
+
+        # Recorta, para cada filtro, as posições do valor escolhido dentro do período
+        candidates = {}
+        for col, value in selected.items():
+            positions = self.positions[col].get(value)
+            if positions is None:
+                return np.empty(0, dtype=np.int64)
+            candidates[col] = positions[
+                np.searchsorted(positions, lo): np.searchsorted(positions, hi)
+            ]
+
+        # Parte da lista mais curta e confere os demais filtros pelos códigos
+        base_col = min(candidates, key=lambda col: len(candidates[col]))
+        result = candidates[base_col]
+        for col, value in selected.items():
+            if col != base_col:
+                result = result[self.code_arrays[col][result] == self.value_codes[col][value]]
+        return result
+
+    def filter(self, filters: DashboardFilters) -> pd.DataFrame:
+        """Equivalente indexado de ``dashboard_metrics.filter_sales_frame``."""
+        positions = self.select_positions(filters)
+        if isinstance(positions, slice):
+            return self.df.iloc[positions]
+        return self.df.take(positions)
+
+    def count_orders(self, start: pd.Timestamp, end: pd.Timestamp) -> int:
+        """Equivalente indexado de ``dashboard_metrics.count_orders``."""
+        lo, hi = self.date_range(start, end)
+        return self.df["order_id"].iloc[lo:hi].nunique()
@@ -0,0 +1,212 @@
+import hashlib
+import importlib
+import json
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable
+
+from .config import PIPELINE_CACHE_DIR, PIPELINE_MAX_WORKERS
+
+
+# Incrementar força a reexecução de todos os estágios
+PIPELINE_VERSION = 1
+
+
+@dataclass
+class Stage:
+    """
+    Estágio do pipeline.
+
+    - ``func``: função de nível de módulo (precisa ser serializável para rodar em outro processo)
+    - ``deps``: estágios que precisam terminar antes
+    - ``inputs``: arquivos/diretórios lidos; a impressão digital deles entra na chave do cache
+    - ``outputs``: arquivos/diretórios gerados; se algum faltar o estágio roda de novo
+    - ``modules``: módulos cujo código-fonte entra na chave (versão do código)
+    - ``params``: parâmetros que mudam o resultado (ex.: modo de limpeza)
+    - ``always_run``: ignora o cache (ex.: download, cuja origem é externa)
+    - ``parallel``: pode rodar em um processo separado junto com outros estágios prontos
+    """
+
+    name: str
+    func: Callable[[], object]
+    deps: tuple[str, ...] = ()
+    inputs: tuple[Path, ...] = ()
+    outputs: tuple[Path, ...] = ()
+    modules: tuple[str, ...] = ()
+    params: dict = field(default_factory=dict)
+    always_run: bool = False
+    parallel: bool = False
+
+
+@dataclass
+class StageResult:
+    name: str
+    status: str
+    seconds: float = 0.0
+    error: str | None = None
+
+
+def path_fingerprint(path: Path) -> list:
+    """Tamanho e mtime de um arquivo ou de todos os arquivos de um diretório."""
+    if not path.exists():
+        return [str(path), None]
+    files = [path] if path.is_file() else sorted(p for p in path.rglob("*") if p.is_file())
+    return [
+        [p.relative_to(path).as_posix() if p != path else p.name, p.stat().st_size, p.stat().st_mtime_ns]
+        for p in files
+    ]
+
+
+def code_version(modules: tuple[str, ...]) -> str:
+    digest = hashlib.sha256(str(PIPELINE_VERSION).encode())
+    for name in sorted(modules):
+        module = importlib.import_module(name)
+        digest.update(Path(module.__file__).read_bytes())
+    return digest.hexdigest()
+
+
+def stage_key(stage: Stage) -> str:
+    payload = {
+        "code": code_version(stage.modules),
+        "inputs": [path_fingerprint(p) for p in stage.inputs],
+        "params": stage.params,
+    }
+    return hashlib.sha256(json.dumps(payload, sort_keys=True, default=str).encode()).hexdigest()
+
+
+class PipelineRunner:
+    """
+    Executa os estágios em ordem de dependência, pulando os que estão em cache.
+
+    A chave de cada estágio é um hash do código, dos parâmetros e da impressão
+    digital das entradas; ela fica em ``cache_dir/<estágio>.json`` ao lado do
+    tempo da última execução. Estágios marcados como ``parallel`` cujas
+    dependências já terminaram rodam juntos em um pool de processos.
+    """
+
+    def __init__(
+        self,
+        stages: list[Stage],
+        cache_dir: Path = PIPELINE_CACHE_DIR,
+        max_workers: int = PIPELINE_MAX_WORKERS,
+    ):
+        self.stages = {stage.name: stage for stage in stages}
+        self.cache_dir = cache_dir
+        self.max_workers = max_workers
+        for stage in stages:
+            unknown = set(stage.deps) - set(self.stages)
+            if unknown:
+                raise ValueError(f"Estágio '{stage.name}' depende de estágios inexistentes: {unknown}")
+
+    def _cache_path(self, name: str) -> Path:
+        return self.cache_dir / f"{name}.json"
+
+    def _is_cached(self, stage: Stage, key: str) -> bool:
+        if stage.always_run or not self._cache_path(stage.name).exists():
+            return False
+        cached = json.loads(self._cache_path(stage.name).read_text(encoding="utf-8"))
+        return cached.get("key") == key and all(p.exists() for p in stage.outputs)
+
+    def _store(self, stage: Stage, key: str, seconds: float):
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self._cache_path(stage.name).write_text(
+            json.dumps({"key": key, "seconds": seconds}), encoding="utf-8"
+        )
+
+    def run(self, force: bool = False, only: list[str] | None = None) -> list[StageResult]:
+        """
+        Roda o pipeline.
+
+        ``force`` ignora o cache; ``only`` executa apenas os estágios indicados
+        (sempre, sem consultar o cache), assumindo que as entradas já existem.
+        """
+        if only:
+            unknown = set(only) - set(self.stages)
+            if unknown:
+                raise ValueError(f"Estágios desconhecidos: {', '.join(sorted(unknown))}")
+
+        selected = [name for name in self.stages if not only or name in only]
+        done = {name for name in self.stages if name not in selected}
+        failed = set()
+        results = {}
+        keys = {}
+
+        while len(done) + len(failed) < len(self.stages):
+            ready = [
+                self.stages[name]
+                for name in selected
+                if name not in done | failed | set(results)
+                and all(dep in done for dep in self.stages[name].deps)
+            ]
+            blocked = [
+                name
+                for name in selected
+                if name not in done | failed | set(results)
+                and any(dep in failed for dep in self.stages[name].deps)
+            ]
+            for name in blocked:
+                results[name] = StageResult(name, "bloqueado")
+                failed.add(name)
+            if not ready:
+                if blocked:
+                    continue
+                break
+
+            to_run = []
+            for stage in ready:
+                keys[stage.name] = stage_key(stage)
+                if not force and not only and self._is_cached(stage, keys[stage.name]):
+                    results[stage.name] = StageResult(stage.name, "cache")
+                    done.add(stage.name)
+                else:
+                    to_run.append(stage)
+
+            serial = [s for s in to_run if not s.parallel]
+            parallel = [s for s in to_run if s.parallel]
+            # Estágios seriais primeiro: os paralelos prontos agora não dependem deles
+            for stage in serial:
+                results[stage.name] = self._run_stage(stage)
+            if len(parallel) == 1:
+                results[parallel[0].name] = self._run_stage(parallel[0])
+            elif parallel:
+                for stage, result in zip(parallel, self._run_parallel(parallel)):
+                    results[stage.name] = result
+
+            for stage in to_run:
+                if results[stage.name].status == "executado":
+                    self._store(stage, keys[stage.name], results[stage.name].seconds)
+                    done.add(stage.name)
+                else:
+                    failed.add(stage.name)
+
+        return [results[name] for name in self.stages if name in results]
+
+    def _run_stage(self, stage: Stage) -> StageResult:
+        print(f"==> {stage.name}")
+        return _execute(stage.name, stage.func)
+
+    def _run_parallel(self, stages: list[Stage]) -> list[StageResult]:
+        print(f"==> {', '.join(s.name for s in stages)} (em paralelo)")
+        with ProcessPoolExecutor(max_workers=min(self.max_workers, len(stages))) as pool:
+            futures = [pool.submit(_execute, s.name, s.func) for s in stages]
+            return [f.result() for f in futures]
+
+
+def _execute(name: str, func: Callable[[], object]) -> StageResult:
+    start = time.perf_counter()
+    try:
+        func()
+    except Exception as exc:  # o erro é reportado no resumo e bloqueia os dependentes
+        return StageResult(name, "falhou", time.perf_counter() - start, repr(exc))
+    return StageResult(name, "executado", time.perf_counter() - start)
+
+
+def format_summary(results: list[StageResult]) -> str:
+    lines = [f"{'Estágio':<20} {'Status':<12} {'Tempo (s)':>10}"]
+    for result in results:
+        lines.append(f"{result.name:<20} {result.status:<12} {result.seconds:>10.2f}")
+        if result.error:
+            lines.append(f"    {result.error}")
+    return "\n".join(lines)
@@ -0,0 +1,208 @@
+from pathlib import Path
+
+import pandas as pd
+
+from .config import PROCESSED_DATA_DIR
+from .feature_engineering import DASHBOARD_COLUMNS
+from .storage import (
+    PARTITION_COLUMNS,
+    PROCESSED_CSV_FILENAME,
+    PROCESSED_DATASET_DIRNAME,
+    FORMAT_EXTENSIONS,
+    _dataset_format,
+    processed_dataset_exists,
+)
+
+
+INTEGER_COLUMNS = ["order_id", "product_id", "discount_percent", "quantity_sold", "review_count"]
+ISO_DATE_FORMAT = "%Y-%m-%d"
+
+
+def _numeric_expr(pl, name: str, dtype):
+    if dtype.is_integer():
+        return pl.col(name)
+    # Texto inválido e NaN viram ausentes, como em pd.to_numeric(errors="coerce")
+    return pl.col(name).cast(pl.Float64, strict=False).fill_nan(None)
+
+
+def _date_expr(pl, dtype):
+    column = pl.col("order_date")
+    if isinstance(dtype, pl.Datetime):
+        return column
+    if dtype == pl.Date:
+        return column.cast(pl.Datetime("us"))
+    # Só datas AAAA-MM-DD (formato do dataset); o resto vira ausente e é rejeitado
+    return column.cast(pl.String).str.strptime(pl.Datetime("us"), ISO_DATE_FORMAT, strict=False)
+
+
+def clean_sales_lazy(lf):
+    """
+    Plano lazy de ``data_preprocessing.clean_sales_data`` (mesmas regras,
+    executado pelo Polars em todos os núcleos). Retorna
+    ``(linhas_limpas, contagem_de_rejeicoes)``, dois LazyFrames que
+    compartilham a leitura e as conversões.
+    """
+    import polars as pl
+
+    from .data_preprocessing import NUMERIC_COLUMNS, REJECTION_RULES, REQUIRED_COLUMNS
+
+    schema = lf.collect_schema()
+    missing_columns = REQUIRED_COLUMNS - set(schema.names())
+    if missing_columns:
+        missing = ", ".join(sorted(missing_columns))
+        raise ValueError(f"Colunas obrigatórias ausentes no dataset: {missing}")
+
+    converted = lf.with_columns(
+        _date_expr(pl, schema["order_date"]),
+        *(_numeric_expr(pl, col, schema[col]).alias(col) for col in NUMERIC_COLUMNS),
+    )
+
+    # Mesma ordem de REJECTION_RULES: cada linha conta só na primeira regra que falha
+    checks = (
+        pl.col("order_date").is_null(),
+        pl.col("total_revenue").is_null(),
+        pl.col("price").is_null(),
+        pl.col("discount_percent").is_null(),
+        pl.col("quantity_sold").is_null(),
+        ~(pl.col("quantity_sold") > 0).fill_null(False),
+        ~(pl.col("price") >= 0).fill_null(False),
+    )
+    rejected_before = pl.lit(False)
+    counts = []
+    for rule, failed in zip(REJECTION_RULES, checks):
+        counts.append((failed & ~rejected_before).sum().alias(rule))
+        rejected_before = rejected_before | failed
+
+    discounted = pl.col("price") * (1 - pl.col("discount_percent") / 100)
+    clean = (
+        converted.filter(~rejected_before)
+        .with_columns(
+            pl.col("discount_percent").clip(0, 100),
+            pl.col("rating").clip(0, 5),
+        )
+        .with_columns(discounted.alias("discounted_price"))
+        .with_columns((pl.col("discounted_price") * pl.col("quantity_sold")).alias("total_revenue"))
+    )
+    return clean, converted.select(counts)
+
+
+def _restore_integer_columns(pl, df):
+    # Colunas inteiras lidas como texto voltam a Int64 quando não há ausentes nem frações
+    columns = []
+    for col in INTEGER_COLUMNS:
+        series = df[col]
+        if series.dtype.is_float() and not series.null_count() and (series == series.floor()).all():
+            columns.append(series.cast(pl.Int64))
+    return df.with_columns(columns) if columns else df
+
+
+def _collect_clean(lf, rejections: dict | None) -> pd.DataFrame:
+    import polars as pl
+
+    clean, counts = clean_sales_lazy(lf)
+    clean_df, counts_df = pl.collect_all([clean, counts])
+    if rejections is not None:
+        for rule, count in counts_df.row(0, named=True).items():
+            rejections[rule] = rejections.get(rule, 0) + int(count or 0)
+    return _restore_integer_columns(pl, clean_df).to_pandas()
+
+
+def clean_sales_data_polars(df: pd.DataFrame, rejections: dict | None = None) -> pd.DataFrame:
+    """Equivalente Polars de ``clean_sales_data`` para um DataFrame pandas já carregado."""
+    import polars as pl
+
+    # Colunas object (texto misturado com números) entram como texto
+    df = df.astype({col: "str" for col in df.columns if df[col].dtype == object})
+    return _collect_clean(pl.from_pandas(df).lazy(), rejections)
+
+
+def clean_sales_file_polars(sales_file: Path, rejections: dict | None = None) -> pd.DataFrame:
+    """
+    Lê o CSV bruto e limpa num único plano lazy (leitura em paralelo).
+
+    As colunas numéricas são lidas como ``Float64`` com valores inválidos
+    como ausentes (o ``pd.to_numeric(errors="coerce")`` do caminho pandas) e
+    ``order_date`` como texto. As dimensões de texto saem como ``category``,
+    como na leitura tipada do caminho pandas.
+    """
+    import polars as pl
+
+    from .data_preprocessing import NUMERIC_COLUMNS, RAW_CATEGORY_COLUMNS
+
+    lf = pl.scan_csv(
+        sales_file,
+        schema_overrides={"order_date": pl.String, **{col: pl.Float64 for col in NUMERIC_COLUMNS}},
+        ignore_errors=True,
+    )
+    return _collect_clean(lf, rejections).astype({col: "category" for col in RAW_CATEGORY_COLUMNS})
+
+
+def sales_features_lazy(lf):
+    """Plano lazy de ``add_sales_features``."""
+    import polars as pl
+
+    date = pl.col("order_date").dt
+    gross = pl.col("price") * pl.col("quantity_sold")
+    return (
+        lf.with_columns(
+            date.year().alias("year"),
+            date.month().cast(pl.Int32).alias("month"),
+            date.strftime("%B").alias("month_name"),
+            date.quarter().cast(pl.Int32).alias("quarter"),
+            date.strftime("%A").alias("day_of_week"),
+            (date.weekday() >= 6).alias("is_weekend"),
+            date.week().cast(pl.Int64).alias("week"),
+            (pl.col("total_revenue") / pl.col("quantity_sold")).alias("revenue_per_unit"),
+            (gross - pl.col("total_revenue")).alias("discount_impact"),
+        )
+        .with_columns(
+            ((pl.col("total_revenue") - pl.col("discount_impact")) / pl.col("total_revenue") * 100)
+            .alias("profit_margin"),
+            pl.when(gross == 0)
+            .then(0.0)
+            .otherwise(pl.col("discount_impact") / gross * 100)
+            .fill_nan(0.0)
+            .fill_null(0.0)
+            .alias("discount_impact_pct"),
+        )
+    )
+
+
+def add_sales_features_polars(df: pd.DataFrame) -> pd.DataFrame:
+    """``add_sales_features`` pelo plano lazy, para linhas já carregadas."""
+    import polars as pl
+
+    return sales_features_lazy(pl.from_pandas(df).lazy()).collect().to_pandas()
+
+
+def _scan_processed(pl, dataset_dir: Path, csv_path: Path):
+    if processed_dataset_exists(dataset_dir):
+        fmt = _dataset_format(dataset_dir)
+        pattern = (dataset_dir / "**" / f"*{FORMAT_EXTENSIONS[fmt]}").as_posix()
+        partitioned = any(dataset_dir.glob(f"{PARTITION_COLUMNS[0]}=*"))
+        if fmt == "parquet":
+            return pl.scan_parquet(pattern, hive_partitioning=partitioned)
+        return pl.scan_ipc(pattern, hive_partitioning=partitioned)
+    if csv_path.exists():
+        return pl.scan_csv(csv_path, try_parse_dates=True).with_columns(
+            pl.col("order_date").cast(pl.Datetime("us"))
+        )
+    raise FileNotFoundError(
+        f"Dados processados não encontrados em {dataset_dir} nem em {csv_path}. "
+        "Execute 'python main.py' para gerar o dataset."
+    )
+
+
+def load_sales_features_polars(
+    columns: list[str] = DASHBOARD_COLUMNS,
+    dataset_dir: Path | None = None,
+    csv_path: Path | None = None,
+) -> pd.DataFrame:
+    """Lê as colunas do dashboard e calcula as features num plano lazy, ordenado por data."""
+    import polars as pl
+
+    dataset_dir = dataset_dir or PROCESSED_DATA_DIR / PROCESSED_DATASET_DIRNAME
+    csv_path = csv_path or PROCESSED_DATA_DIR / PROCESSED_CSV_FILENAME
+    lf = _scan_processed(pl, dataset_dir, csv_path).select(columns)
+    lf = sales_features_lazy(lf).sort("order_date", maintain_order=True)
+    return lf.collect().to_pandas()
@@ -0,0 +1,64 @@
+import pandas as pd
+
+
+# Dimensões de texto com poucos valores distintos
+CATEGORICAL_COLUMNS = [
+    "product_category",
+    "customer_region",
+    "payment_method",
+    "month_name",
+    "day_of_week",
+]
+
+# Valores monetários agregados continuam em float64 para não acumular erro nas somas
+FLOAT64_COLUMNS = ["total_revenue", "discounted_price"]
+
+
+def compact_sales_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Converte o DataFrame para o schema compacto do dashboard:
+
+    - dimensões de texto como ``category``
+    - inteiros com a menor largura que comporta os valores (com sinal ou não)
+    - floats em ``float32``, exceto ``FLOAT64_COLUMNS``
+    - flags booleanas como ``bool``
+    """
+    df = df.copy()
+    for col in df.columns:
+        series = df[col]
+        if col in CATEGORICAL_COLUMNS:
+            df[col] = series.astype("category")
+        elif pd.api.types.is_bool_dtype(series):
+            df[col] = series.astype("bool")
+        elif pd.api.types.is_integer_dtype(series):
+            downcast = "unsigned" if len(series) and series.min() >= 0 else "integer"
+            df[col] = pd.to_numeric(series, downcast=downcast)
+        elif pd.api.types.is_float_dtype(series) and col not in FLOAT64_COLUMNS:
+            df[col] = series.astype("float32")
+    return df
+
+
+def memory_footprint(df: pd.DataFrame) -> pd.DataFrame:
+    """Memória ocupada por coluna (bytes, contando o conteúdo das strings)."""
+    usage = df.memory_usage(deep=True, index=False)
+    return pd.DataFrame({
+        "dtype": df.dtypes.astype(str),
+        "bytes": usage,
+    }).rename_axis("column")
+
+
+def memory_report(standard_df: pd.DataFrame, compact_df: pd.DataFrame) -> pd.DataFrame:
+    """Compara, coluna a coluna, a memória dos modos padrão e compacto."""
+    report = memory_footprint(standard_df).join(
+        memory_footprint(compact_df), lsuffix="_standard", rsuffix="_compact"
+    )
+    total = pd.DataFrame(
+        {
+            "dtype_standard": [""],
+            "bytes_standard": [report["bytes_standard"].sum()],
+            "dtype_compact": [""],
+            "bytes_compact": [report["bytes_compact"].sum()],
+        },
+        index=pd.Index(["TOTAL"], name="column"),
+    )
+    return pd.concat([report, total])
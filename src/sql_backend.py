@@ -0,0 +1,231 @@
+from pathlib import Path
+
+import pandas as pd
+
+from .config import PROCESSED_DATA_DIR
+from .dashboard_metrics import DashboardFilters, order_heatmap
+from .storage import (
+    PARTITION_COLUMNS,
+    PROCESSED_CSV_FILENAME,
+    PROCESSED_DATASET_DIRNAME,
+    _dataset_format,
+    processed_dataset_exists,
+)
+
+
+# Coluna da view -> campo correspondente em DashboardFilters
+FILTER_COLUMNS = {
+    "customer_region": "region",
+    "product_category": "category",
+    "payment_method": "payment",
+}
+
+KPI_QUERY = """
+    SELECT
+        count(*) AS row_count,
+        coalesce(sum(total_revenue), 0) AS total_revenue,
+        count(DISTINCT order_id) AS total_orders,
+        avg(total_revenue / quantity_sold) AS revenue_per_unit_mean,
+        avg(rating) AS avg_rating,
+        avg(CASE WHEN rating >= 4 THEN 1.0 ELSE 0.0 END) * 100 AS high_rating_pct,
+        count(DISTINCT product_category) AS category_count
+    FROM sales {where}
+"""
+
+# Agregações por chave de métrica; o resultado vai para o mesmo formato do caminho pandas
+GROUP_QUERIES = {
+    "region_revenue": """
+        SELECT customer_region, sum(total_revenue) AS total_revenue
+        FROM sales {where} GROUP BY 1 ORDER BY 1
+    """,
+    "payment_revenue": """
+        SELECT payment_method, sum(total_revenue) AS total_revenue
+        FROM sales {where} GROUP BY 1 ORDER BY 1
+    """,
+    "daily_revenue": """
+        SELECT order_date, sum(total_revenue) AS total_revenue
+        FROM sales {where} GROUP BY 1 ORDER BY 1
+    """,
+    "heatmap": """
+        SELECT dayname(order_date) AS day_of_week, monthname(order_date) AS month_name,
+               sum(total_revenue) AS total_revenue
+        FROM sales {where} GROUP BY 1, 2
+    """,
+    "category_metrics": """
+        SELECT product_category,
+               sum(total_revenue) AS total_revenue,
+               sum(quantity_sold)::BIGINT AS quantity_sold,
+               count(DISTINCT order_id) AS order_id,
+               avg(rating) AS rating,
+               avg(price) AS price
+        FROM sales {where} GROUP BY 1 ORDER BY 1
+    """,
+    "monthly_revenue": """
+        SELECT month(order_date) AS month, sum(total_revenue) AS total_revenue
+        FROM sales {where} GROUP BY 1 ORDER BY 1
+    """,
+    "monthly_trend": """
+        SELECT date_trunc('month', order_date) AS order_date, sum(total_revenue) AS total_revenue
+        FROM sales {where} GROUP BY 1 ORDER BY 1
+    """,
+    "discount_analysis": """
+        SELECT discount_percent, sum(total_revenue) AS sum, count(total_revenue) AS count
+        FROM sales {where} GROUP BY 1 ORDER BY 1
+    """,
+    "discount_efficiency": """
+        SELECT discount_percent, sum(total_revenue) AS total_revenue,
+               sum(quantity_sold)::BIGINT AS quantity_sold
+        FROM sales {where} GROUP BY 1 ORDER BY 1
+    """,
+    "top_products": """
+        SELECT product_id, sum(total_revenue) AS total_revenue,
+               sum(quantity_sold)::BIGINT AS quantity_sold, avg(rating) AS rating
+        FROM sales {where} GROUP BY 1 ORDER BY 2 DESC LIMIT 10
+    """,
+}
+KPI_KEYS = (
+    "row_count",
+    "total_revenue",
+    "total_orders",
+    "revenue_per_unit_mean",
+    "avg_rating",
+    "high_rating_pct",
+    "category_count",
+)
+
+
+def _period_bounds(start_date, end_date) -> tuple[pd.Timestamp, pd.Timestamp]:
+    # Mesmos limites de dashboard_metrics.filter_sales_frame (fim às 23:59:59)
+    start = pd.to_datetime(start_date)
+    end = pd.to_datetime(end_date) + pd.DateOffset(days=1) - pd.DateOffset(seconds=1)
+    return start, end
+
+
+class SqlSalesBackend:
+    """
+    Agregações do dashboard executadas pelo DuckDB direto sobre os arquivos processados.
+
+    O filtro e o groupby de cada métrica viram uma consulta SQL sobre a view
+    ``sales`` (dataset Parquet particionado ou, na falta dele, o CSV). Só os
+    resultados agregados chegam ao pandas: o processo do dashboard não mantém
+    as linhas em memória. Com partições mensais, o período também poda os
+    diretórios ``order_year``/``order_month`` lidos.
+    """
+
+    def __init__(self, dataset_dir: Path | None = None, csv_path: Path | None = None):
+        import duckdb
+
+        dataset_dir = dataset_dir or PROCESSED_DATA_DIR / PROCESSED_DATASET_DIRNAME
+        csv_path = csv_path or PROCESSED_DATA_DIR / PROCESSED_CSV_FILENAME
+
+        self.connection = duckdb.connect()
+        self.partitioned = False
+        if processed_dataset_exists(dataset_dir) and _dataset_format(dataset_dir) == "parquet":
+            self.partitioned = any(dataset_dir.glob(f"{PARTITION_COLUMNS[0]}=*"))
+            options = "hive_partitioning = false"
+            if self.partitioned:
+                hive_types = ", ".join(f"'{column}': INTEGER" for column in PARTITION_COLUMNS)
+                options = f"hive_partitioning = true, hive_types = {{{hive_types}}}"
+            source = f"read_parquet('{(dataset_dir / '**' / '*.parquet').as_posix()}', {options})"
+        elif csv_path.exists():
+            source = f"read_csv_auto('{csv_path.as_posix()}', types = {{'order_date': 'TIMESTAMP'}})"
+        else:
+            raise FileNotFoundError(
+                f"Dados processados em Parquet não encontrados em {dataset_dir} nem em {csv_path}. "
+                "Execute 'python main.py' para gerar o dataset."
+            )
+        self.connection.execute(
+            f"CREATE VIEW sales AS SELECT * REPLACE (order_date::TIMESTAMP AS order_date) FROM {source}"
+        )
+
+    def _query(self, sql: str, params: list | None = None) -> pd.DataFrame:
+        # Um cursor por consulta: a conexão é compartilhada entre as sessões do Streamlit
+        return self.connection.cursor().execute(sql, params or []).df()
+
+    def _where(self, start: pd.Timestamp, end: pd.Timestamp, filters: DashboardFilters | None = None):
+        clauses = ["order_date >= ?", "order_date <= ?"]
+        params = [start.to_pydatetime(), end.to_pydatetime()]
+        if self.partitioned:
+            clauses.append("order_year * 12 + order_month BETWEEN ? AND ?")
+            params += [start.year * 12 + start.month, end.year * 12 + end.month]
+        for column, field in FILTER_COLUMNS.items():
+            value = getattr(filters, field) if filters is not None else None
+            if value is not None:
+                clauses.append(f"{column} = ?")
+                params.append(value)
+        return "WHERE " + " AND ".join(clauses), params
+
+    def date_range(self) -> tuple:
+        """Primeira e última data do dataset."""
+        row = self._query("SELECT min(order_date) AS lo, max(order_date) AS hi FROM sales").iloc[0]
+        return row["lo"].date(), row["hi"].date()
+
+    def dimension_values(self) -> dict:
+        """Valores distintos (ordenados) de região, categoria e pagamento para a sidebar."""
+        return {
+            column: self._query(
+                f"SELECT DISTINCT {column} FROM sales WHERE {column} IS NOT NULL ORDER BY 1"
+            )[column].tolist()
+            for column in FILTER_COLUMNS
+        }
+
+    def total_revenue(self) -> float:
+        return float(self._query("SELECT coalesce(sum(total_revenue), 0) AS v FROM sales")["v"].iloc[0])
+
+    def count_orders(self, start: pd.Timestamp, end: pd.Timestamp) -> int:
+        """Equivalente de ``dashboard_metrics.count_orders`` (apenas filtro de período)."""
+        where, params = self._where(pd.Timestamp(start), pd.Timestamp(end))
+        return int(self._query(f"SELECT count(DISTINCT order_id) AS v FROM sales {where}", params)["v"].iloc[0])
+
+    def compute_metrics(self, filters: DashboardFilters, keys=None) -> dict:
+        """Mesmo formato de ``dashboard_metrics.compute_dashboard_metrics``."""
+        def wanted(key):
+            return keys is None or key in keys
+
+        where, params = self._where(*_period_bounds(filters.start_date, filters.end_date), filters)
+        metrics = {}
+
+        if any(wanted(key) for key in KPI_KEYS):
+            kpis = self._query(KPI_QUERY.format(where=where), params).iloc[0]
+            has_rows = kpis["row_count"] > 0
+            for key in KPI_KEYS:
+                if wanted(key):
+                    value = kpis[key]
+                    if key in ("row_count", "total_orders", "category_count"):
+                        value = int(value)
+                    elif not has_rows and key in ("revenue_per_unit_mean", "avg_rating", "high_rating_pct"):
+                        value = 0
+                    metrics[key] = value
+
+        needs_categories = wanted("category_metrics") or wanted("top_categories")
+        for key, sql in GROUP_QUERIES.items():
+            if wanted(key) or (key == "category_metrics" and needs_categories):
+                metrics[key] = self._query(sql.format(where=where), params)
+
+        if "heatmap" in metrics:
+            metrics["heatmap"] = order_heatmap(
+                metrics["heatmap"].pivot_table(
+                    values="total_revenue",
+                    index="day_of_week",
+                    columns="month_name",
+                    aggfunc="sum",
+                    fill_value=0,
+                )
+            )
+        if needs_categories:
+            by_category = metrics["category_metrics"].set_index("product_category")
+            if wanted("top_categories"):
+                metrics["top_categories"] = by_category["total_revenue"].nlargest(3)
+            if not wanted("category_metrics"):
+                del metrics["category_metrics"]
+        if "monthly_revenue" in metrics:
+            metrics["monthly_revenue"] = metrics["monthly_revenue"].set_index("month")["total_revenue"]
+        if "monthly_trend" in metrics:
+            # Meses sem vendas entram com zero, como no pd.Grouper(freq="ME") do caminho pandas
+            metrics["monthly_trend"] = (
+                metrics["monthly_trend"]
+                .groupby(pd.Grouper(key="order_date", freq="ME"))["total_revenue"]
+                .sum()
+                .reset_index()
+            )
+        return metrics
@@ -0,0 +1,367 @@
+import json
+import shutil
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from .config import (
+    PROCESSED_DATA_DIR,
+    PROCESSED_FORMAT,
+    PROCESSED_COMPRESSION,
+    PROCESSED_ROW_GROUP_SIZE,
+    PROCESSED_PARTITION_BY_MONTH,
+)
+
+
+PROCESSED_CSV_FILENAME = "amazon_sales_clean.csv"
+PROCESSED_DATASET_DIRNAME = "amazon_sales_clean"
+
+FORMAT_EXTENSIONS = {"parquet": ".parquet", "feather": ".feather"}
+# Registro dos arquivos processados usados por um artefato derivado (ao lado dele)
+SOURCES_SUFFIX = ".sources.json"
+# Chaves das partições (diretórios order_year=AAAA/order_month=MM); não voltam na leitura
+PARTITION_COLUMNS = ["order_year", "order_month"]
+# Colunas inteiras: gravadas sempre como int64 (ausentes como nulos), mesmo quando um
+# lote chega em float64 por ter algum valor ausente, para que todas as partes tenham o
+# mesmo schema. Na leitura voltam como float64 só se o que foi lido tiver nulos.
+INTEGER_COLUMNS = ["order_id", "product_id", "discount_percent", "quantity_sold", "review_count"]
+
+
+def _dataset_format(dataset_dir: Path) -> str:
+    """Descobre o formato do dataset pela extensão dos arquivos gravados."""
+    for fmt, ext in FORMAT_EXTENSIONS.items():
+        if any(dataset_dir.rglob(f"*{ext}")):
+            return fmt
+    raise FileNotFoundError(f"Nenhum arquivo colunar encontrado em {dataset_dir}")
+
+
+def processed_dataset_exists(dataset_dir: Path | None = None) -> bool:
+    dataset_dir = dataset_dir or PROCESSED_DATA_DIR / PROCESSED_DATASET_DIRNAME
+    return dataset_dir.is_dir() and any(
+        dataset_dir.rglob(f"*{ext}") for ext in FORMAT_EXTENSIONS.values()
+    )
+
+
+def _write_part(df: pd.DataFrame, path: Path, fmt: str, compression: str):
+    import pyarrow as pa
+
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    for col in INTEGER_COLUMNS:
+        if col in table.column_names and pa.types.is_floating(table.schema.field(col).type):
+            try:
+                table = table.set_column(table.column_names.index(col), col, table[col].cast(pa.int64()))
+            except pa.ArrowInvalid:
+                # Valor fracionário (texto sujo do bruto): a coluna fica em float64
+                pass
+    if fmt == "parquet":
+        import pyarrow.parquet as pq
+
+        pq.write_table(
+            table,
+            path,
+            compression=compression,
+            row_group_size=PROCESSED_ROW_GROUP_SIZE,
+        )
+    else:
+        import pyarrow.feather as feather
+
+        compression = "uncompressed" if compression == "none" else compression
+        feather.write_feather(table, path, compression=compression)
+
+
+def _month_groups(df: pd.DataFrame):
+    """Fatias (ano, mês, linhas) de um DataFrame já ordenado por ``order_date``."""
+    dates = df["order_date"]
+    if dates.isna().any():
+        raise ValueError("order_date com valores ausentes não pode ser particionado por mês")
+    month_index = (dates.dt.year * 12 + dates.dt.month - 1).to_numpy()
+    bounds = [0, *(np.flatnonzero(np.diff(month_index)) + 1), len(df)]
+    for lo, hi in zip(bounds[:-1], bounds[1:]):
+        year, month = divmod(int(month_index[lo]), 12)
+        yield year, month + 1, df.iloc[lo:hi]
+
+
+def _write_parts(df: pd.DataFrame, root: Path, fmt: str, compression: str, partition_by_month: bool):
+    """Acrescenta um ``part-NNNNN`` por partição tocada (ou na raiz, sem partições)."""
+    ext = FORMAT_EXTENSIONS[fmt]
+    if not partition_by_month or df.empty:
+        groups = [(root, df)]
+    else:
+        groups = [
+            (root / f"order_year={year}" / f"order_month={month:02d}", part)
+            for year, month, part in _month_groups(df)
+        ]
+    for part_dir, part in groups:
+        part_dir.mkdir(parents=True, exist_ok=True)
+        part_index = len(list(part_dir.glob(f"part-*{ext}")))
+        _write_part(part, part_dir / f"part-{part_index:05d}{ext}", fmt, compression)
+
+
+def write_processed_dataset(
+    df: pd.DataFrame,
+    dataset_dir: Path | None = None,
+    fmt: str = PROCESSED_FORMAT,
+    compression: str = PROCESSED_COMPRESSION,
+    append: bool = False,
+    partition_by_month: bool = PROCESSED_PARTITION_BY_MONTH,
+) -> Path:
+    """
+    Grava o DataFrame processado em formato colunar (Parquet ou Feather).
+
+    O dataset é um diretório com arquivos ``part-NNNNN``; com
+    ``partition_by_month`` eles ficam em partições
+    ``order_year=AAAA/order_month=MM`` e os carregadores leem só os meses do
+    período pedido. Com ``append=False`` o conteúdo anterior é substituído de
+    uma só vez (escrita em diretório temporário seguida de troca); com
+    ``append=True`` um novo arquivo é adicionado a cada partição tocada. As
+    linhas são ordenadas por ``order_date`` para que as estatísticas dos row
+    groups permitam pular blocos fora do período lido.
+    """
+    if fmt not in FORMAT_EXTENSIONS:
+        raise ValueError(f"Formato não suportado: {fmt}")
+
+    dataset_dir = dataset_dir or PROCESSED_DATA_DIR / PROCESSED_DATASET_DIRNAME
+    df = df.sort_values("order_date", kind="stable")
+
+    if append and dataset_dir.exists():
+        if processed_dataset_exists(dataset_dir) and _dataset_format(dataset_dir) != fmt:
+            raise ValueError(f"Dataset em {dataset_dir} não está no formato {fmt}")
+        _write_parts(df, dataset_dir, fmt, compression, partition_by_month)
+        return dataset_dir
+
+    tmp_dir = dataset_dir.with_name(dataset_dir.name + ".tmp")
+    if tmp_dir.exists():
+        shutil.rmtree(tmp_dir)
+    tmp_dir.mkdir(parents=True)
+    _write_parts(df, tmp_dir, fmt, compression, partition_by_month)
+
+    if dataset_dir.exists():
+        shutil.rmtree(dataset_dir)
+    tmp_dir.rename(dataset_dir)
+    return dataset_dir
+
+
+def _date_bounds(start_date, end_date):
+    start = pd.Timestamp(start_date) if start_date is not None else None
+    # end_date é inclusivo: considera o dia inteiro
+    end = (
+        pd.Timestamp(end_date).normalize() + pd.Timedelta(days=1)
+        if end_date is not None
+        else None
+    )
+    return start, end
+
+
+def _partition_expression(start, end):
+    """
+    Filtro sobre as chaves das partições: o pyarrow descarta os diretórios
+    de meses fora do período sem abrir os arquivos. Arquivos fora das
+    partições (chaves nulas) são sempre lidos.
+    """
+    import pyarrow.dataset as ds
+
+    year, month = ds.field("order_year"), ds.field("order_month")
+    expression = None
+    if start is not None:
+        expression = (year > start.year) | ((year == start.year) & (month >= start.month))
+    if end is not None:
+        # end é exclusivo: o último mês incluído é o do instante anterior
+        last = end - pd.Timedelta(1, "ns")
+        upper = (year < last.year) | ((year == last.year) & (month <= last.month))
+        expression = upper if expression is None else expression & upper
+    return expression | year.is_null()
+
+
+def _load_columnar(dataset_dir: Path, columns, start, end) -> pd.DataFrame:
+    import pyarrow as pa
+    import pyarrow.dataset as ds
+
+    dataset = ds.dataset(dataset_dir, format=_dataset_format(dataset_dir), partitioning="hive")
+    partitioned = all(name in dataset.schema.names for name in PARTITION_COLUMNS)
+    if columns is None:
+        columns = [name for name in dataset.schema.names if name not in PARTITION_COLUMNS]
+
+    expression = None
+    if start is not None or end is not None:
+        date_type = dataset.schema.field("order_date").type
+        field = ds.field("order_date")
+        if start is not None:
+            expression = field >= pa.scalar(start.to_pydatetime(), type=date_type)
+        if end is not None:
+            upper = field < pa.scalar(end.to_pydatetime(), type=date_type)
+            expression = upper if expression is None else expression & upper
+        if partitioned:
+            expression = _partition_expression(start, end) & expression
+
+    table = dataset.to_table(columns=columns, filter=expression)
+    return table.to_pandas()
+
+
+def _load_csv(csv_path: Path, columns, start, end) -> pd.DataFrame:
+    usecols = None
+    if columns is not None:
+        usecols = list(dict.fromkeys(list(columns) + ["order_date"]))
+    df = pd.read_csv(csv_path, usecols=usecols, parse_dates=["order_date"])
+    if start is not None:
+        df = df[df["order_date"] >= start]
+    if end is not None:
+        df = df[df["order_date"] < end]
+    if columns is not None:
+        df = df[list(columns)]
+    return df.reset_index(drop=True)
+
+
+def load_processed_sales_data(
+    columns: list[str] | None = None,
+    start_date=None,
+    end_date=None,
+    dataset_dir: Path | None = None,
+    csv_path: Path | None = None,
+) -> pd.DataFrame:
+    """
+    Carregador único dos dados processados.
+
+    Lê apenas as colunas pedidas em ``columns`` e, quando ``start_date`` /
+    ``end_date`` são informados (inclusivos), apenas as partições mensais e
+    os row groups cujo intervalo de ``order_date`` cruza o período. Usa o dataset colunar quando
+    existe e cai para o CSV caso contrário.
+    """
+    dataset_dir = dataset_dir or PROCESSED_DATA_DIR / PROCESSED_DATASET_DIRNAME
+    csv_path = csv_path or PROCESSED_DATA_DIR / PROCESSED_CSV_FILENAME
+    start, end = _date_bounds(start_date, end_date)
+
+    if processed_dataset_exists(dataset_dir):
+        return _load_columnar(dataset_dir, columns, start, end)
+    if csv_path.exists():
+        return _load_csv(csv_path, columns, start, end)
+    raise FileNotFoundError(
+        f"Dados processados não encontrados em {dataset_dir} nem em {csv_path}. "
+        "Execute 'python main.py' para gerar o dataset."
+    )
+
+
+def processed_files(dataset_dir: Path | None = None) -> list[Path]:
+    """Arquivos ``part-NNNNN`` do dataset colunar, em ordem de caminho."""
+    dataset_dir = dataset_dir or PROCESSED_DATA_DIR / PROCESSED_DATASET_DIRNAME
+    if not processed_dataset_exists(dataset_dir):
+        return []
+    ext = FORMAT_EXTENSIONS[_dataset_format(dataset_dir)]
+    return sorted(dataset_dir.rglob(f"*{ext}"))
+
+
+def load_processed_files(files: list[Path], columns: list[str] | None = None) -> pd.DataFrame:
+    """Lê apenas alguns arquivos do dataset colunar (ex.: os acrescentados numa execução incremental)."""
+    import pyarrow.dataset as ds
+
+    formats = {ext: fmt for fmt, ext in FORMAT_EXTENSIONS.items()}
+    dataset = ds.dataset([str(path) for path in files], format=formats[Path(files[0]).suffix])
+    if columns is None:
+        columns = [name for name in dataset.schema.names if name not in PARTITION_COLUMNS]
+    return dataset.to_table(columns=columns).to_pandas()
+
+
+def dataset_sources(dataset_dir: Path | None = None) -> dict:
+    """Tamanho e mtime de cada arquivo do dataset colunar, pelo caminho relativo."""
+    dataset_dir = dataset_dir or PROCESSED_DATA_DIR / PROCESSED_DATASET_DIRNAME
+    sources = {}
+    for path in processed_files(dataset_dir):
+        stat = path.stat()
+        sources[path.relative_to(dataset_dir).as_posix()] = [stat.st_size, stat.st_mtime_ns]
+    return sources
+
+
+def _sources_path(artifact: Path) -> Path:
+    return artifact.with_name(artifact.name + SOURCES_SUFFIX)
+
+
+def save_dataset_sources(artifact: Path, sources: dict, params: dict | None = None):
+    """Registra de quais arquivos processados (e com quais parâmetros) ``artifact`` foi calculado."""
+    record = {"params": params or {}, "files": sources}
+    _sources_path(artifact).write_text(json.dumps(record, indent=2, sort_keys=True), encoding="utf-8")
+
+
+def appended_since(
+    artifact: Path,
+    dataset_dir: Path | None = None,
+    params: dict | None = None,
+) -> tuple[dict, list[Path] | None]:
+    """
+    Arquivos acrescentados ao dataset colunar desde a última gravação de
+    ``artifact`` e o registro atual (para ``save_dataset_sources`` depois da
+    atualização).
+
+    A limpeza incremental só acrescenta arquivos ``part-NNNNN``; os já
+    existentes não mudam. A lista é None quando só a reconstrução completa
+    serve: artefato ou registro ausentes, sem dataset colunar, ``params``
+    diferentes dos registrados, ou algum arquivo já usado mudou ou sumiu
+    (dataset regravado por inteiro).
+    """
+    dataset_dir = dataset_dir or PROCESSED_DATA_DIR / PROCESSED_DATASET_DIRNAME
+    sources = dataset_sources(dataset_dir)
+    path = _sources_path(artifact)
+    if not sources or not artifact.exists() or not path.exists():
+        return sources, None
+    record = json.loads(path.read_text(encoding="utf-8"))
+    previous = record["files"]
+    if record["params"] != (params or {}) or not previous:
+        return sources, None
+    if any(sources.get(name) != fingerprint for name, fingerprint in previous.items()):
+        return sources, None
+    return sources, [dataset_dir / name for name in sorted(sources) if name not in previous]
+
+
+def sources_are_current(artifact: Path, dataset_dir: Path | None = None) -> bool:
+    """
+    ``artifact`` foi calculado dos arquivos atuais do dataset colunar: o
+    registro de ``save_dataset_sources`` lista exatamente os arquivos de
+    agora, com o mesmo tamanho e mtime. Sem registro ou sem dataset colunar,
+    retorna False.
+    """
+    dataset_dir = dataset_dir or PROCESSED_DATA_DIR / PROCESSED_DATASET_DIRNAME
+    path = _sources_path(artifact)
+    if not artifact.exists() or not path.exists():
+        return False
+    sources = dataset_sources(dataset_dir)
+    return bool(sources) and json.loads(path.read_text(encoding="utf-8"))["files"] == sources
+
+
+def iter_processed_batches(
+    columns: list[str] | None = None,
+    batch_rows: int = PROCESSED_ROW_GROUP_SIZE,
+    dataset_dir: Path | None = None,
+    csv_path: Path | None = None,
+    files: list[Path] | None = None,
+):
+    """
+    Percorre os dados processados em DataFrames de até ``batch_rows`` linhas,
+    sem carregar o dataset inteiro. ``files`` restringe a leitura a alguns
+    arquivos do dataset colunar (um subconjunto por processo). Sem dataset
+    colunar, lê o CSV em chunks.
+    """
+    import pyarrow.dataset as ds
+
+    dataset_dir = dataset_dir or PROCESSED_DATA_DIR / PROCESSED_DATASET_DIRNAME
+    csv_path = csv_path or PROCESSED_DATA_DIR / PROCESSED_CSV_FILENAME
+    if files is None and processed_dataset_exists(dataset_dir):
+        files = processed_files(dataset_dir)
+
+    if files is not None:
+        if not files:
+            return
+        formats = {ext: fmt for fmt, ext in FORMAT_EXTENSIONS.items()}
+        dataset = ds.dataset([str(path) for path in files], format=formats[Path(files[0]).suffix])
+        if columns is None:
+            columns = [name for name in dataset.schema.names if name not in PARTITION_COLUMNS]
+        for batch in dataset.to_batches(columns=columns, batch_size=batch_rows):
+            if batch.num_rows:
+                yield batch.to_pandas()
+        return
+
+    if not csv_path.exists():
+        raise FileNotFoundError(
+            f"Dados processados não encontrados em {dataset_dir} nem em {csv_path}. "
+            "Execute 'python main.py' para gerar o dataset."
+        )
+    parse_dates = ["order_date"] if columns is None or "order_date" in columns else False
+    yield from pd.read_csv(csv_path, usecols=columns, parse_dates=parse_dates, chunksize=batch_rows)
@@ -0,0 +1,303 @@
+import copy
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from .config import EDA_BATCH_ROWS, EDA_HISTOGRAM_WIDTHS, EDA_QUANTILE_K, EDA_WORKERS
+from .storage import iter_processed_batches, processed_files
+
+
+DESCRIBE_QUANTILES = (0.25, 0.5, 0.75)
+
+
+class FixedWidthHistogram:
+    """
+    Histograma de bins de largura fixa ancorados em ``origin``. Os bins
+    crescem conforme os valores aparecem, sem faixa definida de antemão, e
+    dois histogramas se combinam somando as contagens (exato).
+    """
+
+    def __init__(self, width: float, origin: float = 0.0):
+        self.width = width
+        self.origin = origin
+        self.start = 0
+        self.counts = np.zeros(0, dtype=np.int64)
+
+    def _add(self, start: int, counts: np.ndarray):
+        if not len(counts):
+            return
+        if not len(self.counts):
+            self.start, self.counts = start, counts.astype(np.int64)
+            return
+        lo = min(self.start, start)
+        hi = max(self.start + len(self.counts), start + len(counts))
+        merged = np.zeros(hi - lo, dtype=np.int64)
+        merged[self.start - lo:self.start - lo + len(self.counts)] += self.counts
+        merged[start - lo:start - lo + len(counts)] += counts
+        self.start, self.counts = lo, merged
+
+    def update(self, values: np.ndarray):
+        values = values[np.isfinite(values)]
+        if len(values):
+            bins = np.floor((values - self.origin) / self.width).astype(np.int64)
+            lo = int(bins.min())
+            self._add(lo, np.bincount(bins - lo))
+
+    def merge(self, other: "FixedWidthHistogram"):
+        self._add(other.start, other.counts)
+
+    @property
+    def edges(self) -> np.ndarray:
+        return self.origin + self.width * (self.start + np.arange(len(self.counts) + 1))
+
+
+class KLLSketch:
+    """
+    Sketch KLL de quantis: compactadores por nível, onde cada item do nível
+    ``h`` vale ``2 ** h`` itens originais. Quando um nível passa da
+    capacidade, ele é ordenado e metade dos itens (pares ou ímpares, ao
+    acaso) sobe de nível. Guarda algumas centenas de valores, devolve apenas
+    valores que existem nos dados (útil para colunas discretas) e, com
+    ``k = 200``, o erro de rank fica em torno de 1%. A fusão concatena os
+    níveis e compacta de novo, com o mesmo limite de erro.
+    """
+
+    def __init__(self, k: int = EDA_QUANTILE_K, seed: int = 0):
+        self.k = k
+        self.levels = [np.zeros(0)]
+        self.rng = np.random.default_rng(seed)
+        self.min = np.inf
+        self.max = -np.inf
+
+    def _capacity(self, level: int) -> int:
+        return max(2, int(np.ceil(self.k * (2 / 3) ** (len(self.levels) - 1 - level))))
+
+    def _compress(self):
+        level = 0
+        while level < len(self.levels):
+            items = self.levels[level]
+            if len(items) > self._capacity(level):
+                if level + 1 == len(self.levels):
+                    self.levels.append(np.zeros(0))
+                items = np.sort(items)
+                # Com quantidade ímpar, o menor item fica no nível
+                keep, items = items[: len(items) % 2], items[len(items) % 2:]
+                promoted = items[int(self.rng.integers(2))::2]
+                self.levels[level + 1] = np.concatenate([self.levels[level + 1], promoted])
+                self.levels[level] = keep
+                # Um nível novo reduz a capacidade dos de baixo: recomeça do início
+                level = 0
+                continue
+            level += 1
+
+    def update(self, values: np.ndarray):
+        values = values[np.isfinite(values)]
+        if len(values):
+            self.min = min(self.min, values.min())
+            self.max = max(self.max, values.max())
+            self.levels[0] = np.concatenate([self.levels[0], values])
+            self._compress()
+
+    def merge(self, other: "KLLSketch"):
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        for level, items in enumerate(other.levels):
+            if level == len(self.levels):
+                self.levels.append(np.zeros(0))
+            self.levels[level] = np.concatenate([self.levels[level], items])
+        self._compress()
+
+    def quantile(self, q):
+        values = np.concatenate(self.levels)
+        if not len(values):
+            return np.full(np.shape(q), np.nan) if np.ndim(q) else np.nan
+        weights = np.concatenate([np.full(len(items), 2.0 ** level) for level, items in enumerate(self.levels)])
+        order = np.argsort(values, kind="stable")
+        values, cumulative = values[order], np.cumsum(weights[order])
+        index = np.searchsorted(cumulative, np.asarray(q) * cumulative[-1], side="left")
+        return values[np.clip(index, 0, len(values) - 1)]
+
+
+class StreamingStats:
+    """
+    Estatísticas de EDA acumuladas lote a lote, com memória limitada.
+
+    Para as colunas numéricas guarda, por par de colunas (linhas em que as
+    duas são válidas, como o ``corr`` do pandas): contagem, médias, somas de
+    quadrados centradas e co-momento. Lotes e processos se combinam com as
+    fórmulas de Chan et al., então contagem, média, variância, mínimo, máximo,
+    histogramas e correlação da fusão são os mesmos de uma passada única
+    (a menos de arredondamento). Os quantis vêm de sketches KLL (aproximados).
+    """
+
+    def __init__(
+        self,
+        histogram_widths: dict | None = None,
+        quantile_k: int = EDA_QUANTILE_K,
+    ):
+        self.histogram_widths = EDA_HISTOGRAM_WIDTHS if histogram_widths is None else histogram_widths
+        self.quantile_k = quantile_k
+        self.rows = 0
+        self.dtypes = None
+        self.non_null = None
+        self.numeric = None
+
+    def _init_columns(self, df: pd.DataFrame):
+        self.dtypes = df.dtypes.astype(str).to_dict()
+        self.non_null = pd.Series(0, index=df.columns, dtype="int64")
+        self.numeric = list(df.select_dtypes("number").columns)
+        k = len(self.numeric)
+        self.n = np.zeros((k, k))
+        self.mean = np.zeros((k, k))
+        self.m2 = np.zeros((k, k))
+        self.comoment = np.zeros((k, k))
+        self.min = np.full(k, np.inf)
+        self.max = np.full(k, -np.inf)
+        self.quantiles = {col: KLLSketch(self.quantile_k) for col in self.numeric}
+        self.histograms = {
+            col: FixedWidthHistogram(width) for col, width in self.histogram_widths.items() if col in self.numeric
+        }
+
+    def _combine(self, n, mean, m2, comoment):
+        # Chan et al.: junta dois conjuntos de momentos centrados, par a par
+        total = self.n + n
+        with np.errstate(invalid="ignore", divide="ignore"):
+            delta = mean - self.mean
+            ratio = np.where(total > 0, n / total, 0.0)
+            weight = np.where(total > 0, self.n * n / total, 0.0)
+        self.mean = self.mean + delta * ratio
+        self.m2 = self.m2 + m2 + delta ** 2 * weight
+        self.comoment = self.comoment + comoment + delta * delta.T * weight
+        self.n = total
+
+    def update(self, df: pd.DataFrame) -> "StreamingStats":
+        if self.dtypes is None:
+            self._init_columns(df)
+        self.rows += len(df)
+        self.non_null = self.non_null.add(df.notna().sum(), fill_value=0).astype("int64")
+
+        values = df[self.numeric].to_numpy(dtype="float64", na_value=np.nan)
+        valid = ~np.isnan(values)
+        # Centraliza pela média do lote antes dos produtos (evita cancelamento numérico)
+        counts = valid.sum(axis=0)
+        shift = np.where(valid, values, 0.0).sum(axis=0) / np.maximum(counts, 1)
+        centered = np.where(valid, values - shift, 0.0)
+        weights = valid.astype("float64")
+
+        # [i, j]: somas da coluna i nas linhas em que i e j são válidas
+        n = weights.T @ weights
+        sums = centered.T @ weights
+        squares = (centered ** 2).T @ weights
+        cross = centered.T @ centered
+        with np.errstate(invalid="ignore", divide="ignore"):
+            local_mean = np.where(n > 0, sums / n, 0.0)
+            m2 = squares - np.where(n > 0, sums ** 2 / n, 0.0)
+            comoment = cross - np.where(n > 0, sums * sums.T / n, 0.0)
+        self._combine(n, local_mean + shift[:, None], m2, comoment)
+
+        if len(values):
+            self.min = np.minimum(self.min, np.where(valid, values, np.inf).min(axis=0))
+            self.max = np.maximum(self.max, np.where(valid, values, -np.inf).max(axis=0))
+        for i, col in enumerate(self.numeric):
+            self.quantiles[col].update(values[:, i])
+            if col in self.histograms:
+                self.histograms[col].update(values[:, i])
+        return self
+
+    def merge(self, other: "StreamingStats") -> "StreamingStats":
+        if other.dtypes is None:
+            return self
+        if self.dtypes is None:
+            self.__dict__.update(copy.deepcopy(other.__dict__))
+            return self
+        self.rows += other.rows
+        self.non_null = self.non_null.add(other.non_null, fill_value=0).astype("int64")
+        self._combine(other.n, other.mean, other.m2, other.comoment)
+        self.min = np.minimum(self.min, other.min)
+        self.max = np.maximum(self.max, other.max)
+        for col in self.numeric:
+            self.quantiles[col].merge(other.quantiles[col])
+        for col, histogram in other.histograms.items():
+            self.histograms[col].merge(histogram)
+        return self
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame, batch_rows: int = EDA_BATCH_ROWS, **kwargs) -> "StreamingStats":
+        stats = cls(**kwargs)
+        for start in range(0, max(len(df), 1), batch_rows):
+            stats.update(df.iloc[start:start + batch_rows])
+        return stats
+
+    def info(self) -> pd.DataFrame:
+        """Equivalente ao ``df.info()``: não nulos e tipo de cada coluna."""
+        return pd.DataFrame({"non_null": self.non_null, "dtype": pd.Series(self.dtypes)})
+
+    def describe(self) -> pd.DataFrame:
+        """Mesmo formato de ``df.describe()`` (quantis aproximados pelos sketches KLL)."""
+        count = np.diag(self.n)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            std = np.sqrt(np.diag(self.m2) / (count - 1))
+        rows = {
+            "count": count,
+            "mean": np.where(count > 0, np.diag(self.mean), np.nan),
+            "std": np.where(count > 1, std, np.nan),
+            "min": np.where(count > 0, self.min, np.nan),
+        }
+        for q in DESCRIBE_QUANTILES:
+            rows[f"{q:.0%}"] = [self.quantiles[col].quantile(q) for col in self.numeric]
+        rows["max"] = np.where(count > 0, self.max, np.nan)
+        return pd.DataFrame(rows, index=self.numeric).T
+
+    def corr(self) -> pd.DataFrame:
+        """Correlação de Pearson par a par, como ``df.select_dtypes("number").corr()``."""
+        with np.errstate(invalid="ignore", divide="ignore"):
+            corr = self.comoment / np.sqrt(self.m2 * self.m2.T)
+        corr[(self.n < 2) | ~np.isfinite(corr)] = np.nan
+        return pd.DataFrame(np.clip(corr, -1, 1), index=self.numeric, columns=self.numeric)
+
+    def quantile(self, column: str, q):
+        return self.quantiles[column].quantile(q)
+
+
+def _files_stats(files: list[Path], columns, batch_rows: int, histogram_widths, quantile_k) -> StreamingStats:
+    stats = StreamingStats(histogram_widths, quantile_k)
+    for batch in iter_processed_batches(columns, batch_rows, files=files):
+        stats.update(batch)
+    return stats
+
+
+def compute_streaming_stats(
+    columns: list[str] | None = None,
+    batch_rows: int = EDA_BATCH_ROWS,
+    workers: int = EDA_WORKERS,
+    dataset_dir: Path | None = None,
+    csv_path: Path | None = None,
+    histogram_widths: dict | None = None,
+    quantile_k: int = EDA_QUANTILE_K,
+    files: list[Path] | None = None,
+) -> StreamingStats:
+    """
+    Uma passada sobre os dados processados, lote a lote. Com ``workers > 1``
+    os arquivos do dataset colunar são divididos entre processos e os
+    resultados parciais combinados com ``StreamingStats.merge``. ``files``
+    restringe a passada a alguns arquivos do dataset.
+    """
+    dataset_files = processed_files(dataset_dir) if files is None else files
+    if workers > 1 and len(dataset_files) > 1:
+        groups = [dataset_files[i::workers] for i in range(min(workers, len(dataset_files)))]
+        stats = StreamingStats(histogram_widths, quantile_k)
+        with ProcessPoolExecutor(max_workers=len(groups)) as pool:
+            futures = [
+                pool.submit(_files_stats, group, columns, batch_rows, histogram_widths, quantile_k)
+                for group in groups
+            ]
+            for future in futures:
+                stats.merge(future.result())
+        return stats
+
+    stats = StreamingStats(histogram_widths, quantile_k)
+    for batch in iter_processed_batches(columns, batch_rows, dataset_dir=dataset_dir, csv_path=csv_path, files=files):
+        stats.update(batch)
+    return stats
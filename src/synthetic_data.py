@@ -0,0 +1,251 @@
+import argparse
+from pathlib import Path
+from typing import Iterator
+
+import numpy as np
+import pandas as pd
+
+from .config import RAW_DATA_DIR
+
+
+DEFAULT_SEED = 42
+DEFAULT_CHUNK_ROWS = 100_000
+DEFAULT_ROWS_PER_FILE = 1_000_000
+DEFAULT_START_DATE = "2022-01-01"
+DEFAULT_END_DATE = "2023-12-31"
+
+# Proporções observadas na amostra de 50k linhas (data/processed/amazon_sales_clean.csv)
+CATEGORY_WEIGHTS = {
+    "Beauty": 0.169,
+    "Fashion": 0.167,
+    "Books": 0.167,
+    "Electronics": 0.166,
+    "Sports": 0.165,
+    "Home & Kitchen": 0.166,
+}
+REGION_WEIGHTS = {
+    "Asia": 0.251,
+    "North America": 0.250,
+    "Middle East": 0.250,
+    "Europe": 0.249,
+}
+PAYMENT_WEIGHTS = {
+    "Wallet": 0.202,
+    "UPI": 0.202,
+    "Debit Card": 0.200,
+    "Cash on Delivery": 0.199,
+    "Credit Card": 0.197,
+}
+DISCOUNT_WEIGHTS = {0: 0.164, 5: 0.170, 10: 0.166, 15: 0.166, 20: 0.167, 30: 0.167}
+QUANTITY_WEIGHTS = {1: 0.201, 2: 0.198, 3: 0.201, 4: 0.200, 5: 0.200}
+PRICE_RANGE = (5.0, 500.0)
+RATING_RANGE = (1.0, 5.0)
+REVIEW_COUNT_RANGE = (0, 499)
+PRODUCT_ID_RANGE = (1000, 4999)
+
+# Tipos de linha suja que podem ser injetados, com a taxa (fração das linhas) de cada um
+DIRTY_ROW_KINDS = (
+    "order_date_invalida",
+    "price_negativo",
+    "rating_fora_do_intervalo",
+    "quantity_sold_nao_positiva",
+    "total_revenue_ausente",
+)
+INVALID_DATES = np.array(["not a date", "2023-02-30", "31/12/2023", ""], dtype=object)
+
+OUTPUT_COLUMNS = [
+    "order_id",
+    "order_date",
+    "product_id",
+    "product_category",
+    "price",
+    "discount_percent",
+    "quantity_sold",
+    "customer_region",
+    "payment_method",
+    "rating",
+    "review_count",
+    "discounted_price",
+    "total_revenue",
+]
+
+
+def _choice(rng: np.random.Generator, weights: dict, size: int) -> np.ndarray:
+    values = np.array(list(weights), dtype=object if isinstance(next(iter(weights)), str) else None)
+    probabilities = np.array(list(weights.values()), dtype="float64")
+    return rng.choice(values, size=size, p=probabilities / probabilities.sum())
+
+
+def generate_sales_chunk(
+    rng: np.random.Generator,
+    rows: int,
+    first_order_id: int = 1,
+    start_date: str = DEFAULT_START_DATE,
+    end_date: str = DEFAULT_END_DATE,
+) -> pd.DataFrame:
+    """
+    Gera ``rows`` vendas limpas no schema do dataset Amazon.
+
+    ``order_id`` é sequencial a partir de ``first_order_id``; as datas são
+    uniformes no período e os preços/receitas seguem as mesmas regras de
+    arredondamento da amostra (preço com desconto e receita em centavos).
+    """
+    start = np.datetime64(start_date, "D")
+    days = int((np.datetime64(end_date, "D") - start).astype(int)) + 1
+
+    price = np.round(rng.uniform(*PRICE_RANGE, rows), 2)
+    discount = _choice(rng, DISCOUNT_WEIGHTS, rows).astype("int64")
+    quantity = _choice(rng, QUANTITY_WEIGHTS, rows).astype("int64")
+    discounted_price = np.round(price * (1 - discount / 100), 2)
+
+    df = pd.DataFrame(
+        {
+            "order_id": np.arange(first_order_id, first_order_id + rows, dtype="int64"),
+            "order_date": (start + rng.integers(0, days, rows)).astype("datetime64[D]").astype(str),
+            "product_id": rng.integers(PRODUCT_ID_RANGE[0], PRODUCT_ID_RANGE[1] + 1, rows),
+            "product_category": _choice(rng, CATEGORY_WEIGHTS, rows),
+            "price": price,
+            "discount_percent": discount,
+            "quantity_sold": quantity,
+            "customer_region": _choice(rng, REGION_WEIGHTS, rows),
+            "payment_method": _choice(rng, PAYMENT_WEIGHTS, rows),
+            "rating": np.round(rng.uniform(*RATING_RANGE, rows), 1),
+            "review_count": rng.integers(REVIEW_COUNT_RANGE[0], REVIEW_COUNT_RANGE[1] + 1, rows),
+            "discounted_price": discounted_price,
+            "total_revenue": np.round(discounted_price * quantity, 2),
+        }
+    )
+    return df[OUTPUT_COLUMNS]
+
+
+def inject_dirty_rows(df: pd.DataFrame, rng: np.random.Generator, dirty_rates: dict) -> pd.DataFrame:
+    """
+    Suja uma fração das linhas de ``df`` (in place) conforme ``dirty_rates``
+    (tipo de ``DIRTY_ROW_KINDS`` -> fração de 0 a 1). Cada tipo sorteia suas
+    linhas de forma independente. Retorna o próprio ``df``.
+    """
+    unknown = set(dirty_rates) - set(DIRTY_ROW_KINDS)
+    if unknown:
+        raise ValueError(f"Tipos de linha suja desconhecidos: {', '.join(sorted(unknown))}")
+
+    for kind in DIRTY_ROW_KINDS:
+        rate = dirty_rates.get(kind, 0)
+        if not rate:
+            continue
+        rows = np.flatnonzero(rng.random(len(df)) < rate)
+        if not len(rows):
+            continue
+        if kind == "order_date_invalida":
+            df.iloc[rows, df.columns.get_loc("order_date")] = rng.choice(INVALID_DATES, len(rows))
+        elif kind == "price_negativo":
+            df.iloc[rows, df.columns.get_loc("price")] *= -1
+        elif kind == "rating_fora_do_intervalo":
+            high = np.round(rng.uniform(5.1, 10.0, len(rows)), 1)
+            df.iloc[rows, df.columns.get_loc("rating")] = np.where(rng.random(len(rows)) < 0.5, high, -high)
+        elif kind == "quantity_sold_nao_positiva":
+            df.iloc[rows, df.columns.get_loc("quantity_sold")] = rng.integers(-2, 1, len(rows))
+        elif kind == "total_revenue_ausente":
+            df.iloc[rows, df.columns.get_loc("total_revenue")] = np.nan
+    return df
+
+
+def iter_synthetic_sales(
+    rows: int,
+    seed: int = DEFAULT_SEED,
+    chunk_rows: int = DEFAULT_CHUNK_ROWS,
+    dirty_rates: dict | None = None,
+    start_date: str = DEFAULT_START_DATE,
+    end_date: str = DEFAULT_END_DATE,
+) -> Iterator[pd.DataFrame]:
+    """
+    Gera ``rows`` linhas em chunks de ``chunk_rows``, sem manter o total na memória.
+
+    Cada chunk usa um gerador próprio semeado por ``(seed, índice do chunk)``:
+    com a mesma semente e o mesmo ``chunk_rows`` a saída é idêntica.
+    """
+    for index, first_row in enumerate(range(0, rows, chunk_rows)):
+        rng = np.random.default_rng([seed, index])
+        chunk = generate_sales_chunk(
+            rng, min(chunk_rows, rows - first_row), first_row + 1, start_date, end_date
+        )
+        if dirty_rates:
+            inject_dirty_rows(chunk, rng, dirty_rates)
+        yield chunk
+
+
+def write_synthetic_sales(
+    output_dir: Path,
+    rows: int,
+    seed: int = DEFAULT_SEED,
+    rows_per_file: int = DEFAULT_ROWS_PER_FILE,
+    chunk_rows: int = DEFAULT_CHUNK_ROWS,
+    dirty_rates: dict | None = None,
+    fmt: str = "csv",
+) -> list[Path]:
+    """
+    Grava ``rows`` linhas sintéticas em ``output_dir/part-NNNNN.<fmt>``
+    ("csv" ou "parquet"), com até ``rows_per_file`` linhas por arquivo.
+    Retorna os caminhos gerados.
+    """
+    if fmt not in ("csv", "parquet"):
+        raise ValueError(f"Formato não suportado: {fmt}")
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    for old_part in output_dir.glob(f"part-*.{fmt}"):
+        old_part.unlink()
+
+    paths = []
+    writer = None
+    file_rows = 0
+    chunks = iter_synthetic_sales(rows, seed, min(chunk_rows, rows_per_file), dirty_rates)
+    for chunk in chunks:
+        if not paths or file_rows + len(chunk) > rows_per_file:
+            if writer is not None:
+                writer.close()
+                writer = None
+            paths.append(output_dir / f"part-{len(paths):05d}.{fmt}")
+            file_rows = 0
+        if fmt == "csv":
+            chunk.to_csv(paths[-1], index=False, mode="a" if file_rows else "w", header=not file_rows)
+        else:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+
+            table = pa.Table.from_pandas(chunk, preserve_index=False)
+            if writer is None:
+                writer = pq.ParquetWriter(paths[-1], table.schema)
+            writer.write_table(table)
+        file_rows += len(chunk)
+    if writer is not None:
+        writer.close()
+
+    print(f"{rows:,} linhas sintéticas gravadas em {len(paths)} arquivo(s) em: {output_dir}")
+    return paths
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Gerador de vendas sintéticas no schema Amazon")
+    parser.add_argument("--rows", type=int, required=True, help="Número de linhas")
+    parser.add_argument("--output-dir", type=Path, default=RAW_DATA_DIR / "synthetic")
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED)
+    parser.add_argument("--rows-per-file", type=int, default=DEFAULT_ROWS_PER_FILE)
+    parser.add_argument("--format", choices=["csv", "parquet"], default="csv")
+    parser.add_argument(
+        "--dirty-rate",
+        type=float,
+        default=0.0,
+        help="Fração de linhas sujas de cada tipo (datas inválidas, preços negativos, ...)",
+    )
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    write_synthetic_sales(
+        args.output_dir,
+        args.rows,
+        seed=args.seed,
+        rows_per_file=args.rows_per_file,
+        dirty_rates={kind: args.dirty_rate for kind in DIRTY_ROW_KINDS},
+        fmt=args.format,
+    )
@@ -1,60 +1,18 @@
 import pandas as pd
-import seaborn as sns
-import matplotlib.pyplot as plt
 
-from .config import PROCESSED_DATA_DIR, FIGURES_DIR
-
-PROCESSED_FILENAME = "amazon_sales_clean.csv"
-
-
-def load_processed_sales_data(filename: str = PROCESSED_FILENAME) -> pd.DataFrame:
-    path = PROCESSED_DATA_DIR / filename
-    df = pd.read_csv(path, parse_dates=["order_date"])
-    return df
+from .figures import category_revenue, monthly_revenue, monthly_revenue_spec, render_figures, top_categories_spec
+from .storage import load_processed_sales_data
 
 
 def sales_trend_over_time(df: pd.DataFrame):
-    df = df.copy()
-    df["year_month"] = df["order_date"].dt.to_period("M").dt.to_timestamp()
-    monthly = (
-        df.groupby("year_month")["total_revenue"]
-        .sum()
-        .reset_index()
-        .sort_values("year_month")
-    )
-
-    plt.figure(figsize=(10, 5))
-    sns.lineplot(data=monthly, x="year_month", y="total_revenue", marker="o")
-    plt.title("Tendência de Receita Mensal")
-    plt.xlabel("Ano-Mês")
-    plt.ylabel("Receita Total")
-    plt.xticks(rotation=45)
-    plt.tight_layout()
-    fig_path = FIGURES_DIR / "sales_trend_over_time.png"
-    plt.savefig(fig_path)
-    plt.close()
+    render_figures([monthly_revenue_spec(monthly_revenue(df))])
 
 
 def top_categories_by_sales(df: pd.DataFrame, top_n: int = 10):
-    grouped = (
-        df.groupby("product_category")["total_revenue"]
-        .sum()
-        .sort_values(ascending=False)
-        .head(top_n)
-    )
-
-    plt.figure(figsize=(10, 6))
-    sns.barplot(x=grouped.values, y=grouped.index)
-    plt.title(f"Top {top_n} Categorias por Receita")
-    plt.xlabel("Receita Total")
-    plt.ylabel("Categoria")
-    plt.tight_layout()
-    fig_path = FIGURES_DIR / "top_categories_by_sales.png"
-    plt.savefig(fig_path)
-    plt.close()
+    render_figures([top_categories_spec(category_revenue(df), top_n)])
 
 
 if __name__ == "__main__":
-    df = load_processed_sales_data()
+    df = load_processed_sales_data(columns=["order_date", "product_category", "total_revenue"])
     sales_trend_over_time(df)
     top_categories_by_sales(df)
@@ -2,13 +2,34 @@ import streamlit as st
 import pandas as pd
 import numpy as np
 import plotly.express as px
-import plotly.graph_objects as go
-from plotly.subplots import make_subplots
 from pathlib import Path
 import calendar
 from datetime import datetime, timedelta
 from dateutil.relativedelta import relativedelta
 
+from src.aggregation_cache import AggregationCache, aggregation_key, dataset_version
+from src.aggregation_planner import AggregationPlanner
+from src.config import DASHBOARD_BACKEND, DASHBOARD_COMPACT_SCHEMA, DATAFRAME_ENGINE, ORDER_COUNT_MODE
+from src.cube import CUBE_COLUMNS, CUBE_KEYS, build_sales_cube, compute_cube_metrics, load_sales_cube
+from src.daily_rollup import ROLLUP_KEYS, DailyRollup
+from src.dashboard_metrics import (
+    ROW_LEVEL_KEYS,
+    DashboardFilters,
+    previous_period_bounds,
+)
+from src.downsampling import downsample_frame, render_mode
+from src.feature_engineering import load_sales_features
+from src.filter_index import SalesFilterIndex
+from src.schema import compact_sales_frame, memory_footprint, memory_report
+from src.sketches import (
+    SKETCH_COLUMNS,
+    SketchRollup,
+    build_order_sketches,
+    load_order_sketches,
+)
+from src.sql_backend import SqlSalesBackend
+from src.storage import load_processed_sales_data
+
 # Configuração da página - MODO ULTRA WIDE
 st.set_page_config(
     page_title="Amazon Sales Analytics",
@@ -79,36 +100,164 @@ st.markdown(f"<style>{CSS_PATH.read_text(encoding='utf-8')}</style>", unsafe_all
 
 
 # Carregar dados
+def prepare_data(
+    compact: bool = DASHBOARD_COMPACT_SCHEMA,
+    dataset_dir: Path | None = None,
+    engine: str = DATAFRAME_ENGINE,
+    features_dir: Path | None = None,
+):
+    """
+    Carrega os dados do dashboard com as features já calculadas.
+
+    Lê a tabela de features gravada pelo pipeline (estágio "features"); sem
+    ela, as features são calculadas na carga (``engine="polars"`` usa um
+    plano lazy do Polars). Com ``compact=True`` usa categorias, inteiros
+    reduzidos e float32 (ver ``src.schema.compact_sales_frame``).
+    ``dataset_dir`` e ``features_dir`` trocam os caminhos padrão (usado pelos
+    benchmarks).
+    """
+    df = load_sales_features(dataset_dir=dataset_dir, features_dir=features_dir, engine=engine)
+
+    if compact:
+        df = compact_sales_frame(df)
+
+    # Mantém as linhas ordenadas por data para o filtro por busca binária
+    if not df['order_date'].is_monotonic_increasing:
+        df = df.sort_values('order_date', kind='stable').reset_index(drop=True)
+    return df
+
+
+@st.cache_data(ttl=3600, max_entries=1)
+def load_data(
+    compact: bool = DASHBOARD_COMPACT_SCHEMA,
+    dataset_dir: Path | None = None,
+    engine: str = DATAFRAME_ENGINE,
+    version: str | None = None,
+):
+    # version (src.aggregation_cache.dataset_version) só entra na chave do cache. Com
+    # max_entries=1 (aqui e nos recursos derivados) uma versão nova dos dados descarta a
+    # anterior em vez de mantê-la na memória até o ttl
+    return prepare_data(compact, dataset_dir, engine)
+
+
+@st.cache_resource(ttl=3600, max_entries=1)
+def load_filter_index(compact: bool = DASHBOARD_COMPACT_SCHEMA, version: str | None = None):
+    """Índice de filtros compartilhado entre sessões, sem cópia do DataFrame a cada rerun."""
+    return SalesFilterIndex(load_data(compact, version=version))
+
+
+@st.cache_resource(ttl=3600, max_entries=1)
+def load_aggregation_planner(compact: bool = DASHBOARD_COMPACT_SCHEMA, version: str | None = None):
+    """Dimensões codificadas como inteiros para agregar todas as abas em uma passada."""
+    return AggregationPlanner(load_filter_index(compact, version))
+
+
 @st.cache_data(ttl=3600)
-def load_data():
-    """Carrega e prepara os dados com feature engineering."""
-    DATA_PATH = BASE_DIR / "data" / "processed" / "amazon_sales_clean.csv"
+def load_memory_report():
+    """Memória por coluna nos modos padrão e compacto (só o relatório fica em cache)."""
+    standard_df = prepare_data(compact=False)
+    return memory_report(standard_df, compact_sales_frame(standard_df))
 
-    if not DATA_PATH.exists():
-        raise FileNotFoundError(
-            f"Arquivo de dados processados não encontrado: {DATA_PATH}. Execute 'python main.py' para gerar o dataset."
-        )
 
-    df = pd.read_csv(DATA_PATH, parse_dates=["order_date"])
-
-    # Feature Engineering Avançado
-    df['year'] = df['order_date'].dt.year
-    df['month'] = df['order_date'].dt.month
-    df['month_name'] = df['order_date'].dt.month_name()
-    df['quarter'] = df['order_date'].dt.quarter
-    df['day_of_week'] = df['order_date'].dt.day_name()
-    df['is_weekend'] = df['day_of_week'].isin(['Saturday', 'Sunday'])
-    df['week'] = df['order_date'].dt.isocalendar().week.astype(int)
-
-    # Métricas derivadas
-    df['revenue_per_unit'] = df['total_revenue'] / df['quantity_sold']
-    df['discount_impact'] = (df['price'] * df['quantity_sold']) - df['total_revenue']
-    df['profit_margin'] = (df['total_revenue'] - df['discount_impact']) / df['total_revenue'] * 100
-    df['discount_impact_pct'] = (
-        (df['discount_impact'] / (df['price'] * df['quantity_sold']).replace(0, pd.NA)) * 100
-    ).fillna(0)
+@st.cache_data(ttl=3600, max_entries=1)
+def load_cube(version: str | None = None):
+    """Carrega o cubo dia x região x categoria x pagamento gerado pelo pipeline."""
+    try:
+        return load_sales_cube()
+    except FileNotFoundError:
+        # Cubo ainda não materializado: agrega a partir das linhas processadas
+        return build_sales_cube(load_processed_sales_data(columns=CUBE_COLUMNS))
+
+
+@st.cache_data(ttl=3600, max_entries=1)
+def load_sketches(version: str | None = None):
+    """Sketches HyperLogLog de pedidos por célula do cubo (``ORDER_COUNT_MODE = "sketch"``)."""
+    try:
+        return load_order_sketches()
+    except FileNotFoundError:
+        return build_order_sketches(load_processed_sales_data(columns=SKETCH_COLUMNS))
+
+
+@st.cache_resource(ttl=3600, max_entries=1)
+def load_sketch_rollup(version: str | None = None):
+    """Registradores densos por dia dos sketches: união de um período sem percorrer as células."""
+    return SketchRollup(load_sketches(version))
+
+
+@st.cache_resource(ttl=3600, max_entries=1)
+def load_daily_rollup(version: str | None = None):
+    """Somas acumuladas por dia do cubo: totais de qualquer período em tempo constante."""
+    return DailyRollup(load_cube(version))
+
+
+@st.cache_resource(ttl=3600, max_entries=1)
+def load_sql_backend(version: str | None = None):
+    """Conexão DuckDB sobre os arquivos processados, compartilhada entre sessões."""
+    return SqlSalesBackend()
+
+
+@st.cache_resource
+def load_aggregation_cache():
+    """Cache LRU das agregações, compartilhado entre sessões e invalidado pela versão dos dados."""
+    return AggregationCache()
+
+
+def load_sidebar_options(version: str):
+    """Período disponível e valores de região, categoria e pagamento para os filtros."""
+    if DASHBOARD_BACKEND == "duckdb":
+        backend = load_sql_backend(version)
+        return backend.date_range(), backend.dimension_values()
+    df = load_filter_index(version=version).df
+    dates = (df['order_date'].min().date(), df['order_date'].max().date())
+    return dates, {
+        column: sorted(df[column].unique().tolist())
+        for column in ('customer_region', 'product_category', 'payment_method')
+    }
+
+
+def compute_metrics(filters: DashboardFilters, version: str) -> dict:
+    """Agregações de todas as abas no backend configurado (``DASHBOARD_BACKEND``)."""
+    if DASHBOARD_BACKEND == "duckdb":
+        # Filtro e agregações executados pelo DuckDB sobre os arquivos; nenhuma linha em memória
+        return load_sql_backend(version).compute_metrics(filters)
+    planner = load_aggregation_planner(version=version)
+    if DASHBOARD_BACKEND == "cube":
+        # KPIs pelo rollup, abas pelo cubo; desconto e produtos seguem linha a linha
+        metrics = load_daily_rollup(version).kpis(filters)
+        tab_keys = set(CUBE_KEYS) - set(ROLLUP_KEYS)
+        metrics.update(compute_cube_metrics(load_cube(version), filters, keys=tab_keys))
+        metrics.update(planner.compute(filters, keys=ROW_LEVEL_KEYS))
+        if ORDER_COUNT_MODE == "sketch":
+            # Pedidos distintos da união dos sketches das células (não dependem de somas exatas)
+            orders = load_sketch_rollup(version).order_metrics(filters)
+            category_metrics = metrics['category_metrics'].copy()
+            category_metrics['order_id'] = (
+                category_metrics['product_category'].map(orders['category_orders']).fillna(0).astype('int64')
+            )
+            metrics['total_orders'] = orders['total_orders']
+            metrics['category_metrics'] = category_metrics
+        return metrics
+    return planner.compute(filters)
+
+
+def compute_total_revenue(version: str) -> float:
+    """Receita de todo o dataset, base do "% do total"."""
+    if DASHBOARD_BACKEND == "duckdb":
+        return load_sql_backend(version).total_revenue()
+    if DASHBOARD_BACKEND == "cube":
+        return load_daily_rollup(version).total_revenue()
+    return load_filter_index(version=version).df['total_revenue'].sum()
 
-    return df
+
+def count_period_orders(start, end, version: str) -> int:
+    """Pedidos distintos em um período (comparação com o período anterior)."""
+    if DASHBOARD_BACKEND == "duckdb":
+        return load_sql_backend(version).count_orders(start, end)
+    if DASHBOARD_BACKEND == "cube":
+        if ORDER_COUNT_MODE == "sketch":
+            return load_sketch_rollup(version).count_orders(start, end)
+        return load_daily_rollup(version).count_orders(start, end)
+    return load_filter_index(version=version).count_orders(start, end)
 
 
 def main():
@@ -117,7 +266,11 @@ def main():
     st.markdown('<p class="sub-header">Dashboard Executivo de Performance de Vendas</p>', unsafe_allow_html=True)
 
     try:
-        df = load_data()
+        # Muda quando o pipeline regrava os dados processados: invalida caches e agregações
+        version = dataset_version()
+        aggregation_cache = load_aggregation_cache()
+        aggregation_cache.set_version(version)
+        (min_date, max_date), options = load_sidebar_options(version)
     except Exception as e:
         st.error(f"🚨 Erro ao carregar dados: {e}")
         st.stop()
@@ -134,9 +287,6 @@ def main():
             horizontal=True
         )
 
-        min_date = df['order_date'].min().date()
-        max_date = df['order_date'].max().date()
-
         # Inicializar start_date e end_date com valores padrão
         start_date = min_date
         end_date = max_date
@@ -195,36 +345,62 @@ def main():
         if start_date > end_date:
             start_date, end_date = min_date, max_date
 
-        # Converter para datetime para filtrar
-        start_datetime = pd.to_datetime(start_date)
-        end_datetime = pd.to_datetime(end_date) + pd.DateOffset(days=1) - pd.DateOffset(seconds=1)
-
-        df_filtered = df[(df['order_date'] >= start_datetime) &
-                         (df['order_date'] <= end_datetime)]
-
         # Filtros multiselect
-        regions = ['Todas'] + sorted(df['customer_region'].unique().tolist())
+        regions = ['Todas'] + options['customer_region']
         selected_region = st.selectbox("📍 Região", regions)
 
-        categories = ['Todas'] + sorted(df['product_category'].unique().tolist())
+        categories = ['Todas'] + options['product_category']
         selected_category = st.selectbox("📦 Categoria", categories)
 
-        payment_methods = ['Todos'] + sorted(df['payment_method'].unique().tolist())
+        payment_methods = ['Todos'] + options['payment_method']
         selected_payment = st.selectbox("💳 Método de Pagamento", payment_methods)
 
         # Aplicar filtros
-        if selected_region != 'Todas':
-            df_filtered = df_filtered[df_filtered['customer_region'] == selected_region]
-        if selected_category != 'Todas':
-            df_filtered = df_filtered[df_filtered['product_category'] == selected_category]
-        if selected_payment != 'Todos':
-            df_filtered = df_filtered[df_filtered['payment_method'] == selected_payment]
+        filters = DashboardFilters(
+            start_date,
+            end_date,
+            region=None if selected_region == 'Todas' else selected_region,
+            category=None if selected_category == 'Todas' else selected_category,
+            payment=None if selected_payment == 'Todos' else selected_payment,
+        )
+
+        # Combinações de filtros já pedidas (por qualquer sessão) saem do cache compartilhado
+        metrics = aggregation_cache.get_or_compute(
+            aggregation_key(version, DASHBOARD_BACKEND, filters),
+            lambda: compute_metrics(filters, version),
+        )
+        total_revenue_full = aggregation_cache.get_or_compute(
+            aggregation_key(version, DASHBOARD_BACKEND, None, "total_revenue"),
+            lambda: compute_total_revenue(version),
+        )
+        has_data = metrics['row_count'] > 0
 
         # KPIs rápidos do filtro
         st.markdown("---")
-        st.markdown(f"### 📊 Amostra: {len(df_filtered):,} registros")
+        st.markdown(f"### 📊 Amostra: {metrics['row_count']:,} registros")
         st.markdown(f"📅 {start_date.strftime('%d/%m/%Y')} - {end_date.strftime('%d/%m/%Y')}")
 
+        # Memória ocupada pelo DataFrame do dashboard
+        with st.expander("💾 Memória por coluna"):
+            if DASHBOARD_BACKEND == "duckdb":
+                st.markdown("Backend DuckDB: as linhas ficam nos arquivos processados, fora do processo.")
+            else:
+                footprint = memory_footprint(load_filter_index(version=version).df)
+                mode = "compacto" if DASHBOARD_COMPACT_SCHEMA else "padrão"
+                st.markdown(f"Modo {mode}: **{footprint['bytes'].sum() / 1024 ** 2:,.1f} MB**")
+                if st.checkbox("Comparar modos padrão e compacto"):
+                    st.dataframe(load_memory_report(), use_container_width=True)
+                else:
+                    st.dataframe(footprint, use_container_width=True)
+
+        with st.expander("⚡ Cache de agregações"):
+            stats = aggregation_cache.stats()
+            st.markdown(
+                f"**{stats['hits']:,}** acertos, **{stats['misses']:,}** faltas "
+                f"({stats['hit_rate']:.0%}), {stats['entries']}/{stats['max_entries']} entradas, "
+                f"{stats['evictions']:,} descartadas"
+            )
+
     # MAIN CONTENT - Tabs organizadas
     tab1, tab2, tab3, tab4 = st.tabs([
         "📈 **Visão Geral**",
@@ -238,24 +414,23 @@ def main():
         col1, col2, col3, col4 = st.columns(4)
 
         with col1:
-            total_revenue = df_filtered['total_revenue'].sum()
+            total_revenue = metrics['total_revenue']
             st.metric(
                 "💰 Receita Total",
                 f"${total_revenue:,.0f}",
-                delta=f"{((total_revenue / df['total_revenue'].sum()) * 100):.1f}% do total",
+                delta=f"{((total_revenue / total_revenue_full) * 100):.1f}% do total",
                 delta_color="normal"
             )
 
         with col2:
-            total_orders = df_filtered['order_id'].nunique()
+            total_orders = metrics['total_orders']
             # Calcular período anterior apenas se houver dados suficientes
-            if len(df_filtered) > 0 and date_range_type != "Todo Período":
-                period_days = (end_datetime - start_datetime).days
-                prev_start = start_datetime - relativedelta(days=period_days)
-                prev_end = start_datetime - timedelta(seconds=1)
-
-                prev_period = df[(df['order_date'] >= prev_start) &
-                                 (df['order_date'] <= prev_end)]['order_id'].nunique()
+            if has_data and date_range_type != "Todo Período":
+                prev_start, prev_end = previous_period_bounds(start_date, end_date)
+                prev_period = aggregation_cache.get_or_compute(
+                    aggregation_key(version, DASHBOARD_BACKEND, DashboardFilters(prev_start, prev_end), "orders"),
+                    lambda: count_period_orders(prev_start, prev_end, version),
+                )
                 growth = ((total_orders - prev_period) / prev_period * 100) if prev_period > 0 else 0
             else:
                 growth = 0
@@ -272,12 +447,12 @@ def main():
             st.metric(
                 "🎫 Ticket Médio",
                 f"${avg_ticket:,.2f}",
-                delta=f"${df_filtered['revenue_per_unit'].mean():,.2f} por unidade" if len(df_filtered) > 0 else "$0.00"
+                delta=f"${metrics['revenue_per_unit_mean']:,.2f} por unidade" if has_data else "$0.00"
             )
 
         with col4:
-            avg_rating = df_filtered['rating'].mean() if len(df_filtered) > 0 else 0
-            high_rating_pct = (df_filtered['rating'] >= 4).mean() * 100 if len(df_filtered) > 0 else 0
+            avg_rating = metrics['avg_rating']
+            high_rating_pct = metrics['high_rating_pct']
             st.metric(
                 "⭐ Rating Médio",
                 f"{avg_rating:.2f}",
@@ -285,13 +460,13 @@ def main():
             )
 
         # Verificar se há dados para exibir gráficos
-        if len(df_filtered) > 0:
+        if has_data:
             # Gráficos em grid
             col1, col2 = st.columns(2)
 
             with col1:
                 # Receita por Região (Pizza melhorada)
-                region_revenue = df_filtered.groupby('customer_region')['total_revenue'].sum().reset_index()
+                region_revenue = metrics['region_revenue']
                 if len(region_revenue) > 0:
                     fig = px.pie(
                         region_revenue,
@@ -309,7 +484,7 @@ def main():
 
             with col2:
                 # Métodos de Pagamento
-                payment_revenue = df_filtered.groupby('payment_method')['total_revenue'].sum().reset_index()
+                payment_revenue = metrics['payment_revenue']
                 if len(payment_revenue) > 0:
                     fig = px.bar(
                         payment_revenue,
@@ -325,18 +500,23 @@ def main():
                     st.info("Sem dados de pagamento para o período selecionado")
 
             # Timeline interativa
-            daily_revenue = df_filtered.groupby('order_date')['total_revenue'].sum().reset_index()
+            daily_revenue = metrics['daily_revenue']
             if len(daily_revenue) > 0:
+                # Séries longas são reduzidas (LTTB) ao orçamento de pontos da largura do gráfico
+                daily_points = downsample_frame(daily_revenue, 'order_date', 'total_revenue')
                 fig = px.line(
-                    daily_revenue,
+                    daily_points,
                     x='order_date',
                     y='total_revenue',
                     title='📅 Evolução Diária da Receita',
-                    labels={'total_revenue': 'Receita ($)', 'order_date': 'Data'}
+                    labels={'total_revenue': 'Receita ($)', 'order_date': 'Data'},
+                    render_mode=render_mode(len(daily_points))
                 )
                 fig.update_traces(line_color='#FF9900', line_width=3)
                 fig.update_layout(hovermode='x unified')
                 st.plotly_chart(fig, use_container_width=True)
+                if len(daily_points) < len(daily_revenue):
+                    st.caption(f"Exibindo {len(daily_points):,} de {len(daily_revenue):,} dias (amostragem que preserva picos e vales)")
             else:
                 st.info("Sem dados diários para o período selecionado")
         else:
@@ -345,43 +525,24 @@ def main():
     with tab2:
         st.subheader("💰 Análise Financeira Detalhada")
 
-        if len(df_filtered) > 0:
+        if has_data:
             col1, col2 = st.columns(2)
 
             with col1:
                 # Mapa de calor de receita (dia da semana x mês)
                 try:
-                    heatmap_data = df_filtered.pivot_table(
-                        values='total_revenue',
-                        index='day_of_week',
-                        columns='month_name',
-                        aggfunc='sum',
-                        fill_value=0
-                    )
-
-                    # Ordenar dias da semana e meses
-                    day_order = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
-                    month_order = list(calendar.month_name)[1:]
+                    # Já ordenado por dia da semana e mês, apenas com os que existem
+                    heatmap_data = metrics['heatmap']
 
-                    # Verificar se há dados antes de reindexar
                     if not heatmap_data.empty:
-                        # Reindexar apenas com as colunas que existem
-                        available_months = [m for m in month_order if m in heatmap_data.columns]
-                        available_days = [d for d in day_order if d in heatmap_data.index]
-
-                        if available_months and available_days:
-                            heatmap_data = heatmap_data.reindex(available_days)[available_months]
-
-                            fig = px.imshow(
-                                heatmap_data,
-                                title='🔥 Mapa de Calor: Receita por Dia da Semana vs Mês',
-                                color_continuous_scale='Viridis',
-                                aspect="auto"
-                            )
-                            fig.update_layout(height=500)
-                            st.plotly_chart(fig, use_container_width=True)
-                        else:
-                            st.info("Dados insuficientes para o mapa de calor")
+                        fig = px.imshow(
+                            heatmap_data,
+                            title='🔥 Mapa de Calor: Receita por Dia da Semana vs Mês',
+                            color_continuous_scale='Viridis',
+                            aspect="auto"
+                        )
+                        fig.update_layout(height=500)
+                        st.plotly_chart(fig, use_container_width=True)
                     else:
                         st.info("Sem dados suficientes para o mapa de calor")
                 except Exception as e:
@@ -389,12 +550,15 @@ def main():
 
             with col2:
                 # Análise de desconto x receita
-                if 'discount_percent' in df_filtered.columns:
-                    discount_analysis = df_filtered.groupby('discount_percent')['total_revenue'].agg(
-                        ['sum', 'count']).reset_index()
+                if 'discount_analysis' in metrics:
+                    discount_analysis = metrics['discount_analysis'].copy()
                     discount_analysis['avg_revenue'] = discount_analysis['sum'] / discount_analysis['count']
 
                     if len(discount_analysis) > 0:
+                        # Importados no primeiro uso: o plotly.express não carrega graph_objects/subplots
+                        import plotly.graph_objects as go
+                        from plotly.subplots import make_subplots
+
                         fig = make_subplots(specs=[[{"secondary_y": True}]])
                         fig.add_trace(
                             go.Bar(x=discount_analysis['discount_percent'], y=discount_analysis['sum'],
@@ -416,12 +580,8 @@ def main():
 
             # Top produtos por receita
             st.subheader("🏆 Top 10 Produtos por Receita")
-            if 'product_id' in df_filtered.columns:
-                top_products = df_filtered.groupby('product_id').agg({
-                    'total_revenue': 'sum',
-                    'quantity_sold': 'sum',
-                    'rating': 'mean'
-                }).sort_values('total_revenue', ascending=False).head(10).reset_index()
+            if 'top_products' in metrics:
+                top_products = metrics['top_products']
 
                 if len(top_products) > 0:
                     col1, col2 = st.columns([2, 1])
@@ -456,15 +616,9 @@ def main():
     with tab3:
         st.subheader("📦 Análise de Performance por Categoria")
 
-        if len(df_filtered) > 0:
+        if has_data:
             # Métricas por categoria
-            category_metrics = df_filtered.groupby('product_category').agg({
-                'total_revenue': 'sum',
-                'quantity_sold': 'sum',
-                'order_id': 'nunique',
-                'rating': 'mean',
-                'price': 'mean'
-            }).reset_index()
+            category_metrics = metrics['category_metrics'].copy()
 
             if len(category_metrics) > 0:
                 category_metrics['avg_ticket'] = category_metrics['total_revenue'] / category_metrics['order_id']
@@ -514,16 +668,15 @@ def main():
     with tab4:
         st.subheader("🎯 Insights Estratégicos")
 
-        if len(df_filtered) > 0:
+        if has_data:
             # Cálculos para insights
-            total_revenue_filtered = df_filtered['total_revenue'].sum()
-            total_revenue_full = df['total_revenue'].sum()
+            total_revenue_filtered = metrics['total_revenue']
 
             # Top categorias
-            top_categories = df_filtered.groupby('product_category')['total_revenue'].sum().nlargest(3)
+            top_categories = metrics['top_categories']
 
             # Melhor período
-            monthly_revenue = df_filtered.groupby('month')['total_revenue'].sum()
+            monthly_revenue = metrics['monthly_revenue']
             if not monthly_revenue.empty:
                 best_month = monthly_revenue.idxmax()
                 best_month_name = calendar.month_name[best_month]
@@ -531,11 +684,8 @@ def main():
                 best_month_name = "N/A"
 
             # Análise de rentabilidade por desconto
-            if 'discount_percent' in df_filtered.columns:
-                discount_efficiency = df_filtered.groupby('discount_percent').agg({
-                    'total_revenue': 'sum',
-                    'quantity_sold': 'sum'
-                }).reset_index()
+            if 'discount_efficiency' in metrics:
+                discount_efficiency = metrics['discount_efficiency'].copy()
                 discount_efficiency['revenue_per_unit'] = discount_efficiency['total_revenue'] / discount_efficiency[
                     'quantity_sold']
                 if not discount_efficiency.empty:
@@ -581,8 +731,8 @@ def main():
                     <h4>📈 Oportunidades</h4>
                     <ul>
                         <li><b>Desconto Ótimo:</b> {best_discount}% maximiza receita por unidade</li>
-                        <li><b>Rating:</b> {(df_filtered['rating'] >= 4).mean() * 100:.1f}% dos produtos têm rating ≥4 ⭐</li>
-                        <li><b>Mix de produtos:</b> {df_filtered['product_category'].nunique()} categorias ativas</li>
+                        <li><b>Rating:</b> {metrics['high_rating_pct']:.1f}% dos produtos têm rating ≥4 ⭐</li>
+                        <li><b>Mix de produtos:</b> {metrics['category_count']} categorias ativas</li>
                     </ul>
                 </div>
                 """, unsafe_allow_html=True)
@@ -590,14 +740,13 @@ def main():
                 # Gráfico de tendência
                 st.markdown("### 🔮 Tendência Mensal")
 
-                # Agrupar por mês de forma segura
-                monthly_trend = df_filtered.groupby(
-                    pd.Grouper(key='order_date', freq='ME')
-                )['total_revenue'].sum().reset_index()
+                # Receita agrupada por mês (fim de mês)
+                monthly_trend = metrics['monthly_trend'].copy()
 
                 if len(monthly_trend) > 0:
                     # Garantir que a data está no formato correto
                     monthly_trend['order_date'] = pd.to_datetime(monthly_trend['order_date'])
+                    monthly_trend = downsample_frame(monthly_trend, 'order_date', 'total_revenue')
 
                     # Criar gráfico de linhas
                     fig = px.line(
@@ -605,7 +754,8 @@ def main():
                         x='order_date',
                         y='total_revenue',
                         title="📈 Tendência de Receita Mensal",
-                        markers=True
+                        markers=True,
+                        render_mode=render_mode(len(monthly_trend))
                     )
 
                     # Personalizar
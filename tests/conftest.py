@@ -0,0 +1,70 @@
+from datetime import date
+
+import pandas as pd
+import pytest
+
+from src.config import PROCESSED_DATA_DIR
+from src.dashboard_metrics import DashboardFilters
+from src.storage import PROCESSED_CSV_FILENAME, PROCESSED_DATASET_DIRNAME, write_processed_dataset
+
+
+# Filtros comuns aos testes de paridade com o caminho linha a linha
+FILTER_CASES = [
+    DashboardFilters(date(2022, 1, 1), date(2023, 12, 31)),
+    DashboardFilters(date(2023, 10, 1), date(2023, 12, 31), region="Asia"),
+    DashboardFilters(date(2022, 3, 5), date(2022, 9, 20), category="Books", payment="UPI"),
+    DashboardFilters(date(2030, 1, 1), date(2030, 1, 31)),
+]
+# Período do "pedidos do período anterior" usado nos testes de contagem
+PREVIOUS_PERIOD = (pd.Timestamp("2023-06-01"), pd.Timestamp("2023-08-31 23:59:59"))
+
+
+def load_sales_csv() -> pd.DataFrame:
+    """CSV processado versionado no repositório."""
+    return pd.read_csv(PROCESSED_DATA_DIR / PROCESSED_CSV_FILENAME, parse_dates=["order_date"])
+
+
+@pytest.fixture(scope="module")
+def sales_df() -> pd.DataFrame:
+    return load_sales_csv()
+
+
+@pytest.fixture()
+def split_sales(sales_df, tmp_path) -> tuple:
+    """
+    Dados processados com os primeiros 3/4 dos pedidos gravados em
+    ``tmp_path`` e o restante, para acrescentar como faz a limpeza incremental.
+    """
+    df = sales_df.sort_values("order_id", ignore_index=True)
+    cut = len(df) * 3 // 4
+    write_processed_dataset(df.iloc[:cut], tmp_path / PROCESSED_DATASET_DIRNAME)
+    return tmp_path, df.iloc[cut:]
+
+
+def assert_same_metric(expected, actual):
+    """
+    Compara uma métrica do dashboard com a de referência: valores iguais,
+    sem exigir os mesmos dtypes, nomes ou tipos de índice. Índices nomeados
+    (ex.: ``product_category``) são comparados como coluna.
+    """
+    if isinstance(expected, pd.DataFrame):
+        pd.testing.assert_frame_equal(
+            actual.reset_index(drop=not expected.index.name),
+            expected.reset_index(drop=not expected.index.name),
+            check_dtype=False,
+            check_names=False,
+            check_categorical=False,
+            check_index_type=False,
+            check_column_type=False,
+        )
+    elif isinstance(expected, pd.Series):
+        pd.testing.assert_series_equal(
+            actual,
+            expected,
+            check_dtype=False,
+            check_names=False,
+            check_categorical=False,
+            check_index_type=False,
+        )
+    else:
+        assert actual == pytest.approx(expected)
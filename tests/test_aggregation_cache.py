@@ -0,0 +1,48 @@
+import os
+from datetime import date
+
+from src.aggregation_cache import AggregationCache, aggregation_key, dataset_version
+from src.dashboard_metrics import DashboardFilters
+
+
+def test_aggregation_cache_counts_hits_and_evicts_least_recently_used():
+    cache = AggregationCache(max_entries=2)
+    calls = []
+
+    def compute(name):
+        return lambda: calls.append(name) or name
+
+    keys = {
+        name: aggregation_key("v1", "cube", DashboardFilters(date(2023, 1, 1), date(2023, 1, 31), region=name))
+        for name in ("Asia", "Europe", "Middle East")
+    }
+    assert cache.get_or_compute(keys["Asia"], compute("Asia")) == "Asia"
+    cache.get_or_compute(keys["Europe"], compute("Europe"))
+    cache.get_or_compute(keys["Asia"], compute("Asia"))  # acerto: Asia passa a ser a mais recente
+    cache.get_or_compute(keys["Middle East"], compute("Middle East"))  # descarta Europe
+    cache.get_or_compute(keys["Asia"], compute("Asia"))
+    cache.get_or_compute(keys["Europe"], compute("Europe"))
+
+    assert calls == ["Asia", "Europe", "Middle East", "Europe"]
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["evictions"], stats["entries"]) == (2, 4, 2, 2)
+
+
+def test_aggregation_cache_is_invalidated_when_processed_data_changes(tmp_path):
+    data_file = tmp_path / "part-00000.parquet"
+    data_file.write_bytes(b"v1")
+    version = dataset_version([tmp_path])
+
+    cache = AggregationCache()
+    cache.set_version(version)
+    key = aggregation_key(version, "pandas", None, "total_revenue")
+    cache.get_or_compute(key, lambda: 1.0)
+
+    data_file.write_bytes(b"v2-rewritten")
+    os.utime(data_file, ns=(0, data_file.stat().st_mtime_ns + 1))
+    new_version = dataset_version([tmp_path])
+    assert new_version != version
+
+    cache.set_version(new_version)
+    assert cache.stats()["entries"] == 0
+    assert cache.get_or_compute(aggregation_key(new_version, "pandas", None, "total_revenue"), lambda: 2.0) == 2.0
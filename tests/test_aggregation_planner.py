@@ -0,0 +1,37 @@
+from datetime import date
+
+import pandas as pd
+import pytest
+
+from src.aggregation_planner import AggregationPlanner
+from src.dashboard_metrics import DashboardFilters, compute_dashboard_metrics, filter_sales_frame
+from src.filter_index import SalesFilterIndex
+from src.schema import compact_sales_frame
+from tests.conftest import FILTER_CASES, assert_same_metric, load_sales_csv
+
+
+@pytest.fixture(scope="module", params=["standard", "compact"])
+def sales_df(request) -> pd.DataFrame:
+    df = load_sales_csv()
+    return compact_sales_frame(df) if request.param == "compact" else df
+
+
+@pytest.mark.parametrize("filters", FILTER_CASES)
+def test_planner_matches_reference_metrics(sales_df, filters):
+    expected = compute_dashboard_metrics(filter_sales_frame(sales_df, filters))
+    actual = AggregationPlanner(SalesFilterIndex(sales_df)).compute(filters)
+
+    assert set(actual) == set(expected)
+    for key, value in expected.items():
+        assert_same_metric(value, actual[key])
+
+
+def test_planner_counts_repeated_order_ids_once(sales_df):
+    df = pd.concat([sales_df, sales_df.iloc[:100]], ignore_index=True)
+    filters = DashboardFilters(date(2022, 1, 1), date(2023, 12, 31))
+
+    expected = compute_dashboard_metrics(df, keys=("total_orders", "category_metrics"))
+    actual = AggregationPlanner(SalesFilterIndex(df)).compute(filters, keys=("total_orders", "category_metrics"))
+
+    assert actual["total_orders"] == expected["total_orders"] == len(sales_df)
+    assert_same_metric(expected["category_metrics"], actual["category_metrics"])
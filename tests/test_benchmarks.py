@@ -0,0 +1,37 @@
+import pandas as pd
+
+from benchmarks.run_benchmarks import compare_results, parse_sizes, write_synthetic_raw_file
+
+
+def test_parse_sizes_accepts_labels_and_row_counts():
+    assert parse_sizes("50k, 1m,2_000") == [50_000, 1_000_000, 2_000]
+
+
+def test_write_synthetic_raw_file_writes_requested_rows(tmp_path):
+    write_synthetic_raw_file(100_001, tmp_path / "raw.csv", dirty_rate=0)
+
+    raw = pd.read_csv(tmp_path / "raw.csv")
+    assert len(raw) == 100_001
+    assert raw["order_id"].is_unique
+
+
+def test_compare_results_flags_time_and_memory_regressions():
+    baseline = [
+        {"case": "clean", "rows": 1000, "seconds": 1.0, "peak_rss_mb": 100.0},
+        {"case": "save", "rows": 1000, "seconds": 1.0, "peak_rss_mb": 100.0},
+        {"case": "load_raw", "rows": 1000, "seconds": 0.010, "peak_rss_mb": 100.0},
+    ]
+    results = [
+        {"case": "clean", "rows": 1000, "seconds": 1.5, "peak_rss_mb": 100.0},
+        {"case": "save", "rows": 1000, "seconds": 1.1, "peak_rss_mb": 150.0},
+        # 50% mais lento, mas só 5 ms: ruído
+        {"case": "load_raw", "rows": 1000, "seconds": 0.015, "peak_rss_mb": 100.0},
+        {"case": "load_data", "rows": 1000, "seconds": 1.0, "peak_rss_mb": 100.0},
+    ]
+
+    comparison = {c["case"]: c for c in compare_results(results, baseline, threshold=0.25)}
+
+    assert comparison["clean"]["regressed"]
+    assert comparison["save"]["regressed"]
+    assert not comparison["load_raw"]["regressed"]
+    assert "load_data" not in comparison
@@ -0,0 +1,38 @@
+import pandas as pd
+import pytest
+
+from src.cube import (
+    build_cube_from_processed,
+    build_sales_cube,
+    compute_cube_metrics,
+    cube_count_orders,
+    load_sales_cube,
+)
+from src.dashboard_metrics import ROW_LEVEL_KEYS, compute_dashboard_metrics, count_orders, filter_sales_frame
+from src.storage import PROCESSED_DATASET_DIRNAME, write_processed_dataset
+from tests.conftest import FILTER_CASES, PREVIOUS_PERIOD, assert_same_metric
+
+
+@pytest.mark.parametrize("filters", FILTER_CASES)
+def test_cube_metrics_match_row_level_metrics(sales_df, filters):
+    expected = compute_dashboard_metrics(filter_sales_frame(sales_df, filters))
+    actual = compute_cube_metrics(build_sales_cube(sales_df), filters)
+
+    assert set(expected) - set(actual) == set(ROW_LEVEL_KEYS)
+    for key, value in actual.items():
+        assert_same_metric(expected[key], value)
+
+
+def test_cube_previous_period_orders_match_row_level(sales_df):
+    start, end = PREVIOUS_PERIOD
+    cube = build_sales_cube(sales_df)
+    assert cube_count_orders(cube, start, end) == count_orders(sales_df, start, end)
+
+
+def test_incremental_cube_matches_full_rebuild(sales_df, split_sales):
+    output_dir, new_rows = split_sales
+    build_cube_from_processed(output_dir)
+    write_processed_dataset(new_rows, output_dir / PROCESSED_DATASET_DIRNAME, append=True)
+    build_cube_from_processed(output_dir, incremental=True)
+
+    pd.testing.assert_frame_equal(load_sales_cube(output_dir), build_sales_cube(sales_df), check_dtype=False)
@@ -0,0 +1,73 @@
+from datetime import date
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.cube import CUBE_KEYS, build_sales_cube, compute_cube_metrics
+from src.daily_rollup import ROLLUP_KEYS, DailyRollup
+from src.dashboard_metrics import (
+    DashboardFilters,
+    compute_dashboard_metrics,
+    count_orders,
+    filter_sales_frame,
+)
+from tests.conftest import FILTER_CASES, PREVIOUS_PERIOD
+
+
+@pytest.fixture(scope="module")
+def cube(sales_df) -> pd.DataFrame:
+    return build_sales_cube(sales_df)
+
+
+@pytest.mark.parametrize(
+    "filters",
+    FILTER_CASES + [
+        DashboardFilters(date(2023, 2, 14), date(2023, 2, 14), payment="Wallet"),
+        DashboardFilters(date(2022, 1, 1), date(2023, 12, 31), region="Atlantis"),
+    ],
+)
+def test_rollup_kpis_match_row_level_metrics(sales_df, cube, filters):
+    expected = compute_dashboard_metrics(filter_sales_frame(sales_df, filters))
+    actual = DailyRollup(cube).kpis(filters)
+
+    assert set(actual) == set(ROLLUP_KEYS)
+    for key, value in actual.items():
+        if isinstance(expected[key], float) and np.isnan(expected[key]):
+            assert np.isnan(value)
+        else:
+            assert value == pytest.approx(expected[key])
+
+
+def test_rollup_period_orders_and_total_revenue(sales_df, cube):
+    rollup = DailyRollup(cube)
+    for start, end in [
+        PREVIOUS_PERIOD,
+        (pd.Timestamp("2021-12-01"), pd.Timestamp("2022-01-15 23:59:59")),
+        (pd.Timestamp("2030-01-01"), pd.Timestamp("2030-01-31 23:59:59")),
+    ]:
+        assert rollup.count_orders(start, end) == count_orders(sales_df, start, end)
+    assert rollup.total_revenue() == pytest.approx(sales_df["total_revenue"].sum())
+
+
+def test_cube_metrics_restricted_to_keys(cube):
+    filters = DashboardFilters(date(2022, 1, 1), date(2023, 12, 31))
+    keys = set(CUBE_KEYS) - set(ROLLUP_KEYS)
+    assert set(compute_cube_metrics(cube, filters, keys=keys)) == keys
+    assert set(compute_cube_metrics(cube, filters)) == set(CUBE_KEYS)
+
+
+def test_empty_rollup():
+    rollup = DailyRollup(build_sales_cube(pd.DataFrame({
+        "order_id": pd.Series(dtype="int64"),
+        "order_date": pd.Series(dtype="datetime64[us]"),
+        "product_category": pd.Series(dtype="str"),
+        "price": pd.Series(dtype="float64"),
+        "quantity_sold": pd.Series(dtype="int64"),
+        "customer_region": pd.Series(dtype="str"),
+        "payment_method": pd.Series(dtype="str"),
+        "rating": pd.Series(dtype="float64"),
+        "total_revenue": pd.Series(dtype="float64"),
+    })))
+    assert rollup.total_revenue() == 0
+    assert rollup.kpis(DashboardFilters(date(2023, 1, 1), date(2023, 1, 31)))["row_count"] == 0
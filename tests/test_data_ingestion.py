@@ -0,0 +1,108 @@
+import os
+
+import pytest
+
+from src import data_ingestion
+from src.data_ingestion import LocalDirectorySource, download_amazon_sales_dataset, load_manifest
+
+
+def _write_source(tmp_path):
+    source = tmp_path / "kaggle_cache"
+    (source / "extra").mkdir(parents=True)
+    (source / "amazon_sales_dataset.csv").write_text("order_id\n1\n")
+    (source / "extra" / "notes.txt").write_text("v1")
+    return source
+
+
+def test_download_from_local_source_skips_unchanged_files(tmp_path):
+    source = _write_source(tmp_path)
+    target = tmp_path / "raw"
+
+    # Cópias: o teste altera o destino, o que com hardlinks alteraria a origem
+    download_amazon_sales_dataset(source_dir=source, target_dir=target, mode="copy")
+    first = load_manifest(target)
+    assert set(first) == {"amazon_sales_dataset.csv", "extra/notes.txt"}
+
+    # Mesmo conteúdo com mtime novo: não copia; conteúdo novo: copia
+    os.utime(source / "amazon_sales_dataset.csv", ns=(1, 1))
+    (source / "extra" / "notes.txt").write_text("v2")
+    (target / "amazon_sales_dataset.csv").write_text("sentinel")
+    download_amazon_sales_dataset(source_dir=source, target_dir=target, mode="copy")
+
+    assert (target / "amazon_sales_dataset.csv").read_text() == "sentinel"
+    assert (target / "extra" / "notes.txt").read_text() == "v2"
+    assert load_manifest(target)["amazon_sales_dataset.csv"]["mtime_ns"] == 1
+
+
+def test_staging_links_files_and_mirrors_source(tmp_path):
+    source = _write_source(tmp_path)
+    target = tmp_path / "raw"
+
+    stats = data_ingestion.sync_raw_files(source, target, mode="auto")
+    assert stats["hardlink"] == 2
+    assert os.path.samefile(source / "extra" / "notes.txt", target / "extra" / "notes.txt")
+
+    (source / "extra" / "notes.txt").unlink()
+    stats = data_ingestion.sync_raw_files(source, target, mode="auto")
+    assert (stats["skipped"], stats["removed"]) == (1, 1)
+    assert not (target / "extra" / "notes.txt").exists()
+    assert set(load_manifest(target)) == {"amazon_sales_dataset.csv"}
+    assert not target.with_name("raw.staging").exists()
+
+
+def test_checksum_mismatch_keeps_previous_version(tmp_path, monkeypatch):
+    source = _write_source(tmp_path)
+    target = tmp_path / "raw"
+    data_ingestion.sync_raw_files(source, target, mode="copy")
+    (source / "extra" / "notes.txt").write_text("v2")
+
+    def corrupt(item, dest, mode):
+        dest.write_text("corrompido")
+        return "copy"
+
+    monkeypatch.setattr(data_ingestion, "place_file", corrupt)
+    with pytest.raises(OSError, match="sha256 divergente"):
+        data_ingestion.sync_raw_files(source, target, mode="copy")
+
+    assert (target / "extra" / "notes.txt").read_text() == "v1"
+    assert not target.with_name("raw.staging").exists()
+
+
+def test_download_accepts_pluggable_source(tmp_path):
+    source = _write_source(tmp_path)
+
+    class VersionedSource(LocalDirectorySource):
+        fetched = 0
+
+        def fetch(self):
+            VersionedSource.fetched += 1
+            return super().fetch()
+
+    target = download_amazon_sales_dataset(target_dir=tmp_path / "raw", source=VersionedSource(source))
+    assert VersionedSource.fetched == 1
+    assert (target / "amazon_sales_dataset.csv").read_text() == "order_id\n1\n"
+
+    with pytest.raises(FileNotFoundError):
+        download_amazon_sales_dataset(source=LocalDirectorySource(tmp_path / "missing"))
+
+
+@pytest.mark.parametrize("exchange", [True, False])
+def test_swap_directories_replaces_target(tmp_path, monkeypatch, exchange):
+    staging, target = tmp_path / "raw.staging", tmp_path / "raw"
+    staging.mkdir()
+    target.mkdir()
+    (staging / "version.txt").write_text("nova")
+    (target / "version.txt").write_text("anterior")
+    if not exchange:
+        monkeypatch.setattr(data_ingestion, "_exchange_paths", lambda first, second: False)
+    elif not data_ingestion._exchange_paths(staging, target):
+        pytest.skip("renameat2(RENAME_EXCHANGE) indisponível neste sistema")
+    else:
+        # A chamada trocou os dois; desfaz para testar a troca completa
+        data_ingestion._exchange_paths(staging, target)
+
+    data_ingestion.swap_directories(staging, target)
+
+    assert (target / "version.txt").read_text() == "nova"
+    assert not staging.exists()
+    assert not target.with_name("raw.old").exists()
@@ -1,7 +1,22 @@
 import pandas as pd
+import pyarrow.parquet as pq
 import pytest
 
-from src.data_preprocessing import clean_sales_data
+from src.data_preprocessing import (
+    REQUIRED_COLUMNS,
+    clean_sales_data,
+    clean_sales_data_chunked,
+    clean_sales_data_incremental,
+    clean_sales_data_parallel,
+    load_raw_sales_data,
+    processed_frame,
+    raw_arrow_types,
+    raw_byte_ranges,
+    read_raw_sales_csv,
+    save_processed_data,
+)
+from src.storage import load_processed_sales_data
+from src.synthetic_data import DIRTY_ROW_KINDS, iter_synthetic_sales
 
 
 def _base_df() -> pd.DataFrame:
@@ -42,4 +57,165 @@ def test_clean_sales_data_clips_discount_and_rating_and_recalculates_revenue():
     assert cleaned.loc[0, "discount_percent"] == 100
     assert cleaned.loc[0, "rating"] == 5
     assert cleaned.loc[0, "discounted_price"] == 0
-    assert cleaned.loc[0, "total_revenue"] == 0
\ No newline at end of file
+    assert cleaned.loc[0, "total_revenue"] == 0
+
+
+def test_clean_sales_data_chunked_matches_in_memory_cleaning(tmp_path):
+    raw = pd.concat([_base_df()] * 2_500, ignore_index=True)
+    raw["order_id"] = range(1, len(raw) + 1)
+    raw.loc[::7, "quantity_sold"] = 0
+    raw.loc[5::11, "order_date"] = "not a date"
+    raw.loc[::13, "discount_percent"] = 150
+    # Nulos e texto sujo só no último chunk: os tipos não podem variar entre chunks
+    raw = raw.astype({"product_id": "object", "review_count": "object", "price": "object"})
+    raw.loc[2_100::50, ["product_id", "review_count"]] = None
+    raw.loc[2_200, "price"] = "n/a"
+    raw_path = tmp_path / "raw.csv"
+    raw.to_csv(raw_path, index=False)
+
+    dataset_dir = clean_sales_data_chunked(raw_path, memory_budget_mb=0.01, output_dir=tmp_path)
+    expected_dir = save_processed_data(
+        clean_sales_data(read_raw_sales_csv(raw_path)), output_dir=tmp_path / "in_memory", write_csv=False
+    )
+
+    parts = sorted(dataset_dir.rglob("part-*.parquet"))
+    assert len(parts) == 3
+    assert len({pq.read_schema(part).remove_metadata() for part in parts}) == 1
+    pd.testing.assert_frame_equal(
+        load_processed_sales_data(dataset_dir=dataset_dir),
+        load_processed_sales_data(dataset_dir=expected_dir),
+    )
+    streamed_csv = pd.read_csv(tmp_path / "amazon_sales_clean.csv", parse_dates=["order_date"])
+    expected_csv = processed_frame(clean_sales_data(read_raw_sales_csv(raw_path)))
+    pd.testing.assert_frame_equal(streamed_csv, expected_csv)
+
+
+def test_clean_sales_data_chunked_swaps_previous_dataset(tmp_path):
+    raw_path = tmp_path / "raw.csv"
+    _base_df().to_csv(raw_path, index=False)
+    clean_sales_data_chunked(raw_path, output_dir=tmp_path)
+
+    raw = pd.concat([_base_df()] * 3, ignore_index=True)
+    raw["order_id"] = [1, 2, 3]
+    raw.to_csv(raw_path, index=False)
+    dataset_dir = clean_sales_data_chunked(raw_path, output_dir=tmp_path)
+
+    assert load_processed_sales_data(dataset_dir=dataset_dir)["order_id"].tolist() == [1, 2, 3]
+    # Staging e versão anterior apagados depois da troca
+    assert [path.name for path in tmp_path.iterdir() if path.is_dir()] == ["amazon_sales_clean"]
+
+def test_clean_sales_data_incremental_appends_only_new_rows(tmp_path):
+    raw = pd.concat([_base_df()] * 6, ignore_index=True)
+    raw["order_id"] = range(1, 7)
+    raw.loc[4, "quantity_sold"] = 0
+    raw_path = tmp_path / "raw.csv"
+    raw.iloc[:3].to_csv(raw_path, index=False)
+
+    first = clean_sales_data_incremental(raw_path, output_dir=tmp_path)
+    assert first["order_id"].tolist() == [1, 2, 3]
+
+    # Linha repetida (order_id 3) é descartada pela marca d'água; a última fica incompleta
+    with open(raw_path, "a") as f:
+        f.write(raw.iloc[2:].to_csv(index=False, header=False))
+        f.write("7,2024-01-16")
+    second = clean_sales_data_incremental(raw_path, output_dir=tmp_path)
+    assert second["order_id"].tolist() == [4, 6]
+
+    processed = load_processed_sales_data(dataset_dir=tmp_path / "amazon_sales_clean")
+    assert sorted(processed["order_id"].tolist()) == [1, 2, 3, 4, 6]
+    assert pd.read_csv(tmp_path / "amazon_sales_clean.csv")["order_id"].tolist() == [1, 2, 3, 4, 6]
+
+
+def test_clean_sales_data_incremental_keeps_rows_without_order_id(tmp_path):
+    raw = pd.concat([_base_df()] * 4, ignore_index=True)
+    raw["order_id"] = pd.array([1, 2, None, 3], dtype="Int64")
+    raw_path = tmp_path / "raw.csv"
+    raw.iloc[:2].to_csv(raw_path, index=False)
+    clean_sales_data_incremental(raw_path, output_dir=tmp_path)
+
+    # Sem order_id a linha não é comparável com a marca d'água e segue, como na limpeza completa
+    with open(raw_path, "a") as f:
+        f.write(raw.iloc[2:].to_csv(index=False, header=False))
+    second = clean_sales_data_incremental(raw_path, output_dir=tmp_path)
+    assert second["order_id"].isna().tolist() == [True, False]
+
+    processed = load_processed_sales_data(dataset_dir=tmp_path / "amazon_sales_clean")
+    assert len(processed) == len(clean_sales_data(pd.read_csv(raw_path))) == 4
+
+def test_clean_sales_data_reports_rejections_per_rule():
+    raw = pd.concat([_base_df()] * 6, ignore_index=True)
+    raw["order_date"] = raw["order_date"].astype(object)
+    raw.loc[0, "price"] = -1.0
+    raw.loc[1, "total_revenue"] = None
+    raw.loc[2, "quantity_sold"] = 0
+    raw.loc[3, "order_date"] = "2024-02-30"
+    # Falha em duas regras: conta só na primeira
+    raw.loc[4, ["order_date", "price"]] = [None, -1.0]
+
+    rejections = {}
+    cleaned = clean_sales_data(raw, rejections)
+
+    assert len(cleaned) == 1
+    assert rejections["order_date_invalida"] == 2
+    assert rejections["total_revenue_ausente"] == 1
+    assert rejections["quantity_sold_nao_positiva"] == 1
+    assert rejections["price_negativo"] == 1
+    assert sum(rejections.values()) == len(raw) - len(cleaned)
+    # A entrada só é consumida quando pedido
+    assert raw.shape == (6, 13)
+    clean_sales_data(raw, consume=True)
+    assert raw.shape[1] == 0
+
+
+@pytest.mark.parametrize("first_date", [None, "31/12/2023"])
+def test_clean_sales_data_parallel_matches_serial(tmp_path, first_date):
+    dirty_rates = {kind: 0.02 for kind in DIRTY_ROW_KINDS}
+    raw = pd.concat(iter_synthetic_sales(20_000, chunk_rows=5_000, dirty_rates=dirty_rates), ignore_index=True)
+    if first_date:
+        # Data fora do formato declarado: nula em qualquer faixa
+        raw.loc[0, "order_date"] = first_date
+    raw_path = tmp_path / "raw.csv"
+    raw.to_csv(raw_path, index=False)
+
+    ranges = raw_byte_ranges(raw_path, 100_000)
+    assert len(ranges) > 4
+    assert ranges[-1][1] == raw_path.stat().st_size
+    assert all(end == next_start for (_, end), (next_start, _) in zip(ranges, ranges[1:]))
+
+    serial_rejections, parallel_rejections = {}, {}
+    expected = clean_sales_data(load_raw_sales_data(raw_path), serial_rejections)
+    cleaned = clean_sales_data_parallel(raw_path, parallel_rejections, workers=2, partition_mb=0.1)
+
+    pd.testing.assert_frame_equal(cleaned, expected)
+    assert parallel_rejections == serial_rejections
+
+
+def test_read_raw_sales_csv_uses_declared_schema(tmp_path):
+    assert set(raw_arrow_types()) == REQUIRED_COLUMNS
+
+    raw = pd.concat([_base_df()] * 6, ignore_index=True)
+    raw["order_id"] = range(1, 7)
+    raw["order_date"] = ["2024-01-15", "2024-02-30", "15/01/2024", "2024-13-01", "", "2024-02-29"]
+    raw["rating"] = raw["rating"].astype(object)
+    raw.loc[1, "rating"] = "n/d"
+    raw.loc[3, "product_category"] = "Books"
+    raw["extra"] = "x"
+    raw_path = tmp_path / "raw.csv"
+    raw.to_csv(raw_path, index=False)
+
+    df = read_raw_sales_csv(raw_path)
+
+    assert list(df.columns) == [col for col in raw.columns if col != "extra"]
+    assert df["order_id"].dtype == "int64"
+    assert df["order_date"].dtype == "datetime64[us]"
+    assert list(df["product_category"].cat.categories) == ["Books", "Electronics"]
+    # Valores inválidos viram nulos na leitura
+    assert df["order_date"].isna().tolist() == [False, True, True, True, True, False]
+    assert df["rating"].isna().tolist() == [False, True, False, False, False, False]
+
+    # A limpeza sobre a leitura tipada dá o mesmo resultado da leitura por inferência
+    expected_rejections, rejections = {}, {}
+    expected = clean_sales_data(pd.read_csv(raw_path).drop(columns="extra"), expected_rejections)
+    cleaned = processed_frame(clean_sales_data(df, rejections))
+    pd.testing.assert_frame_equal(cleaned, expected)
+    assert rejections == expected_rejections
@@ -0,0 +1,52 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.downsampling import downsample_frame, lttb_indices, minmax_indices, point_budget, render_mode
+
+
+def _daily_series(n=20_000):
+    values = np.random.default_rng(0).normal(size=n).cumsum()
+    values[n // 3] += 500  # pico isolado que a amostragem precisa manter
+    return pd.DataFrame({
+        "order_date": pd.date_range("1970-01-01", periods=n, freq="D"),
+        "total_revenue": values,
+    })
+
+
+@pytest.mark.parametrize("method", ["lttb", "minmax"])
+def test_downsample_keeps_budget_order_and_extremes(method):
+    df = _daily_series()
+    points = downsample_frame(df, "order_date", "total_revenue", max_points=500, method=method)
+
+    assert len(points) <= 500
+    assert points["order_date"].is_monotonic_increasing
+    assert points["total_revenue"].max() == df["total_revenue"].max()
+    assert points["order_date"].iloc[0] == df["order_date"].iloc[0]
+    # Apenas pontos reais da série
+    assert points.index.isin(df.index).all()
+
+
+def test_lttb_keeps_endpoints_and_short_series():
+    x = np.arange(10)
+    assert lttb_indices(x, x ** 2, 20).tolist() == list(range(10))
+    indices = lttb_indices(np.arange(1000), np.sin(np.arange(1000) / 50), 100)
+    assert len(indices) == 100
+    assert indices[0] == 0 and indices[-1] == 999
+    assert (np.diff(indices) > 0).all()
+
+
+def test_minmax_takes_both_extremes_of_each_bucket():
+    y = np.array([4, 9, 5, 3, 0, 7, 2, 1, 6, 5])
+    assert minmax_indices(y, 6).tolist() == [0, 1, 4, 5, 7, 9]
+
+
+def test_short_series_unchanged_and_render_mode():
+    df = _daily_series(100)
+    assert downsample_frame(df, "order_date", "total_revenue", max_points=500) is df
+    assert downsample_frame(df, "order_date", "total_revenue", max_points=10, method="none") is df
+    with pytest.raises(ValueError):
+        downsample_frame(df, "order_date", "total_revenue", method="mean")
+    assert point_budget(800, 2) == 1600
+    assert render_mode(10, threshold=1000) == "svg"
+    assert render_mode(1000, threshold=1000) == "webgl"
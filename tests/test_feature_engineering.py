@@ -0,0 +1,73 @@
+import pandas as pd
+import pytest
+
+from src.feature_engineering import (
+    DASHBOARD_COLUMNS,
+    FEATURE_COLUMNS,
+    FEATURES_DIRNAME,
+    add_sales_features,
+    build_features_from_processed,
+    load_sales_features,
+)
+from src.storage import PROCESSED_DATASET_DIRNAME, write_processed_dataset
+from tests.conftest import load_sales_csv
+
+
+@pytest.fixture()
+def processed_dir(tmp_path):
+    df = load_sales_csv()
+    write_processed_dataset(df, tmp_path / PROCESSED_DATASET_DIRNAME)
+    return tmp_path
+
+
+def _expected(processed_dir) -> pd.DataFrame:
+    df = load_sales_csv().sort_values("order_date", kind="stable").reset_index(drop=True)
+    return add_sales_features(df[DASHBOARD_COLUMNS].copy())
+
+
+def test_feature_table_round_trip(processed_dir):
+    output = build_features_from_processed(output_dir=processed_dir)
+    assert output == processed_dir / FEATURES_DIRNAME
+
+    df = load_sales_features(dataset_dir=processed_dir / PROCESSED_DATASET_DIRNAME)
+    assert list(df.columns) == DASHBOARD_COLUMNS + FEATURE_COLUMNS
+    pd.testing.assert_frame_equal(df, _expected(processed_dir), check_dtype=False)
+
+    subset = load_sales_features(["order_date", "week"], dataset_dir=processed_dir / PROCESSED_DATASET_DIRNAME)
+    assert list(subset.columns) == ["order_date", "week"]
+
+
+def test_features_computed_when_table_is_missing(processed_dir):
+    df = load_sales_features(dataset_dir=processed_dir / PROCESSED_DATASET_DIRNAME)
+    assert not (processed_dir / FEATURES_DIRNAME).exists()
+    pd.testing.assert_frame_equal(df, _expected(processed_dir), check_dtype=False)
+
+
+def test_polars_feature_table_matches_pandas(processed_dir):
+    pytest.importorskip("polars")
+
+    build_features_from_processed(output_dir=processed_dir, engine="polars")
+    df = load_sales_features(dataset_dir=processed_dir / PROCESSED_DATASET_DIRNAME)
+    pd.testing.assert_frame_equal(df, _expected(processed_dir), check_dtype=False)
+
+
+def test_incremental_features_append_only_new_rows(split_sales):
+    output_dir, new_rows = split_sales
+    build_features_from_processed(output_dir=output_dir)
+    write_processed_dataset(new_rows, output_dir / PROCESSED_DATASET_DIRNAME, append=True)
+    build_features_from_processed(output_dir=output_dir, incremental=True)
+
+    df = load_sales_features(dataset_dir=output_dir / PROCESSED_DATASET_DIRNAME)
+    expected = _expected(output_dir).sort_values("order_id", ignore_index=True)
+    pd.testing.assert_frame_equal(df.sort_values("order_id", ignore_index=True), expected, check_dtype=False)
+
+
+def test_stale_feature_table_is_recomputed(split_sales):
+    output_dir, new_rows = split_sales
+    build_features_from_processed(output_dir=output_dir)
+    # Limpeza sem o estágio "features": a tabela gravada fica para trás
+    write_processed_dataset(new_rows, output_dir / PROCESSED_DATASET_DIRNAME, append=True)
+
+    df = load_sales_features(dataset_dir=output_dir / PROCESSED_DATASET_DIRNAME)
+    expected = _expected(output_dir).sort_values("order_id", ignore_index=True)
+    pd.testing.assert_frame_equal(df.sort_values("order_id", ignore_index=True), expected, check_dtype=False)
@@ -0,0 +1,60 @@
+import numpy as np
+import pandas as pd
+
+from src.eda import stats_figure_specs
+from src.figures import (
+    category_revenue,
+    histogram_kde,
+    monthly_revenue,
+    monthly_revenue_spec,
+    render_figures,
+    top_categories_spec,
+)
+from src.streaming_stats import StreamingStats
+
+
+def _sales_frame(n=200):
+    rng = np.random.default_rng(0)
+    return pd.DataFrame(
+        {
+            "order_date": pd.date_range("2023-01-01", periods=n, freq="D"),
+            "product_category": rng.choice(["Books", "Toys", "Home"], n),
+            "price": rng.uniform(5, 500, n),
+            "total_revenue": rng.uniform(10, 1000, n),
+        }
+    )
+
+
+def _report_specs(df):
+    # As mesmas figuras do estágio "report", a partir dos mesmos agregados
+    stats = StreamingStats.from_frame(df[["price", "total_revenue"]])
+    return stats_figure_specs(stats) + [
+        monthly_revenue_spec(monthly_revenue(df)),
+        top_categories_spec(category_revenue(df)),
+    ]
+
+
+def test_histogram_kde_integrates_to_one():
+    values = np.random.default_rng(1).normal(100, 15, 5000)
+    counts, edges = np.histogram(values, bins=2048, range=(values.min() - 30, values.max() + 30))
+    grid, density = histogram_kde(counts, edges, values.std(ddof=1), gridsize=400)
+    assert abs(np.trapezoid(density, grid) - 1) < 0.02
+
+
+def test_render_figures_skips_unchanged_inputs(tmp_path):
+    df = _sales_frame()
+    specs = _report_specs(df)
+
+    first = render_figures(specs, output_dir=tmp_path, workers=2)
+    assert set(first.values()) == {"renderizada"}
+    assert all((tmp_path / spec.filename).stat().st_size > 0 for spec in specs)
+
+    second = render_figures(_report_specs(df), output_dir=tmp_path, workers=2)
+    assert set(second.values()) == {"inalterada"}
+
+    # Só a receita muda: o histograma de preço não precisa ser refeito
+    df["total_revenue"] *= 2
+    third = render_figures(_report_specs(df), output_dir=tmp_path, workers=2)
+    assert third["dist_price.png"] == "inalterada"
+    assert third["sales_trend_over_time.png"] == "renderizada"
+    assert third["top_categories_by_sales.png"] == "renderizada"
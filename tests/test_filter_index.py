@@ -0,0 +1,34 @@
+from datetime import date
+
+import pandas as pd
+import pytest
+
+from src.dashboard_metrics import DashboardFilters, count_orders, filter_sales_frame
+from src.filter_index import SalesFilterIndex
+
+
+@pytest.mark.parametrize(
+    "filters",
+    [
+        DashboardFilters(date(2022, 1, 1), date(2023, 12, 31)),
+        DashboardFilters(date(2023, 12, 1), date(2023, 12, 31), region="Europe"),
+        DashboardFilters(date(2022, 2, 1), date(2022, 7, 15), category="Sports", payment="Wallet"),
+        DashboardFilters(date(2022, 1, 1), date(2023, 12, 31), "Asia", "Books", "UPI"),
+        DashboardFilters(date(2022, 1, 1), date(2023, 12, 31), region="Atlantis"),
+    ],
+)
+def test_indexed_filter_matches_boolean_masks(sales_df, filters):
+    index = SalesFilterIndex(sales_df)
+
+    expected = filter_sales_frame(sales_df, filters).sort_values("order_id")
+    actual = index.filter(filters).sort_values("order_id")
+
+    pd.testing.assert_frame_equal(
+        actual.reset_index(drop=True), expected.reset_index(drop=True)
+    )
+
+
+def test_indexed_order_count_matches_full_scan(sales_df):
+    index = SalesFilterIndex(sales_df)
+    start, end = pd.Timestamp("2022-11-02"), pd.Timestamp("2023-01-31 23:59:59")
+    assert index.count_orders(start, end) == count_orders(sales_df, start, end)
@@ -0,0 +1,67 @@
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+
+ROOT = Path(__file__).resolve().parent.parent
+# Módulos pesados que só podem ser carregados no primeiro uso
+HEAVY_MODULES = {"kagglehub", "IPython", "matplotlib", "seaborn", "plotly", "duckdb", "polars", "streamlit"}
+# Tempo de importação do main.py além do pandas (que todos os estágios usam), como fração
+# do próprio pandas medido no mesmo processo, para não depender da velocidade da máquina
+IMPORT_BUDGET_RATIO = 0.5
+
+
+def _import_times(statement: str) -> dict:
+    """``{módulo: tempo acumulado em s}`` de ``python -X importtime`` num processo novo."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", statement],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line.split("|")
+        times[name.strip()] = int(cumulative) / 1e6
+    return times
+
+
+@pytest.mark.parametrize(
+    "statement",
+    [
+        "import main",
+        "import src.storage, src.sql_backend, src.polars_backend, src.eda, src.visualization",
+    ],
+)
+def test_heavy_modules_are_not_imported_eagerly(statement):
+    loaded = {name.split(".")[0] for name in _import_times(statement)}
+    assert not loaded & HEAVY_MODULES
+
+
+def test_main_import_time_budget():
+    times = _import_times("import main")
+    assert times["main"] - times["pandas"] < IMPORT_BUDGET_RATIO * times["pandas"]
+
+
+def test_config_import_creates_no_directories():
+    statement = (
+        "import pathlib\n"
+        "def fail(*args, **kwargs): raise AssertionError('mkdir na importação')\n"
+        "pathlib.Path.mkdir = fail\n"
+        "import src.config"
+    )
+    subprocess.run([sys.executable, "-c", statement], cwd=ROOT, check=True)
+
+
+def test_ensure_directories(tmp_path):
+    from src.config import ensure_directories
+
+    targets = [tmp_path / "data" / "raw", tmp_path / "reports" / "figures"]
+    ensure_directories(targets)
+    ensure_directories(targets)
+    assert all(path.is_dir() for path in targets)
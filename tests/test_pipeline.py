@@ -0,0 +1,83 @@
+from functools import partial
+
+import pytest
+
+from src.pipeline import PipelineRunner, Stage
+
+
+def _derive(source, target):
+    target.write_text(source.read_text().upper())
+
+
+def _fail():
+    raise RuntimeError("boom")
+
+
+def _stages(tmp_path, extra=()):
+    raw = tmp_path / "raw.txt"
+    clean = tmp_path / "clean.txt"
+    return [
+        Stage("clean", partial(_derive, raw, clean), inputs=(raw,), outputs=(clean,)),
+        Stage(
+            "report_a",
+            partial(_derive, clean, tmp_path / "a.txt"),
+            deps=("clean",),
+            inputs=(clean,),
+            outputs=(tmp_path / "a.txt",),
+            parallel=True,
+        ),
+        Stage(
+            "report_b",
+            partial(_derive, clean, tmp_path / "b.txt"),
+            deps=("clean",),
+            inputs=(clean,),
+            outputs=(tmp_path / "b.txt",),
+            parallel=True,
+        ),
+        *extra,
+    ]
+
+
+def _statuses(results):
+    return {r.name: r.status for r in results}
+
+
+def test_pipeline_caches_stages_until_inputs_change(tmp_path):
+    (tmp_path / "raw.txt").write_text("v1")
+    runner = PipelineRunner(_stages(tmp_path), cache_dir=tmp_path / "cache")
+
+    assert set(_statuses(runner.run()).values()) == {"executado"}
+    assert (tmp_path / "b.txt").read_text() == "V1"
+    assert set(_statuses(runner.run()).values()) == {"cache"}
+
+    (tmp_path / "raw.txt").write_text("v22")
+    assert set(_statuses(runner.run()).values()) == {"executado"}
+    assert (tmp_path / "a.txt").read_text() == "V22"
+
+    assert _statuses(runner.run(only=["report_a"])) == {"report_a": "executado"}
+    assert set(_statuses(runner.run(force=True)).values()) == {"executado"}
+
+
+def test_pipeline_blocks_dependents_of_failed_stage(tmp_path):
+    (tmp_path / "raw.txt").write_text("v1")
+    extra = (
+        Stage("broken", _fail, deps=("clean",)),
+        Stage("after_broken", _fail, deps=("broken",)),
+    )
+    runner = PipelineRunner(_stages(tmp_path, extra), cache_dir=tmp_path / "cache")
+
+    statuses = _statuses(runner.run())
+    assert statuses["broken"] == "falhou"
+    assert statuses["after_broken"] == "bloqueado"
+    assert statuses["report_a"] == "executado"
+
+    with pytest.raises(ValueError):
+        runner.run(only=["missing"])
+
+
+@pytest.mark.parametrize("order_count_mode, registered", [("exact", False), ("sketch", True)])
+def test_sketches_stage_only_in_sketch_mode(order_count_mode, registered):
+    from main import build_stages, parse_args
+
+    names = [stage.name for stage in build_stages(parse_args([]), order_count_mode)]
+    assert ("sketches" in names) == registered
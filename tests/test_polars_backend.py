@@ -0,0 +1,50 @@
+import pandas as pd
+import pytest
+
+pytest.importorskip("polars")
+
+from src.data_preprocessing import clean_sales_data, load_and_clean_sales_data
+from src.feature_engineering import DASHBOARD_COLUMNS, add_sales_features
+from src.polars_backend import clean_sales_data_polars, load_sales_features_polars
+from src.storage import load_processed_sales_data, write_processed_dataset
+from src.synthetic_data import DIRTY_ROW_KINDS, iter_synthetic_sales
+
+
+@pytest.fixture(scope="module")
+def dirty_raw() -> pd.DataFrame:
+    chunks = iter_synthetic_sales(20_000, seed=7, dirty_rates={kind: 0.01 for kind in DIRTY_ROW_KINDS})
+    return pd.concat(chunks, ignore_index=True)
+
+
+def test_polars_cleaning_matches_pandas(dirty_raw):
+    expected_rejections, actual_rejections = {}, {}
+    expected = clean_sales_data(dirty_raw.copy(), expected_rejections)
+    actual = clean_sales_data_polars(dirty_raw, actual_rejections)
+
+    pd.testing.assert_frame_equal(actual, expected, check_dtype=False)
+    assert actual_rejections == expected_rejections
+    assert sum(actual_rejections.values()) > 0
+
+
+def test_polars_file_cleaning_matches_pandas(dirty_raw, tmp_path):
+    raw_path = tmp_path / "raw.csv"
+    dirty_raw.to_csv(raw_path, index=False)
+
+    expected_rejections, actual_rejections = {}, {}
+    expected = load_and_clean_sales_data(raw_path, expected_rejections, engine="pandas")
+    actual = load_and_clean_sales_data(raw_path, actual_rejections, engine="polars")
+
+    pd.testing.assert_frame_equal(actual, expected, check_dtype=False)
+    assert actual_rejections == expected_rejections
+
+
+def test_polars_features_match_pandas(tmp_path, sales_df):
+    dataset_dir = tmp_path / "dataset"
+    write_processed_dataset(sales_df, dataset_dir=dataset_dir)
+
+    expected = add_sales_features(load_processed_sales_data(DASHBOARD_COLUMNS, dataset_dir=dataset_dir))
+    actual = load_sales_features_polars(DASHBOARD_COLUMNS, dataset_dir=dataset_dir)
+
+    expected = expected.sort_values(["order_date", "order_id"]).reset_index(drop=True)
+    actual = actual.sort_values(["order_date", "order_id"]).reset_index(drop=True)
+    pd.testing.assert_frame_equal(actual, expected, check_dtype=False)
@@ -0,0 +1,29 @@
+import pandas as pd
+
+from src.schema import compact_sales_frame, memory_report
+
+
+def test_compact_sales_frame_shrinks_dtypes_and_keeps_values():
+    df = pd.DataFrame(
+        {
+            "order_id": [1, 2, 70_000],
+            "customer_region": ["Asia", "Europe", "Asia"],
+            "quantity_sold": [1, 5, 3],
+            "price": [10.5, 20.25, 499.99],
+            "total_revenue": [10.5, 101.25, 1499.97],
+            "is_weekend": [True, False, False],
+        }
+    )
+
+    compact = compact_sales_frame(df)
+
+    assert compact["customer_region"].dtype == "category"
+    assert compact["order_id"].dtype == "uint32"
+    assert compact["quantity_sold"].dtype == "uint8"
+    assert compact["price"].dtype == "float32"
+    assert compact["total_revenue"].dtype == "float64"
+    assert compact["is_weekend"].dtype == "bool"
+    assert compact["customer_region"].astype(str).tolist() == df["customer_region"].tolist()
+
+    report = memory_report(df, compact)
+    assert report.loc["TOTAL", "bytes_compact"] < report.loc["TOTAL", "bytes_standard"]
@@ -0,0 +1,109 @@
+from datetime import date
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.cube import CUBE_DIMENSIONS
+from src.dashboard_metrics import DashboardFilters, count_orders, filter_sales_frame
+from src.sketches import (
+    SketchRollup,
+    build_order_sketches,
+    build_order_sketches_from_processed,
+    dense_registers,
+    estimate_distinct,
+    hash_values,
+    load_order_sketches,
+    register_ranks,
+    save_order_sketches,
+    sketch_count_orders,
+    sketch_order_metrics,
+    standard_error,
+)
+from src.storage import PROCESSED_DATASET_DIRNAME, write_processed_dataset
+from tests.conftest import FILTER_CASES, PREVIOUS_PERIOD
+
+
+PRECISION = 12
+# Tolerância de 4 erros padrão (~6,5% com precisão 12)
+TOLERANCE = 4 * standard_error(PRECISION)
+
+
+@pytest.fixture(scope="module")
+def sketches(sales_df) -> pd.DataFrame:
+    return build_order_sketches(sales_df, PRECISION)
+
+
+def _sketch(values) -> np.ndarray:
+    registers, ranks = register_ranks(hash_values(values), PRECISION)
+    dense = np.zeros(2 ** PRECISION, dtype=np.uint8)
+    np.maximum.at(dense, registers, ranks)
+    return dense
+
+
+@pytest.mark.parametrize("n", [1, 100, 3_000, 200_000])
+def test_estimate_within_error_bound(n):
+    estimate = float(estimate_distinct(_sketch(np.arange(n))))
+    assert estimate == pytest.approx(n, rel=TOLERANCE)
+
+
+def test_merge_is_union():
+    left, right = np.arange(0, 60_000), np.arange(40_000, 100_000)
+    merged = np.maximum(_sketch(left), _sketch(right))
+    np.testing.assert_array_equal(merged, _sketch(np.union1d(left, right)))
+    # Duplicados não contam
+    np.testing.assert_array_equal(_sketch(np.concatenate([left, left])), _sketch(left))
+
+
+@pytest.mark.parametrize("filters", FILTER_CASES)
+def test_sketch_order_metrics_match_exact_counts(sales_df, sketches, filters):
+    rows = filter_sales_frame(sales_df, filters)
+    metrics = sketch_order_metrics(sketches, filters, PRECISION)
+
+    assert metrics["total_orders"] == pytest.approx(rows["order_id"].nunique(), rel=TOLERANCE)
+    exact = rows.groupby("product_category")["order_id"].nunique()
+    pd.testing.assert_index_equal(metrics["category_orders"].index, exact.index, check_names=False)
+    np.testing.assert_allclose(metrics["category_orders"], exact, rtol=TOLERANCE, atol=5)
+
+
+def test_sketch_previous_period_orders(sales_df, sketches):
+    start, end = PREVIOUS_PERIOD
+    assert sketch_count_orders(sketches, start, end, PRECISION) == pytest.approx(
+        count_orders(sales_df, start, end), rel=TOLERANCE
+    )
+
+
+def test_sketches_round_trip(tmp_path, sketches):
+    save_order_sketches(sketches, tmp_path)
+    loaded = load_order_sketches(tmp_path)
+    np.testing.assert_array_equal(dense_registers(loaded, PRECISION), dense_registers(sketches, PRECISION))
+
+
+@pytest.mark.parametrize(
+    "filters",
+    FILTER_CASES + [
+        DashboardFilters(date(2022, 6, 1), date(2022, 6, 30), category="Electronics"),
+        DashboardFilters(date(2022, 6, 1), date(2022, 6, 30), payment="Atlantis"),
+    ],
+)
+def test_sketch_rollup_matches_cell_sketches(sketches, filters):
+    rollup = SketchRollup(sketches, PRECISION)
+    expected = sketch_order_metrics(sketches, filters, PRECISION)
+    actual = rollup.order_metrics(filters)
+
+    assert actual["total_orders"] == expected["total_orders"]
+    pd.testing.assert_series_equal(actual["category_orders"], expected["category_orders"])
+    start, end = PREVIOUS_PERIOD
+    assert rollup.count_orders(start, end) == sketch_count_orders(sketches, start, end, PRECISION)
+
+
+def test_incremental_sketches_match_full_rebuild(sales_df, split_sales):
+    output_dir, new_rows = split_sales
+    build_order_sketches_from_processed(output_dir, PRECISION)
+    write_processed_dataset(new_rows, output_dir / PROCESSED_DATASET_DIRNAME, append=True)
+    build_order_sketches_from_processed(output_dir, PRECISION, incremental=True)
+
+    # Linhas repetidas por célula e registrador só somem na reconstrução; o máximo é o mesmo
+    loaded = load_order_sketches(output_dir)
+    merged = loaded.groupby(CUBE_DIMENSIONS + ["register"], sort=True)["rank"].max().reset_index()
+    pd.testing.assert_frame_equal(merged, build_order_sketches(sales_df, PRECISION), check_dtype=False)
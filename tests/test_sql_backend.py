@@ -0,0 +1,36 @@
+import pytest
+
+pytest.importorskip("duckdb")
+
+from src.dashboard_metrics import compute_dashboard_metrics, count_orders, filter_sales_frame
+from src.sql_backend import SqlSalesBackend
+from src.storage import write_processed_dataset
+from tests.conftest import FILTER_CASES, PREVIOUS_PERIOD, assert_same_metric
+
+
+@pytest.fixture(scope="module")
+def backend(sales_df, tmp_path_factory) -> SqlSalesBackend:
+    dataset_dir = tmp_path_factory.mktemp("sql") / "dataset"
+    write_processed_dataset(sales_df, dataset_dir=dataset_dir)
+    return SqlSalesBackend(dataset_dir=dataset_dir)
+
+
+@pytest.mark.parametrize("filters", FILTER_CASES)
+def test_sql_metrics_match_pandas_metrics(sales_df, backend, filters):
+    expected = compute_dashboard_metrics(filter_sales_frame(sales_df, filters))
+    actual = backend.compute_metrics(filters)
+
+    assert set(actual) == set(expected)
+    for key, value in expected.items():
+        assert_same_metric(value, actual[key])
+
+
+def test_sql_sidebar_helpers_match_pandas(sales_df, backend):
+    start, end = PREVIOUS_PERIOD
+    assert backend.count_orders(start, end) == count_orders(sales_df, start, end)
+    assert backend.total_revenue() == pytest.approx(sales_df["total_revenue"].sum())
+    assert backend.date_range() == (
+        sales_df["order_date"].min().date(),
+        sales_df["order_date"].max().date(),
+    )
+    assert backend.dimension_values()["customer_region"] == sorted(sales_df["customer_region"].unique())
@@ -0,0 +1,85 @@
+import pandas as pd
+import pytest
+
+from src.storage import appended_since, load_processed_sales_data, save_dataset_sources, write_processed_dataset
+
+
+def _processed_df() -> pd.DataFrame:
+    return pd.DataFrame(
+        {
+            "order_id": [1, 2, 3],
+            "order_date": pd.to_datetime(["2024-03-01", "2024-01-15", "2024-02-10"]),
+            "product_category": ["Books", "Electronics", "Books"],
+            "total_revenue": [10.0, 20.0, 30.0],
+        }
+    )
+
+
+@pytest.mark.parametrize("fmt, compression", [("parquet", "zstd"), ("feather", "lz4")])
+def test_columnar_dataset_roundtrip_with_projection_and_date_range(tmp_path, fmt, compression):
+    dataset_dir = tmp_path / "dataset"
+    write_processed_dataset(_processed_df(), dataset_dir, fmt=fmt, compression=compression)
+
+    df = load_processed_sales_data(
+        columns=["order_id", "total_revenue"],
+        start_date="2024-01-15",
+        end_date="2024-02-10",
+        dataset_dir=dataset_dir,
+        csv_path=tmp_path / "missing.csv",
+    )
+
+    assert list(df.columns) == ["order_id", "total_revenue"]
+    assert df["order_id"].tolist() == [2, 3]
+
+
+def test_append_adds_part_and_loader_falls_back_to_csv(tmp_path):
+    dataset_dir = tmp_path / "dataset"
+    write_processed_dataset(_processed_df(), dataset_dir)
+    write_processed_dataset(_processed_df(), dataset_dir, append=True)
+    assert len(load_processed_sales_data(dataset_dir=dataset_dir)) == 6
+
+    csv_path = tmp_path / "clean.csv"
+    _processed_df().to_csv(csv_path, index=False)
+    df = load_processed_sales_data(
+        columns=["order_id"],
+        start_date="2024-02-01",
+        dataset_dir=tmp_path / "missing",
+        csv_path=csv_path,
+    )
+    assert df["order_id"].tolist() == [1, 3]
+
+
+def test_monthly_partitions_are_pruned_by_date_range(tmp_path):
+    dataset_dir = tmp_path / "dataset"
+    write_processed_dataset(_processed_df(), dataset_dir, partition_by_month=True)
+
+    months = sorted(p.relative_to(dataset_dir).as_posix() for p in dataset_dir.rglob("part-*.parquet"))
+    assert months == [
+        "order_year=2024/order_month=01/part-00000.parquet",
+        "order_year=2024/order_month=02/part-00000.parquet",
+        "order_year=2024/order_month=03/part-00000.parquet",
+    ]
+
+    # Um arquivo fora do período nem é aberto
+    (dataset_dir / "order_year=2024/order_month=03/part-00000.parquet").write_bytes(b"corrompido")
+    df = load_processed_sales_data(start_date="2024-01-01", end_date="2024-02-29", dataset_dir=dataset_dir)
+
+    assert list(df.columns) == ["order_id", "order_date", "product_category", "total_revenue"]
+    assert df["order_id"].tolist() == [2, 3]
+
+
+def test_appended_since_lists_only_new_parts(tmp_path):
+    dataset_dir, artifact = tmp_path / "dataset", tmp_path / "artifact"
+    write_processed_dataset(_processed_df(), dataset_dir)
+    artifact.mkdir()
+    sources, new_files = appended_since(artifact, dataset_dir)
+    assert new_files is None
+    save_dataset_sources(artifact, sources, {"precision": 12})
+
+    write_processed_dataset(_processed_df(), dataset_dir, append=True)
+    sources, new_files = appended_since(artifact, dataset_dir, {"precision": 12})
+    assert [path.name for path in new_files] == ["part-00001.parquet"] * 3
+    # Outros parâmetros ou dataset regravado: só a reconstrução completa serve
+    assert appended_since(artifact, dataset_dir, {"precision": 14})[1] is None
+    write_processed_dataset(_processed_df(), dataset_dir)
+    assert appended_since(artifact, dataset_dir, {"precision": 12})[1] is None
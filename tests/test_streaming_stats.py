@@ -0,0 +1,63 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.storage import PROCESSED_DATASET_DIRNAME, write_processed_dataset
+from src.streaming_stats import KLLSketch, StreamingStats, compute_streaming_stats
+
+
+# Erro de rank tolerado para os quantis do KLL com k=200
+RANK_TOLERANCE = 0.02
+
+
+def _assert_matches_pandas(stats: StreamingStats, df: pd.DataFrame):
+    numeric = df.select_dtypes("number")
+    pd.testing.assert_frame_equal(stats.corr(), numeric.corr(), check_names=False)
+
+    expected = numeric.describe()
+    moments = ["count", "mean", "std", "min", "max"]
+    pd.testing.assert_frame_equal(stats.describe().loc[moments], expected.loc[moments], check_names=False)
+    assert stats.info()["non_null"].to_dict() == df.notna().sum().to_dict()
+
+
+def test_batches_match_single_pass(sales_df):
+    stats = StreamingStats.from_frame(sales_df, batch_rows=3_000)
+    _assert_matches_pandas(stats, sales_df)
+    assert stats.rows == len(sales_df)
+
+    price = stats.histograms["price"]
+    counts, _ = np.histogram(sales_df["price"], bins=price.edges)
+    np.testing.assert_array_equal(price.counts, counts)
+
+
+def test_merge_is_order_independent(sales_df):
+    halves = [StreamingStats.from_frame(part) for part in (sales_df.iloc[::2], sales_df.iloc[1::2])]
+    merged = StreamingStats().merge(halves[1]).merge(halves[0])
+    _assert_matches_pandas(merged, sales_df)
+    np.testing.assert_array_equal(
+        merged.histograms["price"].counts,
+        StreamingStats.from_frame(sales_df).histograms["price"].counts,
+    )
+
+
+def test_kll_rank_error():
+    values = np.random.default_rng(7).lognormal(size=500_000)
+    sketches = [KLLSketch(seed=i) for i in range(4)]
+    for i, chunk in enumerate(np.array_split(values, 40)):
+        sketches[i % 4].update(chunk)
+    for other in sketches[1:]:
+        sketches[0].merge(other)
+
+    probabilities = np.linspace(0.01, 0.99, 50)
+    estimates = sketches[0].quantile(probabilities)
+    ranks = np.searchsorted(np.sort(values), estimates) / len(values)
+    assert np.abs(ranks - probabilities).max() < RANK_TOLERANCE
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_compute_streaming_stats_over_dataset(tmp_path, sales_df, workers):
+    dataset_dir = tmp_path / PROCESSED_DATASET_DIRNAME
+    for part in np.array_split(np.arange(len(sales_df)), 3):
+        write_processed_dataset(sales_df.iloc[part], dataset_dir, append=True)
+    stats = compute_streaming_stats(batch_rows=2_500, workers=workers, dataset_dir=dataset_dir)
+    _assert_matches_pandas(stats, sales_df)
@@ -0,0 +1,56 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.data_preprocessing import REQUIRED_COLUMNS, clean_sales_data
+from src.synthetic_data import (
+    DIRTY_ROW_KINDS,
+    generate_sales_chunk,
+    iter_synthetic_sales,
+    write_synthetic_sales,
+)
+
+
+def test_generated_rows_follow_schema_and_domain():
+    df = generate_sales_chunk(np.random.default_rng(0), 5_000)
+
+    assert REQUIRED_COLUMNS == set(df.columns)
+    assert df["order_id"].tolist() == list(range(1, 5_001))
+    assert df["price"].between(5, 500).all()
+    assert df["rating"].between(1, 5).all()
+    assert set(df["discount_percent"]) <= {0, 5, 10, 15, 20, 30}
+    # Linhas limpas passam intactas pela limpeza
+    cleaned = clean_sales_data(df)
+    assert len(cleaned) == len(df)
+    np.testing.assert_allclose(cleaned["total_revenue"], df["total_revenue"], atol=0.03)
+
+
+def test_generator_is_deterministic_per_seed():
+    first = pd.concat(iter_synthetic_sales(2_500, seed=7, chunk_rows=1_000), ignore_index=True)
+    second = pd.concat(iter_synthetic_sales(2_500, seed=7, chunk_rows=1_000), ignore_index=True)
+    other = pd.concat(iter_synthetic_sales(2_500, seed=8, chunk_rows=1_000), ignore_index=True)
+
+    pd.testing.assert_frame_equal(first, second)
+    assert not first.equals(other)
+    assert first["order_id"].is_unique
+
+
+def test_dirty_rows_are_rejected_by_cleaning():
+    rates = {kind: 0.05 for kind in DIRTY_ROW_KINDS}
+    df = pd.concat(iter_synthetic_sales(20_000, chunk_rows=5_000, dirty_rates=rates), ignore_index=True)
+
+    rejections = {}
+    cleaned = clean_sales_data(df, rejections)
+
+    for rule in ("order_date_invalida", "price_negativo", "quantity_sold_nao_positiva", "total_revenue_ausente"):
+        assert 600 < rejections[rule] < 1_100
+    assert ((df["rating"] > 5) | (df["rating"] < 0)).mean() == pytest.approx(0.05, abs=0.01)
+    assert cleaned["rating"].between(0, 5).all()
+
+
+def test_write_synthetic_sales_partitions_files(tmp_path):
+    paths = write_synthetic_sales(tmp_path, 2_500, rows_per_file=1_000, chunk_rows=500)
+
+    assert [p.name for p in paths] == ["part-00000.csv", "part-00001.csv", "part-00002.csv"]
+    sizes = [len(pd.read_csv(p)) for p in paths]
+    assert sizes == [1_000, 1_000, 500]